@@ -0,0 +1,43 @@
+"""
+Admin batch question-answering endpoint.
+Precomputes answers for many questions and stores them in the response cache.
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from app.api.dependencies import require_admin
+from app.core.batch import answer_questions
+
+
+router = APIRouter(prefix="/api/v1", tags=["admin"])
+
+
+class BatchRequest(BaseModel):
+    """Questions to precompute answers for."""
+    questions: List[str] = Field(min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+    skip_cached: bool = True
+
+
+class BatchResponse(BaseModel):
+    """Outcome counts of a batch run."""
+    requested: int
+    skipped: int
+    answered: int
+    failed: int
+
+
+@router.post("/batch", response_model=BatchResponse)
+def batch_answer(
+    request: BatchRequest,
+    _admin: str = Depends(require_admin),
+) -> BatchResponse:
+    """Answer questions in bulk and add the answers to the cache."""
+    stats = answer_questions(
+        request.questions,
+        concurrency=request.concurrency,
+        skip_cached=request.skip_cached,
+    )
+    return BatchResponse(**stats)
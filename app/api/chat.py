@@ -0,0 +1,110 @@
+"""
+JSON and Server-Sent Events chat API.
+Exposes the same PortfolioAssistant pipeline as the Gradio UI without the
+Gradio queue and event protocol.
+"""
+
+from typing import Iterator, Optional
+import json
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.api.dependencies import (
+    create_session_token,
+    require_secret_key,
+    require_session,
+)
+from app.core.assistant import ChatResult, UserSession, portfolio_assistant
+
+
+router = APIRouter(prefix="/api/v1", tags=["chat"])
+
+
+class RegisterRequest(BaseModel):
+    """Visitor details for registration or login."""
+    first_name: str
+    last_name: str
+    email: str
+
+
+class RegisterResponse(BaseModel):
+    """Registration result with the bearer token for chat calls."""
+    message: str
+    credits_message: str
+    token: str
+    name: str
+    email: str
+
+
+class ChatRequest(BaseModel):
+    """A single chat message."""
+    message: str = Field(min_length=1)
+
+
+class ChatResponse(BaseModel):
+    """Full answer for a chat message."""
+    answer: str
+    source: str
+    credits_remaining: Optional[int] = None
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/register", response_model=RegisterResponse,
+             dependencies=[Depends(require_secret_key)])
+def register(request: RegisterRequest) -> RegisterResponse:
+    """Register (or log in) a visitor and issue a session token."""
+    message, credits_message, session = portfolio_assistant.register_user(
+        request.first_name, request.last_name, request.email
+    )
+
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+    return RegisterResponse(
+        message=message,
+        credits_message=credits_message,
+        token=create_session_token(session),
+        name=session.name,
+        email=session.email,
+    )
+
+
+@router.post("/chat", response_model=ChatResponse)
+def chat(
+    request: ChatRequest,
+    session: UserSession = Depends(require_session)
+) -> ChatResponse:
+    """Answer a message and return the complete response."""
+    result = portfolio_assistant.answer(request.message, session)
+    return ChatResponse(**result.to_dict())
+
+
+@router.post("/chat/stream")
+def chat_stream(
+    request: ChatRequest,
+    session: UserSession = Depends(require_session)
+) -> StreamingResponse:
+    """
+    Answer a message as a Server-Sent Events stream.
+
+    Emits `token` events ({"delta": ...}) while the LLM generates, then one
+    `done` event carrying the full ChatResponse payload.
+    """
+    def events() -> Iterator[str]:
+        for item in portfolio_assistant.stream_answer(request.message, session):
+            if isinstance(item, ChatResult):
+                yield _sse("done", item.to_dict())
+            else:
+                yield _sse("token", {"delta": item})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,116 @@
+"""
+Shared FastAPI dependencies for the API routers.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from fastapi import Depends, HTTPException, status
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+)
+
+from app.config import settings
+from app.core.assistant import UserSession
+
+
+_basic_auth = HTTPBasic()
+_bearer_auth = HTTPBearer()
+
+
+def require_admin(credentials: HTTPBasicCredentials = Depends(_basic_auth)) -> str:
+    """
+    Require HTTP Basic credentials matching the admin account.
+
+    Username must be "admin" and the password must equal ADMIN_PASSWORD.
+    Admin endpoints answer 404 while ADMIN_PASSWORD is the published default.
+    """
+    if not settings.admin_password_configured:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    username_ok = secrets.compare_digest(
+        credentials.username.encode(), b"admin")
+    password_ok = secrets.compare_digest(
+        credentials.password.encode(), settings.ADMIN_PASSWORD.encode())
+
+    if not (username_ok and password_ok):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin credentials",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    return credentials.username
+
+
+def require_secret_key() -> None:
+    """
+    Refuse session-token endpoints while SECRET_KEY is the published default.
+
+    Anyone could forge tokens signed with the default key, so the token API
+    answers 503 until a real key is configured.
+    """
+    if not settings.secret_key_configured:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Session tokens are disabled until SECRET_KEY is configured",
+        )
+
+
+def _sign(payload: bytes) -> str:
+    """Return the URL-safe HMAC-SHA256 signature of a payload."""
+    digest = hmac.new(settings.SECRET_KEY.encode(),
+                      payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def create_session_token(session: UserSession) -> str:
+    """
+    Encode a UserSession as a signed bearer token for the JSON API.
+
+    The token expires SESSION_TOKEN_TTL seconds after it is issued.
+    """
+    payload = json.dumps({
+        "user_id": session.user_id,
+        "email": session.email,
+        "first_name": session.first_name,
+        "last_name": session.last_name,
+        "exp": int(time.time()) + settings.SESSION_TOKEN_TTL,
+    }).encode()
+    encoded = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{encoded}.{_sign(payload)}"
+
+
+def require_session(
+    credentials: HTTPAuthorizationCredentials = Depends(_bearer_auth),
+    _secret: None = Depends(require_secret_key),
+) -> UserSession:
+    """Resolve an unexpired bearer token issued by /api/v1/register into a UserSession."""
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing session token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        encoded, signature = credentials.credentials.split(".", 1)
+        payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except ValueError:
+        raise unauthorized
+
+    if not secrets.compare_digest(signature, _sign(payload)):
+        raise unauthorized
+
+    data = json.loads(payload)
+    expires = data.get("exp")
+    if not isinstance(expires, int) or expires <= time.time():
+        raise unauthorized
+
+    return UserSession(
+        data["user_id"], data["email"], data["first_name"], data["last_name"])
@@ -0,0 +1,88 @@
+"""
+Admin data export endpoints.
+Streams conversations, analytics and cache entries as NDJSON or CSV with
+constant memory, regardless of table size.
+"""
+
+from typing import Dict, Iterator, Literal, Type
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from app.api.dependencies import require_admin
+from app.config import settings
+from app.db.crud import iter_rows, row_to_dict
+from app.db.database import SessionLocal
+from app.db.models import Analytics, Base, CachedResponse, Conversation
+
+
+router = APIRouter(prefix="/admin/export", tags=["admin"])
+
+EXPORTABLE_TABLES: Dict[str, Type[Base]] = {
+    "conversations": Conversation,
+    "analytics": Analytics,
+    "cached_responses": CachedResponse,
+}
+
+# Flush the output buffer to the client once it grows past this size
+_FLUSH_BYTES = 64 * 1024
+
+
+def _stream_table(model: Type[Base], fmt: str) -> Iterator[str]:
+    """Yield a table as NDJSON or CSV text chunks."""
+    # The session lives inside the generator: it must stay open while the
+    # response body is being streamed.
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = None
+
+        if fmt == "csv":
+            fieldnames = [column.name for column in model.__table__.columns]
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writeheader()
+
+        for row in iter_rows(db, model, settings.EXPORT_BATCH_SIZE):
+            record = row_to_dict(row)
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                buffer.write(json.dumps(record) + "\n")
+
+            if buffer.tell() >= _FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    except Exception as e:
+        logger.error(f"Error exporting {model.__tablename__}: {e}")
+        raise
+
+    finally:
+        db.close()
+
+
+@router.get("/{table}")
+def export_table(
+    table: Literal["conversations", "analytics", "cached_responses"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    _admin: str = Depends(require_admin),
+) -> StreamingResponse:
+    """Stream every row of a table as NDJSON (default) or CSV."""
+    model = EXPORTABLE_TABLES[table]
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"{table}.{'csv' if format == 'csv' else 'ndjson'}"
+
+    logger.info(f"Admin export started: {table} ({format})")
+
+    return StreamingResponse(
+        _stream_table(model, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
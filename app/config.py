@@ -25,7 +25,12 @@ class Settings(BaseSettings):
     REDIS_URL: str = Field(default="redis://localhost:6379")
 
     # Security
+    # Signs API session tokens; the API refuses to issue or accept tokens
+    # while this is the published default
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production")
+    # Lifetime of API session tokens, in seconds
+    SESSION_TOKEN_TTL: int = Field(default=86400)
+    # Admin endpoints are only mounted once this is changed from the default
     ADMIN_PASSWORD: str = Field(default="admin123")
 
     # Credits Configuration
@@ -33,6 +38,15 @@ class Settings(BaseSettings):
     EDU_CREDITS: int = Field(default=7)
     COMPANY_CREDITS: int = Field(default=9)
 
+    # Multi-worker deployment (gunicorn.conf.py)
+    WEB_WORKERS: int = Field(default=2)
+    # Load models and index once in the master and share them with workers
+    WEB_PRELOAD: bool = Field(default=True)
+    TORCH_THREADS_PER_WORKER: int = Field(default=1)
+
+    # Gradio event handlers allowed to run at the same time
+    GRADIO_CONCURRENCY_LIMIT: int = Field(default=8)
+
     # Used to build absolute URLs for assets so Gradio doesn't rewrite them
     PUBLIC_BASE_URL: str = "http://localhost:7860"
 
@@ -48,22 +62,123 @@ class Settings(BaseSettings):
         default="sentence-transformers/all-MiniLM-L6-v2")
     LLM_MODEL: str = Field(default="llama-3.3-70b-versatile")
 
+    # Embedding backend: "torch" (fp32 PyTorch) or "onnx" (ONNX Runtime,
+    # dynamically quantized int8; needs optimum[onnxruntime])
+    EMBEDDING_BACKEND: str = Field(default="torch")
+    # Quantized model file in the model repo; exported locally if missing
+    EMBEDDING_ONNX_FILE: str = Field(default="onnx/model_quint8_avx2.onnx")
+
+    # Embedding Worker Pool
+    # Threads running model inference (torch threads each: TORCH_THREADS_PER_WORKER)
+    EMBEDDING_WORKERS: int = Field(default=2)
+    # Maximum embedding batches queued or running before callers wait
+    EMBEDDING_QUEUE_SIZE: int = Field(default=64)
+    # Micro-batching of single-query embeddings: wait up to this long for
+    # concurrent queries to share one forward pass (0 disables batching)
+    EMBEDDING_BATCH_WINDOW_MS: float = Field(default=5.0)
+    EMBEDDING_MAX_BATCH_SIZE: int = Field(default=32)
+
     # RAG Configuration
     CHUNK_SIZE: int = Field(default=800)
     CHUNK_OVERLAP: int = Field(default=100)
+    # Indexing: loader processes (0 = one per usable CPU, 1 = serial) and
+    # per-file parse timeout in seconds
+    INDEXING_WORKERS: int = Field(default=0)
+    # PDFs below which files load serially: starting spawned loaders costs
+    # about 3s (each re-imports langchain and pypdf), a 5-page PDF ~50ms
+    INDEXING_PARALLEL_MIN_FILES: int = Field(default=100)
+    INDEXING_FILE_TIMEOUT: float = Field(default=60.0)
+    # Chunks per embedding call, and per Qdrant upsert (bounds peak memory)
+    INDEXING_EMBED_BATCH_SIZE: int = Field(default=64)
+    INDEXING_UPSERT_BATCH_SIZE: int = Field(default=256)
+    # Reuse parsed pages and chunks of unchanged files (under CACHE_PATH)
+    CHUNK_CACHE_ENABLED: bool = Field(default=True)
+    # Serve dense retrieval from a memory-mapped snapshot written by
+    # `scripts/setup_db.py --snapshot` when it matches the knowledge base
+    VECTOR_SNAPSHOT_ENABLED: bool = Field(default=True)
+    # Poll the knowledge-base files and re-embed added, changed and removed
+    # files into the live index (seconds between polls)
+    KB_WATCH_ENABLED: bool = Field(default=False)
+    KB_WATCH_INTERVAL: float = Field(default=2.0)
     TOP_K_RETRIEVAL: int = Field(default=4)
+    # Dense vector backend: "numpy" (exact search over one float32 matrix)
+    # or "qdrant" (in-memory Qdrant collection)
+    VECTOR_BACKEND: str = Field(default="numpy")
+    # Vector quantization: "none", "int8" (scalar, 4x smaller) or "binary"
+    # (1 bit/dim, 32x smaller); candidates are rescored with float vectors.
+    # The float vectors stay loaded, so memory only drops when the index is
+    # mapped from a snapshot (VECTOR_SNAPSHOT_PATH); otherwise it grows.
+    VECTOR_QUANTIZATION: str = Field(default="none")
+    VECTOR_RESCORE: bool = Field(default=True)
+    VECTOR_RESCORE_OVERSAMPLING: float = Field(default=4.0)
+    # Hybrid retrieval: BM25 + dense results fused by reciprocal rank
+    HYBRID_RETRIEVAL_ENABLED: bool = Field(default=True)
+    # Candidates taken from each retriever before fusion
+    HYBRID_CANDIDATES: int = Field(default=20)
+    RRF_K: int = Field(default=60)
+    # Answer queries naming exactly one known entity from BM25 alone
+    ENTITY_FAST_PATH_ENABLED: bool = Field(default=True)
+    # LRU cache of ranked chunk ids per normalized query (0 = off); a query
+    # whose embedding has at least this cosine to a cached one reuses its
+    # chunks (0 = exact text matches only). Cleared when the index changes.
+    RETRIEVAL_CACHE_SIZE: int = Field(default=512)
+    RETRIEVAL_CACHE_SIMILARITY: float = Field(default=0.97)
 
     # Cache Configuration
     CACHE_SIMILARITY_THRESHOLD: float = Field(default=0.88)
     CACHE_TTL: int = Field(default=86400 * 30)  # 30 days in seconds
 
+    # Intent Router
+    # Answer questions that paraphrase a slash command from the command table
+    INTENT_ROUTER_ENABLED: bool = Field(default=True)
+    # Minimum cosine to a command phrasing; must separate the paraphrases
+    # from the near-misses in tests/test_intent_router.py for EMBEDDING_MODEL
+    INTENT_ROUTER_THRESHOLD: float = Field(default=0.8)
+
+    # Instant Answers (suggested-question buttons)
+    # Whether pinned instant answers cost a credit like an LLM answer
+    INSTANT_ANSWERS_CHARGE_CREDIT: bool = Field(default=False)
+
+    # Component warm-up: failed components are retried in the background,
+    # waiting this many seconds first and doubling up to the maximum
+    WARMUP_RETRY_DELAY: float = Field(default=5.0)
+    WARMUP_RETRY_MAX_DELAY: float = Field(default=300.0)
+
+    # Background Tasks (conversation logging, cache writes, analytics)
+    TASK_QUEUE_WORKERS: int = Field(default=2)
+    TASK_QUEUE_MAXSIZE: int = Field(default=1000)
+    TASK_MAX_RETRIES: int = Field(default=3)
+    # Seconds to wait for queued tasks on shutdown before spooling them
+    TASK_DRAIN_TIMEOUT: float = Field(default=10.0)
+
+    # Batch Answering (cache prewarming)
+    # Maximum simultaneous LLM calls during batch answer generation
+    BATCH_CONCURRENCY: int = Field(default=4)
+
     # Rate Limiting
     MAX_CONVERSATION_LENGTH: int = Field(default=20)
 
+    # Conversation History
+    # Past exchanges loaded server-side as LLM context for each question
+    CONVERSATION_HISTORY_TURNS: int = Field(default=3)
+
+    # Data Export
+    # Rows fetched per server-side cursor batch by the admin export endpoints
+    EXPORT_BATCH_SIZE: int = Field(default=500)
+
+    # Data Retention
+    # Conversations and analytics older than this are archived, then deleted
+    RETENTION_DAYS: int = Field(default=180)
+    RETENTION_BATCH_SIZE: int = Field(default=1000)
+
     # Paths
     KNOWLEDGE_BASE_PATH: str = Field(default="data/knowledge_base")
     DOCUMENTS_PATH: str = Field(default="data/documents")
     CACHE_PATH: str = Field(default="data/cache")
+    VECTOR_SNAPSHOT_PATH: str = Field(default="data/snapshot")
+    ARCHIVE_PATH: str = Field(default="data/archive")
+    # Failed or undrained background tasks, replayed on next start
+    TASK_SPOOL_PATH: str = Field(default="data/task_spool.jsonl")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -82,6 +197,21 @@ class Settings(BaseSettings):
         """Return educational email patterns as a list."""
         return [p.strip() for p in self.EDU_EMAIL_PATTERNS.split(",")]
 
+    def _changed_from_default(self, name: str) -> bool:
+        """Whether a secret is set to something other than its published default."""
+        value = getattr(self, name)
+        return bool(value) and value != type(self).model_fields[name].default
+
+    @property
+    def secret_key_configured(self) -> bool:
+        """Whether SECRET_KEY has been changed from its published default."""
+        return self._changed_from_default("SECRET_KEY")
+
+    @property
+    def admin_password_configured(self) -> bool:
+        """Whether ADMIN_PASSWORD has been changed from its published default."""
+        return self._changed_from_default("ADMIN_PASSWORD")
+
 
 # Global settings instance
 settings = Settings()
@@ -0,0 +1,540 @@
+"""
+Core chat pipeline for the AI portfolio assistant.
+UI-independent: shared by the Gradio interface and the JSON/SSE API.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from app.config import settings
+from app.core.email_classifier import EmailClassifier
+from app.core.commands import command_handler
+from app.core.cache import cache_manager
+from app.core.instant_answers import instant_answers
+from app.core.intent_router import intent_router
+from app.core.tasks import task_queue
+from app.core.rag import rag_pipeline
+from app.core.llm import llm_handler
+from app.core.warmup import warmup_manager
+from app.db.database import SessionLocal
+from app.db.models import User
+from app.db.crud import (
+    create_user,
+    get_user_by_email,
+    get_user_by_id,
+    deduct_credit,
+    refund_credit,
+    create_analytics_event,
+    get_recent_turns
+)
+
+
+class UserSession:
+    """
+    Identity of one registered visitor.
+
+    Kept in per-browser-session Gradio state (or a signed API token) rather
+    than on the shared PortfolioAssistant, so concurrent visitors never see
+    each other's identity.
+    """
+
+    def __init__(self, user_id: int, email: str, first_name: str, last_name: str) -> None:
+        self.user_id = user_id
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self.name = f"{first_name} {last_name}"
+        self.initials = f"{first_name[0]}{last_name[0]}".upper()
+        self.avatar_url = f"https://ui-avatars.com/api/?name={self.initials}&background=10a37f&color=fff&size=128&bold=true"
+
+    def __repr__(self) -> str:
+        return f"<UserSession(user_id={self.user_id}, email={self.email})>"
+
+
+class ChatResult:
+    """Outcome of one chat turn."""
+
+    def __init__(self, answer: str, source: str, credits_remaining: Optional[int] = None) -> None:
+        """
+        Args:
+            answer: Text shown to the user
+            source: Where the answer came from (command, intent, instant, cache,
+                semantic_cache, llm, credits_exhausted, warming_up,
+                unavailable, unauthenticated, error)
+            credits_remaining: Balance after this turn, None when unknown
+        """
+        self.answer = answer
+        self.source = source
+        self.credits_remaining = credits_remaining
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation."""
+        return {
+            "answer": self.answer,
+            "source": self.source,
+            "credits_remaining": self.credits_remaining,
+        }
+
+    def __repr__(self) -> str:
+        return f"<ChatResult(source={self.source}, credits_remaining={self.credits_remaining})>"
+
+
+class _LLMTurn:
+    """
+    Everything needed to finish a turn that has to go to the LLM.
+
+    `user` reflects the balance after the turn's credit was reserved.
+    """
+
+    def __init__(
+        self,
+        user: User,
+        context: str,
+        history: List[Dict[str, str]],
+        query_embedding: np.ndarray
+    ) -> None:
+        self.user = user
+        self.context = context
+        self.history = history
+        self.query_embedding = query_embedding
+
+
+class PortfolioAssistant:
+    """
+    Main portfolio assistant application.
+
+    Holds no per-user state: every call receives the caller's UserSession, so
+    handlers are reentrant and can run concurrently.
+    """
+
+    ERROR_MESSAGE = "❌ Error occurred. Please try again or contact sarjakm369@gmail.com"
+
+    def __init__(self) -> None:
+        """
+        Initialize the assistant.
+
+        Backend components are loaded in the background by warmup_manager;
+        requests that arrive before they are ready get a friendly notice.
+        """
+
+    def register_user(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str
+    ) -> Tuple[str, str, Optional[UserSession]]:
+        """Register or log in a user and return messages plus their session."""
+        try:
+            if not all([first_name, last_name, email]):
+                return ("❌ Please fill in all fields.", "", None)
+
+            if not warmup_manager.is_component_ready("database"):
+                return (self._get_not_ready_message(), "", None)
+
+            if "@" not in email or "." not in email:
+                return ("❌ Please enter a valid email address.", "", None)
+
+            email = email.lower().strip()
+            db = SessionLocal()
+
+            try:
+                existing_user = get_user_by_email(db, email)
+
+                if existing_user:
+                    session = UserSession(
+                        existing_user.id,
+                        existing_user.email,
+                        existing_user.first_name,
+                        existing_user.last_name,
+                    )
+
+                    category = existing_user.email_category
+                    credits = existing_user.credits_remaining
+
+                    logger.info(f"Existing user logged in: {email}")
+
+                    welcome_msg = f"✅ Welcome back, {existing_user.first_name}! 👋"
+                    credit_msg = EmailClassifier.get_welcome_message(
+                        category, credits)
+
+                    return (welcome_msg, credit_msg, session)
+
+                category, credits = EmailClassifier.classify(email)
+
+                user = create_user(
+                    db=db,
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=email,
+                    email_category=category,
+                    credits=credits
+                )
+
+                session = UserSession(user.id, user.email, first_name, last_name)
+
+                create_analytics_event(
+                    db=db,
+                    user_id=user.id,
+                    event_type="registration",
+                    event_data={"email_category": category}
+                )
+
+                logger.info(
+                    f"New user registered: {email} ({category}, {credits} credits)")
+
+                welcome_msg = f"✅ Welcome, {first_name}! 🎉"
+                credit_msg = EmailClassifier.get_welcome_message(
+                    category, credits)
+
+                return (welcome_msg, credit_msg, session)
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            logger.error(f"Error in user registration: {e}")
+            return ("❌ An error occurred. Please try again.", "", None)
+
+    def answer(self, message: str, session: Optional[UserSession]) -> ChatResult:
+        """Answer a message for the visitor identified by `session`."""
+        result: Optional[ChatResult] = None
+        for item in self.stream_answer(message, session, stream_llm=False):
+            if isinstance(item, ChatResult):
+                result = item
+        return result or ChatResult(self.ERROR_MESSAGE, "error", 0)
+
+    def stream_answer(
+        self,
+        message: str,
+        session: Optional[UserSession],
+        stream_llm: bool = True
+    ) -> Iterator[Union[str, ChatResult]]:
+        """
+        Answer a message, yielding LLM text deltas as they are generated.
+
+        Yields zero or more `str` deltas (LLM path only, when `stream_llm`),
+        always followed by exactly one final ChatResult holding the full answer.
+        """
+        if session is None:
+            yield ChatResult("❌ Please register first.", "unauthenticated")
+            return
+
+        if not warmup_manager.is_ready():
+            if warmup_manager.has_failed():
+                yield ChatResult(self._get_unavailable_message(), "unavailable")
+            else:
+                yield ChatResult(self._get_warming_up_message(), "warming_up")
+            return
+
+        # Pinned suggested-question answers: no DB reads, no model calls
+        if not settings.INSTANT_ANSWERS_CHARGE_CREDIT:
+            instant = instant_answers.get(message)
+            if instant is not None:
+                self._record_instant_answer(session, message, instant)
+                yield ChatResult(instant, "instant")
+                return
+
+        start_time = time.time()
+        db = SessionLocal()
+
+        prepared: Optional[Union[ChatResult, _LLMTurn]] = None
+        try:
+            prepared = self._prepare_turn(db, message, session, start_time)
+            if isinstance(prepared, ChatResult):
+                yield prepared
+                return
+
+            if stream_llm:
+                parts: List[str] = []
+                for delta in llm_handler.stream_response(
+                    query=message,
+                    context=prepared.context,
+                    conversation_history=prepared.history
+                ):
+                    parts.append(delta)
+                    yield delta
+                answer = "".join(parts).strip()
+            else:
+                answer = llm_handler.generate_response(
+                    query=message,
+                    context=prepared.context,
+                    conversation_history=prepared.history
+                )
+
+            result = self._complete_llm_turn(prepared, message, answer, start_time)
+            prepared = None
+            yield result
+
+        except Exception as e:
+            logger.error(f"Error in chat: {e}")
+            if isinstance(prepared, _LLMTurn):
+                refund_credit(db, prepared.user.id)
+            yield ChatResult(self.ERROR_MESSAGE, "error", 0)
+
+        finally:
+            db.close()
+
+    def _prepare_turn(
+        self,
+        db: Session,
+        message: str,
+        session: UserSession,
+        start_time: float
+    ) -> Union[ChatResult, _LLMTurn]:
+        """Answer from commands or caches if possible, else gather LLM inputs."""
+        user = get_user_by_id(db, session.user_id)
+
+        if not user:
+            return ChatResult("❌ User not found. Please refresh.", "unauthenticated")
+
+        # Commands always work (free)
+        is_command, command_response = command_handler.handle_command(
+            message)
+
+        if is_command and command_response:
+            task_queue.submit(
+                "create_conversation",
+                user_id=user.id,
+                question=message,
+                answer=command_response,
+                used_llm=False,
+                credits_charged=0,
+                response_time=time.time() - start_time
+            )
+
+            task_queue.submit(
+                "create_analytics_event",
+                user_id=user.id,
+                event_type="command_used",
+                event_data={"command": message}
+            )
+
+            return ChatResult(command_response, "command", user.credits_remaining)
+
+        # One embedding serves intent routing, semantic cache, retrieval and
+        # the cache write
+        query_embedding = cache_manager._get_embedding(message)
+
+        # Natural-language questions that map onto a command (free)
+        if settings.INTENT_ROUTER_ENABLED:
+            routed = intent_router.answer(query_embedding)
+            if routed:
+                command, command_response, similarity = routed
+
+                task_queue.submit(
+                    "create_conversation",
+                    user_id=user.id,
+                    question=message,
+                    answer=command_response,
+                    used_llm=False,
+                    credits_charged=0,
+                    response_time=time.time() - start_time
+                )
+
+                task_queue.submit(
+                    "create_analytics_event",
+                    user_id=user.id,
+                    event_type="intent_routed",
+                    event_data={"command": command,
+                                "similarity": round(similarity, 3)}
+                )
+
+                return ChatResult(command_response, "intent", user.credits_remaining)
+
+        # Check credits for non-command queries
+        if user.credits_remaining <= 0:
+            return self._credits_exhausted(user)
+
+        # Pinned suggested-question answers, charged like an LLM answer
+        if settings.INSTANT_ANSWERS_CHARGE_CREDIT:
+            instant = instant_answers.get(message)
+            if instant is not None:
+                updated_user = deduct_credit(db, user.id)
+                if not updated_user:
+                    return self._credits_exhausted(user)
+
+                task_queue.submit(
+                    "create_conversation",
+                    user_id=user.id,
+                    question=message,
+                    answer=instant,
+                    used_llm=False,
+                    credits_charged=1,
+                    response_time=time.time() - start_time
+                )
+
+                return ChatResult(instant, "instant", updated_user.credits_remaining)
+
+        # Check caches
+        cached = cache_manager.check_exact_cache(db, message)
+        if cached:
+            answer, cache_id = cached
+
+            task_queue.submit(
+                "create_conversation",
+                user_id=user.id,
+                question=message,
+                answer=answer,
+                used_llm=False,
+                credits_charged=0,
+                response_time=time.time() - start_time,
+                cached_response_id=cache_id
+            )
+
+            return ChatResult(answer, "cache", user.credits_remaining)
+
+        semantic_cached = cache_manager.check_semantic_cache(
+            db, message, query_embedding=query_embedding)
+        if semantic_cached:
+            answer, cache_id, similarity = semantic_cached
+
+            task_queue.submit(
+                "create_conversation",
+                user_id=user.id,
+                question=message,
+                answer=answer,
+                used_llm=False,
+                credits_charged=0,
+                response_time=time.time() - start_time,
+                cached_response_id=cache_id
+            )
+
+            return ChatResult(answer, "semantic_cache", user.credits_remaining)
+
+        # Use LLM
+        context = rag_pipeline.retrieve_context(
+            message,
+            query_embedding=query_embedding.tolist() if len(query_embedding) else None
+        )
+
+        # Load recent turns from the DB instead of trusting the client
+        conv_history = get_recent_turns(
+            db, user.id, settings.CONVERSATION_HISTORY_TURNS)
+
+        # Reserve the credit before generating: of concurrent turns that all
+        # passed the balance check above, only those that get one are answered
+        reserved_user = deduct_credit(db, user.id)
+        if not reserved_user:
+            return self._credits_exhausted(user)
+
+        return _LLMTurn(reserved_user, context, conv_history, query_embedding)
+
+    def _credits_exhausted(self, user: User) -> ChatResult:
+        """Record and answer a question asked with no credits left."""
+        task_queue.submit(
+            "create_analytics_event",
+            user_id=user.id,
+            event_type="credit_exhausted"
+        )
+        return ChatResult(self._get_credits_exhausted_message(), "credits_exhausted", 0)
+
+    def _record_instant_answer(self, session: UserSession, message: str, answer: str) -> None:
+        """Log a free instant answer in the background."""
+        task_queue.submit(
+            "create_conversation",
+            user_id=session.user_id,
+            question=message,
+            answer=answer,
+            used_llm=False,
+            credits_charged=0,
+            response_time=0.0
+        )
+
+    def _complete_llm_turn(
+        self,
+        turn: _LLMTurn,
+        message: str,
+        answer: str,
+        start_time: float
+    ) -> ChatResult:
+        """Record an LLM-generated answer (its credit was reserved in _prepare_turn)."""
+        user = turn.user
+
+        task_queue.submit(
+            "create_conversation",
+            user_id=user.id,
+            question=message,
+            answer=answer,
+            used_llm=True,
+            credits_charged=1,
+            response_time=time.time() - start_time
+        )
+
+        task_queue.submit(
+            "add_to_cache",
+            query=message,
+            answer=answer,
+            query_embedding=turn.query_embedding if len(turn.query_embedding) else None
+        )
+
+        task_queue.submit(
+            "create_analytics_event",
+            user_id=user.id,
+            event_type="llm_query",
+            event_data={"response_time": time.time() - start_time}
+        )
+
+        return ChatResult(answer, "llm", user.credits_remaining)
+
+    def chat(
+        self,
+        message: str,
+        history: List[Dict[str, str]],
+        session: Optional[UserSession]
+    ) -> Tuple[List[Dict[str, str]], str]:
+        """Handle a chat message in the Gradio messages format."""
+        result = self.answer(message, session)
+
+        credit_display = ""
+        if result.credits_remaining is not None:
+            credit_display = self._format_credit_display(result.credits_remaining)
+
+        return (
+            history + [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": result.answer}
+            ],
+            credit_display
+        )
+
+    def _format_credit_display(self, credits: int) -> str:
+        """Format credit display."""
+        if credits == 1:
+            return f"💬 {credits} question left"
+        return f"💬 {credits} questions left"
+
+    def _get_warming_up_message(self) -> str:
+        """Get message shown while backend components are still loading."""
+        return "⏳ I'm still warming up. Please try again in a few seconds."
+
+    def _get_unavailable_message(self) -> str:
+        """Get message shown while a required component failed and is being retried."""
+        return ("❌ The assistant is temporarily unavailable. Please try again later "
+                "or contact sarjakm369@gmail.com")
+
+    def _get_not_ready_message(self) -> str:
+        """Get the unavailable or warming-up message, whichever applies."""
+        if warmup_manager.has_failed():
+            return self._get_unavailable_message()
+        return self._get_warming_up_message()
+
+    def _get_credits_exhausted_message(self) -> str:
+        """Get message when credits are exhausted."""
+        return """**🎯 All Questions Used!**
+
+Thanks for exploring my portfolio!
+
+**📬 Let's Connect:**
+- **Email:** sarjakm369@gmail.com
+- **LinkedIn:** [linkedin.com/in/Sarjak369](https://linkedin.com/in/Sarjak369)
+- **GitHub:** [github.com/Sarjak369](https://github.com/Sarjak369)
+
+**💡 Free Commands:**
+`/contact` `/skills` `/projects` `/education` `/resume`"""
+
+
+# Global assistant instance (stateless, shared by the UI and the API)
+portfolio_assistant = PortfolioAssistant()
@@ -0,0 +1,116 @@
+"""
+Batch question answering for offline answer precomputation.
+Embeds a list of questions in one pass, retrieves their contexts, generates
+answers with bounded LLM concurrency and bulk-stores them in the cache.
+"""
+
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import time
+from loguru import logger
+
+from app.config import settings
+from app.core.cache import cache_manager
+from app.core.llm import llm_handler
+from app.core.rag import rag_pipeline
+from app.db.crud import (
+    create_cached_responses_bulk,
+    get_cached_response_by_question,
+    normalize_question,
+)
+from app.db.database import SessionLocal
+
+
+def load_questions(path: str) -> List[str]:
+    """Read one question per non-empty line from a text file."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _dedupe(questions: List[str]) -> List[str]:
+    """Drop blank questions and normalized duplicates, keeping first wording."""
+    seen = set()
+    unique = []
+    for question in questions:
+        key = normalize_question(question)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(question.strip())
+    return unique
+
+
+def answer_questions(
+    questions: List[str],
+    concurrency: Optional[int] = None,
+    skip_cached: bool = True
+) -> Dict[str, int]:
+    """
+    Answer questions in bulk and store the answers in cached_responses.
+
+    Args:
+        questions: Questions to answer
+        concurrency: Maximum simultaneous LLM calls (default from settings)
+        skip_cached: Skip questions that already have an exact cache entry;
+            when False their entries are refreshed in place
+
+    Returns:
+        Counts of requested, skipped, answered and failed questions
+    """
+    concurrency = concurrency or settings.BATCH_CONCURRENCY
+    started = time.time()
+    pending = _dedupe(questions)
+    stats = {"requested": len(questions), "skipped": 0, "answered": 0, "failed": 0}
+
+    db = SessionLocal()
+    try:
+        if skip_cached:
+            uncached = [
+                q for q in pending if get_cached_response_by_question(db, q) is None]
+            stats["skipped"] = len(questions) - len(uncached)
+            pending = uncached
+        else:
+            stats["skipped"] = len(questions) - len(pending)
+
+        if not pending:
+            logger.info("Batch: nothing to answer")
+            return stats
+
+        # One forward pass for every question, reused for retrieval and cache
+        logger.info(f"Batch: embedding {len(pending)} questions")
+        embeddings = cache_manager.get_embeddings(pending)
+
+        contexts = [
+            rag_pipeline.retrieve_context(question, query_embedding=embedding.tolist())
+            for question, embedding in zip(pending, embeddings)
+        ]
+
+        def generate(index: int) -> Optional[str]:
+            try:
+                return llm_handler.generate_response(pending[index], contexts[index])
+            except Exception as e:
+                logger.warning(f"Batch: failed to answer '{pending[index][:50]}': {e}")
+                return None
+
+        logger.info(
+            f"Batch: generating {len(pending)} answers (concurrency={concurrency})")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            answers = list(pool.map(generate, range(len(pending))))
+
+        rows = [
+            (question, answer, json.dumps(embedding.tolist()))
+            for question, answer, embedding in zip(pending, answers, embeddings)
+            if answer
+        ]
+        if rows:
+            create_cached_responses_bulk(db, rows)
+
+        stats["answered"] = len(rows)
+        stats["failed"] = len(pending) - len(rows)
+
+    finally:
+        db.close()
+
+    logger.info(f"Batch finished in {time.time() - started:.1f}s: {stats}")
+    return stats
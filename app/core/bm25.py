@@ -0,0 +1,175 @@
+"""
+In-memory BM25 index over the knowledge-base chunks.
+Complements dense retrieval for exact-term queries (project and tool names)
+and lets queries naming a known entity skip the embedding call entirely.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import Counter, defaultdict
+import heapq
+import math
+import re
+
+from langchain_core.documents import Document
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^#{2,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+# Words that look like names rather than vocabulary: a lowercase letter
+# followed by a capital (LogSenseAI, PyTorch), digits (GPT-4) or
+# hyphen-joined parts (LangFlow-Viz). All-caps acronyms (AI, ML, NLP) are
+# vocabulary: "AI Experience" is a section title, not a name.
+_NAME_WORD_RE = re.compile(r"\b\w*[a-z][A-Z]\w*\b|\b\w*\d\w*\b|\b\w+-\w+\b")
+
+# Longest heading (in tokens) still treated as an entity name
+MAX_ENTITY_TOKENS = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens; punctuation and hyphens split words."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def extract_entities(text: str) -> List[str]:
+    """
+    Find entity names (projects, tools, companies) in a markdown document.
+
+    Only short headings containing a name-like word qualify, so generic
+    section titles such as "Experience" never trigger the lexical fast path.
+    """
+    entities = []
+    for heading in _HEADING_RE.findall(text):
+        heading = _LINK_RE.sub(r"\1", heading).replace("*", "").replace("`", "").strip()
+        # "LogSenseAI - Log analysis" -> "LogSenseAI"
+        name = re.split(r"\s[-–—:|]\s|:\s", heading, maxsplit=1)[0].strip()
+        if 0 < len(tokenize(name)) <= MAX_ENTITY_TOKENS and _NAME_WORD_RE.search(name):
+            entities.append(name)
+    return entities
+
+
+class BM25Index:
+    """Okapi BM25 over a growing list of chunks, plus an entity-name table."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        """Initialize an empty index."""
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+        self._idf: Dict[str, float] = {}
+        self._avg_length = 0.0
+        self._stale = False
+        # Entity token sequence -> display name
+        self.entities: Dict[Tuple[str, ...], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_documents(self, chunks: Sequence[Document]) -> None:
+        """
+        Index chunks, appending to what is already indexed.
+
+        Args:
+            chunks: Split chunks, in the order they were given chunk ids
+        """
+        for chunk in chunks:
+            doc_id = len(self.documents)
+            tokens = tokenize(chunk.page_content)
+            for token, freq in Counter(tokens).items():
+                self._postings[token].append((doc_id, freq))
+            self._doc_lengths.append(len(tokens))
+            self.documents.append(chunk)
+        # Corpus statistics are recomputed once, on the next search
+        self._stale = True
+
+    def add_entity_names(self, names: Sequence[str]) -> None:
+        """Register already-extracted entity names."""
+        for name in names:
+            self.entities.setdefault(tuple(tokenize(name)), name)
+
+    def _update_statistics(self) -> None:
+        """Recompute average chunk length and per-token IDF."""
+        total = len(self._doc_lengths)
+        self._avg_length = sum(self._doc_lengths) / total if total else 0.0
+        self._idf = {
+            token: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+        self._stale = False
+
+    def search(self, query: str, k: int,
+               required: Optional[Sequence[str]] = None) -> List[Tuple[int, float]]:
+        """
+        Score chunks against a query.
+
+        Args:
+            query: Raw query text
+            k: Number of results
+            required: Tokens every returned chunk must contain
+
+        Returns:
+            (chunk id, score) pairs, best first; chunks scoring 0 are omitted
+        """
+        if self._stale:
+            self._update_statistics()
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, freq in self._postings[token]:
+                length_ratio = self._doc_lengths[doc_id] / (self._avg_length or 1.0)
+                norm = self.k1 * (1 - self.b + self.b * length_ratio)
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+
+        if required:
+            allowed = None
+            for token in required:
+                ids = {doc_id for doc_id, _ in self._postings.get(token, [])}
+                allowed = ids if allowed is None else allowed & ids
+            scores = {doc_id: s for doc_id, s in scores.items() if doc_id in (allowed or set())}
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def match_entity(self, query: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Return the single entity a query names, if it names exactly one.
+
+        An entity matches when its tokens appear contiguously in the query.
+        Matches contained in a longer match are ignored; two or more distinct
+        entities make the query ambiguous, so None is returned.
+        """
+        tokens = tokenize(query)
+        matches = []
+        for entity_tokens in self.entities:
+            n = len(entity_tokens)
+            if any(tuple(tokens[i:i + n]) == entity_tokens for i in range(len(tokens) - n + 1)):
+                matches.append(entity_tokens)
+
+        # Drop matches that are a part of another match ("langflow" in "langflow viz")
+        matches = [m for m in matches
+                   if not any(m != other and set(m) < set(other) for other in matches)]
+        if len(matches) != 1:
+            return None
+        return self.entities[matches[0]], matches[0]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[int]:
+    """
+    Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank).
+
+    Args:
+        rankings: Ranked lists of chunk ids, best first
+        k: Damping constant; larger values flatten the rank weighting
+
+    Returns:
+        Chunk ids ordered by fused score
+    """
+    scores: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_id: scores[doc_id], reverse=True)
@@ -3,19 +3,18 @@ Caching system with semantic similarity matching.
 Combines exact match caching with semantic similarity using embeddings.
 """
 
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Tuple, Union
 import hashlib
-import torch
 import json
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from loguru import logger
 
 from app.config import settings
+from app.core.embeddings import EmbeddingService, embedding_service
+from app.core.tasks import task_queue
 from app.db.crud import (
     get_cached_response_by_question,
     create_cached_response,
-    increment_cache_hit,
     get_all_cached_responses
 )
 
@@ -25,7 +24,7 @@ class CacheManager:
 
     def __init__(self):
         """Initialize cache manager with embedding model."""
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.embedding_model: Optional[EmbeddingService] = None
         self._initialized = False
         self._cache_index = {}  # In-memory cache for fast lookup
 
@@ -37,11 +36,10 @@ class CacheManager:
 
         try:
             logger.info("Initializing cache manager...")
-            logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
 
-            # Load the same embedding model as RAG pipeline
-            self.embedding_model = SentenceTransformer(
-                settings.EMBEDDING_MODEL)
+            # Shared with the RAG pipeline: one model, one worker pool
+            embedding_service.initialize()
+            self.embedding_model = embedding_service
 
             self._initialized = True
             logger.info("Cache manager initialized successfully")
@@ -84,21 +82,30 @@ class CacheManager:
             return np.array([])
 
         try:
-            embedding: Union[np.ndarray, torch.Tensor] = self.embedding_model.encode(
-                text,
-                normalize_embeddings=True
-            )
-
-            # Convert to numpy if it's a torch tensor
-            if isinstance(embedding, torch.Tensor):
-                embedding = embedding.detach().cpu().numpy()
-
-            return np.array(embedding, dtype=np.float32)
+            return self.embedding_model.encode_one(text)
 
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             return np.array([])
 
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts in one batched forward pass.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix of shape (len(texts), dim), one normalized row per text
+        """
+        if not self._initialized or self.embedding_model is None:
+            self.initialize()
+
+        if self.embedding_model is None:
+            raise RuntimeError("Embedding model not initialized")
+
+        return self.embedding_model.encode(texts)
+
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two vectors.
@@ -132,7 +139,7 @@ class CacheManager:
 
         if cached:
             logger.info(f"Exact cache hit for query: {query[:50]}...")
-            increment_cache_hit(db, cached.id)
+            task_queue.submit("increment_cache_hit", cache_id=cached.id)
             return (cached.answer, cached.id)
 
         return None
@@ -141,7 +148,8 @@ class CacheManager:
         self,
         db,
         query: str,
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> Optional[Tuple[str, int, float]]:
         """
         Check for semantically similar cached responses.
@@ -150,6 +158,7 @@ class CacheManager:
             db: Database session
             query: User's question
             threshold: Similarity threshold (default from settings)
+            query_embedding: Precomputed embedding of the query, if available
 
         Returns:
             Tuple of (cached_answer, cache_id, similarity_score) if found, None otherwise
@@ -162,7 +171,8 @@ class CacheManager:
 
         try:
             # Get query embedding
-            query_embedding = self._get_embedding(query)
+            if query_embedding is None:
+                query_embedding = self._get_embedding(query)
 
             if len(query_embedding) == 0:
                 logger.warning("Failed to generate query embedding")
@@ -213,7 +223,7 @@ class CacheManager:
                         f"Semantic cache hit! Similarity: {best_similarity:.3f} "
                         f"(threshold: {threshold})"
                     )
-                    increment_cache_hit(db, best_cache_id)
+                    task_queue.submit("increment_cache_hit", cache_id=best_cache_id)
                     return (best_match, best_cache_id, best_similarity)
 
             logger.info(
@@ -224,21 +234,33 @@ class CacheManager:
             logger.error(f"Error in semantic cache check: {e}")
             return None
 
-    def add_to_cache(self, db, query: str, answer: str) -> None:
+    def add_to_cache(
+        self,
+        db,
+        query: str,
+        answer: str,
+        query_embedding: Optional[Union[np.ndarray, List[float]]] = None
+    ) -> None:
         """
         Add a new response to the cache with its embedding.
 
+        Errors are logged and re-raised so the background task queue can
+        retry or spool the write.
+
         Args:
             db: Database session
             query: User's question
             answer: Generated answer
+            query_embedding: Precomputed embedding of the query, if available
         """
         if not self._initialized:
             self.initialize()
 
         try:
-            # Generate embedding for the query
-            query_embedding = self._get_embedding(query)
+            # Generate embedding for the query (lists come from replayed tasks)
+            if query_embedding is None:
+                query_embedding = self._get_embedding(query)
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
 
             # Convert embedding to JSON string for storage
             embedding_json = json.dumps(query_embedding.tolist())
@@ -255,6 +277,7 @@ class CacheManager:
 
         except Exception as e:
             logger.error(f"Error adding to cache: {e}")
+            raise
 
     def get_cache_stats(self, db) -> dict:
         """
@@ -0,0 +1,121 @@
+"""
+On-disk cache of parsed documents and their chunks.
+Entries are keyed by file content hash and loader version (parsed pages)
+plus the splitter parameters (chunks), so unchanged files skip parsing and
+splitting on restart or reindex.
+"""
+
+from typing import Iterable, List, Optional, Set
+from importlib import metadata
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import os
+
+from langchain_core.documents import Document
+from loguru import logger
+
+from app.config import settings
+
+
+# Bump when load_file() changes how documents are produced
+LOADER_VERSION = 1
+
+
+def _library_versions() -> str:
+    """Versions of the parsing libraries; a parser upgrade invalidates pages."""
+    versions = []
+    for package in ("pypdf", "langchain-community"):
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return ",".join(versions)
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkCache:
+    """Gzipped JSON entries for parsed pages and chunks under CACHE_PATH."""
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory (default CACHE_PATH/documents)
+        """
+        self.root = Path(root or Path(settings.CACHE_PATH) / "documents")
+        self._loader_key = f"loader={LOADER_VERSION},{_library_versions()}"
+        self._used: Set[Path] = set()
+
+    def _key(self, *parts: str) -> str:
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def pages_path(self, content_hash: str) -> Path:
+        """Entry for the parsed pages of a file."""
+        return self.root / "pages" / f"{self._key(content_hash, self._loader_key)}.json.gz"
+
+    def chunks_path(self, content_hash: str, splitter_key: str) -> Path:
+        """Entry for the chunks of a file under one splitter configuration."""
+        key = self._key(content_hash, self._loader_key, splitter_key)
+        return self.root / "chunks" / f"{key}.json.gz"
+
+    def get(self, entry: Path, source: Path) -> Optional[List[Document]]:
+        """
+        Read an entry, or None on a miss or unreadable entry.
+
+        The stored `source` metadata is replaced with the file's current
+        path, since identical content may have been cached under another name.
+        """
+        if not entry.exists():
+            return None
+        try:
+            with gzip.open(entry, "rt", encoding="utf-8") as f:
+                records = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {entry.name}: {e}")
+            return None
+
+        self._used.add(entry)
+        return [
+            Document(page_content=r["page_content"],
+                     metadata={**r["metadata"], "source": str(source)})
+            for r in records
+        ]
+
+    def put(self, entry: Path, documents: Iterable[Document]) -> None:
+        """Write an entry atomically (failures only cost a cache miss)."""
+        records = [{"page_content": d.page_content, "metadata": d.metadata}
+                   for d in documents]
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(".tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(records, f)
+            os.replace(tmp, entry)
+            self._used.add(entry)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {entry.name}: {e}")
+
+    def prune(self) -> int:
+        """
+        Delete entries not read or written since this cache was created.
+
+        Call after a complete indexing run so entries of changed or deleted
+        files do not accumulate.
+        """
+        removed = 0
+        for entry in self.root.glob("*/*.json.gz"):
+            if entry not in self._used:
+                entry.unlink(missing_ok=True)
+                removed += 1
+        return removed
@@ -0,0 +1,400 @@
+"""
+Shared embedding service.
+Loads the sentence-transformer once and runs every encode on a dedicated,
+bounded thread pool so request handlers and the event loop never run model
+inference inline. Single queries arriving close together are micro-batched
+into one forward pass. The model runs in fp32 PyTorch or, with
+EMBEDDING_BACKEND=onnx, as an int8-quantized ONNX Runtime model.
+"""
+
+from typing import Any, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import os
+import queue
+import threading
+import time
+import numpy as np
+import torch
+from langchain_core.embeddings import Embeddings
+from sentence_transformers import SentenceTransformer
+from loguru import logger
+
+from app.config import settings
+
+
+# A query waiting for the micro-batcher: (text, future, enqueued_at)
+_PendingQuery = Tuple[str, "Future[np.ndarray]", float]
+
+
+class EmbeddingService:
+    """Owns the embedding model and the worker pool that runs it."""
+
+    _STOP = object()
+
+    BACKENDS = ("torch", "onnx")
+
+    def __init__(self, backend: Optional[str] = None) -> None:
+        """
+        Initialize the service (model is loaded lazily).
+
+        Args:
+            backend: "torch" or "onnx"; defaults to EMBEDDING_BACKEND
+        """
+        self.backend = (backend or settings.EMBEDDING_BACKEND).lower()
+        if self.backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend '{self.backend}' (expected one of {self.BACKENDS})")
+        self.model: Optional[SentenceTransformer] = None
+        self.dimension: int = 0
+        # Torch intra-op threads used for inference in this process
+        self.torch_threads = settings.TORCH_THREADS_PER_WORKER
+        self._threads_applied_pid: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._slots = threading.BoundedSemaphore(settings.EMBEDDING_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+        # Micro-batching (see encode_one)
+        self.batch_window = settings.EMBEDDING_BATCH_WINDOW_MS / 1000
+        self.max_batch_size = max(1, settings.EMBEDDING_MAX_BATCH_SIZE)
+        self._pending: Optional["queue.Queue[Any]"] = None
+        self._batcher: Optional[threading.Thread] = None
+        self._batcher_pid: Optional[int] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"batches": 0, "queries": 0, "largest_batch": 0,
+                       "queue_wait_ms": 0.0, "max_queue_wait_ms": 0.0,
+                       "encode_ms": 0.0}
+
+    def initialize(self) -> None:
+        """Load the embedding model and start the worker pool."""
+        with self._lock:
+            if self._initialized:
+                return
+
+            logger.info(
+                f"Loading embedding model: {settings.EMBEDDING_MODEL} ({self.backend})")
+            if self.backend == "onnx":
+                self.model = self._load_onnx_model()
+            else:
+                # Use 'mps' for M-series Mac if you want GPU
+                self.model = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+            self.dimension = self.model.get_sentence_embedding_dimension() or 0
+            self._initialized = True
+
+        logger.info(
+            f"Embedding service ready (backend={self.backend}, dim={self.dimension}, "
+            f"workers={settings.EMBEDDING_WORKERS}, torch_threads={self.torch_threads})")
+
+    def _load_onnx_model(self) -> SentenceTransformer:
+        """
+        Load the int8-quantized ONNX variant of the embedding model.
+
+        Uses the quantized file published with the model when there is one;
+        otherwise exports the model to ONNX, quantizes it dynamically (int8
+        weights, activations quantized at run time) and keeps the result
+        under CACHE_PATH for the next start.
+        """
+        import onnxruntime
+
+        # ONNX Runtime sizes its own intra-op pool at session creation, so
+        # the per-process thread budget must be known before loading
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = self.torch_threads
+        model_kwargs = {
+            "file_name": settings.EMBEDDING_ONNX_FILE,
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        }
+
+        local_dir = Path(settings.CACHE_PATH) / "onnx" / settings.EMBEDDING_MODEL.replace("/", "__")
+        if (local_dir / settings.EMBEDDING_ONNX_FILE).exists():
+            return SentenceTransformer(
+                str(local_dir), device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+        try:
+            return SentenceTransformer(
+                settings.EMBEDDING_MODEL, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+        except Exception as e:
+            logger.info(f"No published {settings.EMBEDDING_ONNX_FILE} ({e}); quantizing locally")
+
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        fp32 = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu", backend="onnx")
+        fp32.save(str(local_dir))
+        export_dynamic_quantized_onnx_model(
+            fp32,
+            quantization_config="avx2",
+            model_name_or_path=str(local_dir),
+            file_suffix=Path(settings.EMBEDDING_ONNX_FILE).stem.replace("model_", "", 1),
+        )
+        return SentenceTransformer(
+            str(local_dir), device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Return this process's worker pool, creating it on first use.
+
+        Threads do not survive fork, so a pool started in a preloading master
+        is replaced (along with the queue slots) in each worker.
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._executor_pid != pid:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.EMBEDDING_WORKERS,
+                    thread_name_prefix="embedding",
+                )
+                self._slots = threading.BoundedSemaphore(
+                    settings.EMBEDDING_QUEUE_SIZE)
+                self._executor_pid = pid
+            return self._executor
+
+    def _apply_thread_config(self) -> None:
+        """Apply torch_threads once per process (workers re-apply after fork)."""
+        pid = os.getpid()
+        if self._threads_applied_pid != pid:
+            if self.backend == "torch":
+                torch.set_num_threads(self.torch_threads)
+            self._threads_applied_pid = pid
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the model on a batch; executes on a pool thread."""
+        if self.model is None:
+            raise RuntimeError("Embedding model not initialized")
+
+        self._apply_thread_config()
+        embeddings: Union[np.ndarray, torch.Tensor] = self.model.encode(
+            texts,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        if isinstance(embeddings, torch.Tensor):
+            embeddings = embeddings.detach().cpu().numpy()
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def submit(self, texts: List[str], block: bool = True) -> "Future[np.ndarray]":
+        """
+        Queue a batch for encoding on the worker pool.
+
+        At most EMBEDDING_QUEUE_SIZE batches may be queued or running; beyond
+        that callers wait (block=True) or get a RuntimeError (block=False).
+        """
+        if not self._initialized:
+            self.initialize()
+
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=block):
+            raise RuntimeError("Embedding queue is full")
+
+        try:
+            future = executor.submit(self._encode, texts)
+        except Exception:
+            slots.release()
+            raise
+
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts and wait for the result.
+
+        Returns:
+            Matrix of shape (len(texts), dim) with normalized rows
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return self.submit(texts).result()
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """Embed a single text (micro-batched) and wait for the result."""
+        if self.batch_window <= 0:
+            return self.encode([text])[0]
+        return self._enqueue(text).result()
+
+    async def aencode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts without blocking the event loop."""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        try:
+            future = self.submit(texts, block=False)
+        except RuntimeError:
+            # Queue full: wait for a slot off the event loop
+            future = await asyncio.to_thread(self.submit, texts)
+        return await asyncio.wrap_future(future)
+
+    async def aencode_one(self, text: str) -> np.ndarray:
+        """Embed a single text (micro-batched) without blocking the event loop."""
+        if self.batch_window <= 0:
+            return (await self.aencode([text]))[0]
+        try:
+            future = self._enqueue(text, block=False)
+        except queue.Full:
+            future = await asyncio.to_thread(self._enqueue, text)
+        return await asyncio.wrap_future(future)
+
+    # ---- Micro-batching ----
+
+    def _get_pending(self) -> "queue.Queue[Any]":
+        """Return this process's pending-query queue, starting its batcher."""
+        pid = os.getpid()
+        with self._lock:
+            if self._pending is None or self._batcher_pid != pid:
+                self._pending = queue.Queue(
+                    maxsize=settings.EMBEDDING_QUEUE_SIZE * self.max_batch_size)
+                self._batcher = threading.Thread(
+                    target=self._run_batcher, args=(self._pending,),
+                    name="embedding-batcher", daemon=True,
+                )
+                self._batcher.start()
+                self._batcher_pid = pid
+            return self._pending
+
+    def _enqueue(self, text: str, block: bool = True) -> "Future[np.ndarray]":
+        """
+        Hand one query to the micro-batcher.
+
+        Raises:
+            queue.Full: If block=False and the pending queue is full
+        """
+        if not self._initialized:
+            self.initialize()
+
+        future: "Future[np.ndarray]" = Future()
+        self._get_pending().put((text, future, time.perf_counter()), block=block)
+        return future
+
+    def _run_batcher(self, pending: "queue.Queue[Any]") -> None:
+        """
+        Batcher loop: collect queries for up to batch_window seconds (or
+        max_batch_size queries) after the first one arrives, then encode them
+        together on the worker pool.
+        """
+        while True:
+            first = pending.get()
+            if first is self._STOP:
+                return
+
+            batch: List[_PendingQuery] = [first]
+            deadline = time.perf_counter() + self.batch_window
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[_PendingQuery]) -> None:
+        """Encode a collected batch and fan the rows back to the callers."""
+        dispatched_at = time.perf_counter()
+        waits = [(dispatched_at - enqueued) * 1000 for _, _, enqueued in batch]
+
+        try:
+            future = self.submit([text for text, _, _ in batch])
+        except Exception as e:
+            for _, caller, _ in batch:
+                caller.set_exception(e)
+            return
+
+        def fan_out(done: "Future[np.ndarray]") -> None:
+            encode_ms = (time.perf_counter() - dispatched_at) * 1000
+            error = done.exception()
+            if error is not None:
+                for _, caller, _ in batch:
+                    caller.set_exception(error)
+            else:
+                rows = done.result()
+                for i, (_, caller, _) in enumerate(batch):
+                    caller.set_result(rows[i])
+            self._record_batch(len(batch), waits, encode_ms)
+
+        future.add_done_callback(fan_out)
+
+    def _record_batch(self, size: int, waits: List[float], encode_ms: float) -> None:
+        """Accumulate micro-batching metrics."""
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["queries"] += size
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], size)
+            self._stats["queue_wait_ms"] += sum(waits)
+            self._stats["max_queue_wait_ms"] = max(
+                self._stats["max_queue_wait_ms"], max(waits))
+            self._stats["encode_ms"] += encode_ms
+
+    def stats(self) -> dict:
+        """
+        Return micro-batching tunables and metrics.
+
+        avg_batch_size measures the throughput gained from batching;
+        avg_queue_wait_ms is the latency it adds to each query.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        batches = stats.pop("batches")
+        queries = stats["queries"]
+        return {
+            "batch_window_ms": self.batch_window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batches": batches,
+            "queries": queries,
+            "largest_batch": stats["largest_batch"],
+            "avg_batch_size": round(queries / batches, 2) if batches else 0.0,
+            "avg_queue_wait_ms": round(stats["queue_wait_ms"] / queries, 3) if queries else 0.0,
+            "max_queue_wait_ms": round(stats["max_queue_wait_ms"], 3),
+            "avg_encode_ms": round(stats["encode_ms"] / batches, 3) if batches else 0.0,
+            "pending": self._pending.qsize() if self._pending is not None else 0,
+        }
+
+    def shutdown(self) -> None:
+        """Flush pending queries, then stop the worker pool."""
+        if self._pending is not None and self._batcher_pid == os.getpid():
+            self._pending.put(self._STOP)
+            if self._batcher is not None:
+                self._batcher.join(timeout=5)
+            self._pending = None
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class ServiceEmbeddings(Embeddings):
+    """LangChain Embeddings adapter over the shared EmbeddingService."""
+
+    def __init__(self, service: EmbeddingService) -> None:
+        self.service = service
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents for indexing."""
+        return self.service.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query for search."""
+        return self.service.encode_one(text).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents without blocking the event loop."""
+        return (await self.service.aencode(texts)).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query without blocking the event loop."""
+        return (await self.service.aencode_one(text)).tolist()
+
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
@@ -0,0 +1,177 @@
+"""
+Parallel document loading for indexing.
+Markdown and PDF files are parsed in a process pool, one file per task, with
+a per-file timeout; a file that fails or hangs is skipped without affecting
+the others. Loaded documents are yielded as each file finishes so splitting
+and embedding can start before the slowest file is done. Small generator
+helpers keep the rest of the indexing pipeline streaming and timed.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import multiprocessing
+import os
+import signal
+import time
+
+from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_core.documents import Document
+from loguru import logger
+
+from app.config import settings
+
+
+T = TypeVar("T")
+
+
+def discover_files() -> List[Path]:
+    """List the files to index: knowledge-base markdown and top-level PDFs."""
+    files = sorted(Path(settings.KNOWLEDGE_BASE_PATH).glob("**/*.md"))
+    pdf_path = Path(settings.DOCUMENTS_PATH)
+    if pdf_path.exists():
+        files.extend(sorted(pdf_path.glob("*.pdf")))
+    return files
+
+
+def _on_timeout(signum, frame):
+    raise TimeoutError("file took too long to parse")
+
+
+def load_file(path: str, timeout: float = 0) -> List[Document]:
+    """
+    Parse one file into documents (one per PDF page, one per markdown file).
+
+    Args:
+        path: File to load
+        timeout: Seconds before parsing is aborted with TimeoutError (0 = none).
+            Enforced with SIGALRM, so only in a process's main thread, which
+            is where pool workers run their tasks.
+
+    Returns:
+        Loaded documents
+    """
+    use_alarm = timeout > 0 and hasattr(signal, "setitimer") and \
+        multiprocessing.current_process().name != "MainProcess"
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if path.lower().endswith(".pdf"):
+            return PyPDFLoader(path).load()
+        return TextLoader(path, encoding="utf-8").load()
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (its affinity mask, not the host's count)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def iter_documents(files: List[Path], workers: Optional[int] = None,
+                   timeout: Optional[float] = None,
+                   stats: Optional[Dict[str, float]] = None
+                   ) -> Iterator[Tuple[Path, List[Document]]]:
+    """
+    Load files in parallel, yielding each file's documents as it completes.
+
+    Args:
+        files: Files to load
+        workers: Worker processes (default INDEXING_WORKERS; 0 = one per
+            usable CPU, 1 = load serially in this process). Capped at the
+            usable CPUs and the number of files; below
+            INDEXING_PARALLEL_MIN_FILES PDFs, files load serially regardless.
+        timeout: Per-file parse timeout in seconds (default INDEXING_FILE_TIMEOUT)
+        stats: Optional dict filled with files/documents/failed/seconds counters
+
+    Yields:
+        (path, documents) for one file at a time, in completion order
+    """
+    workers = settings.INDEXING_WORKERS if workers is None else workers
+    workers = min(workers or available_cpus(), available_cpus(), len(files))
+    # Markdown loads in well under a millisecond; only PDFs pay for the pool
+    pdfs = sum(path.suffix.lower() == ".pdf" for path in files)
+    if pdfs < settings.INDEXING_PARALLEL_MIN_FILES:
+        workers = 1
+    timeout = settings.INDEXING_FILE_TIMEOUT if timeout is None else timeout
+    stats = {} if stats is None else stats
+    stats.update({"files": len(files), "documents": 0, "failed": 0, "seconds": 0.0})
+    started = time.perf_counter()
+
+    def record(path: Path, docs: List[Document]) -> Tuple[Path, List[Document]]:
+        stats["documents"] += len(docs)
+        logger.debug(f"Loaded {path.name} ({len(docs)} documents)")
+        return path, docs
+
+    def fail(path: Path, error: BaseException) -> None:
+        stats["failed"] += 1
+        logger.warning(f"Failed to load {path.name}: {error!r}")
+
+    if workers <= 1:
+        for path in files:
+            try:
+                yield record(path, load_file(str(path)))
+            except Exception as e:
+                fail(path, e)
+        stats["seconds"] = time.perf_counter() - started
+        return
+
+    # Spawned workers do not inherit the model, thread pools or locks of this
+    # process; they only import the loaders
+    context = multiprocessing.get_context("spawn")
+    pending = list(files)
+    for attempt in range(2):
+        crashed: List[Path] = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 mp_context=context) as pool:
+            futures = {pool.submit(load_file, str(path), timeout): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    yield record(path, future.result())
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. a parser segfault); every unfinished
+                    # file fails with it, so give them one more pool
+                    if attempt == 0:
+                        crashed.append(path)
+                    else:
+                        fail(path, e)
+                except Exception as e:
+                    fail(path, e)
+        if not crashed:
+            break
+        logger.warning(f"Loader process crashed; retrying {len(crashed)} files")
+        pending = crashed
+
+    stats["seconds"] = time.perf_counter() - started
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of at most `size` items."""
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def timed(items: Iterable[T], timings: Dict[str, float], stage: str) -> Iterator[T]:
+    """Pass items through, adding the time spent producing them to timings[stage]."""
+    iterator = iter(items)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[stage] += time.perf_counter() - started
+            return
+        timings[stage] += time.perf_counter() - started
+        yield item
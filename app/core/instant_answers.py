@@ -0,0 +1,117 @@
+"""
+Precomputed instant answers for the suggested-question buttons.
+Answers are computed once at startup, pinned in memory and served with no
+database reads or model calls; they are recomputed when the index changes.
+"""
+
+from typing import Dict, List, Optional
+import threading
+from loguru import logger
+
+from app.core.llm import llm_handler
+from app.core.rag import rag_pipeline
+from app.core.tasks import task_queue
+from app.db.crud import get_cached_response_by_question, normalize_question
+from app.db.database import SessionLocal
+
+
+# Shown as buttons under the chat input
+SUGGESTED_QUESTIONS: List[str] = [
+    "What's your most impressive project?",
+    "Tell me about your AI experience",
+    "What technologies do you use?",
+]
+
+
+class InstantAnswerStore:
+    """In-memory answers for a fixed set of questions, tied to an index version."""
+
+    def __init__(self, questions: List[str]) -> None:
+        """Initialize an empty store for the given questions."""
+        self.questions = questions
+        self._answers: Dict[str, str] = {}
+        self._index_version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _compute(self, question: str, use_cache: bool) -> str:
+        """Answer one question, from the response cache when allowed."""
+        if use_cache:
+            db = SessionLocal()
+            try:
+                cached = get_cached_response_by_question(db, question)
+                if cached:
+                    return cached.answer
+            finally:
+                db.close()
+
+        context = rag_pipeline.retrieve_context(question)
+        answer = llm_handler.generate_response(query=question, context=context)
+
+        if use_cache:
+            task_queue.submit("add_to_cache", query=question, answer=answer)
+
+        return answer
+
+    def refresh(self, use_cache: bool = True) -> None:
+        """
+        Recompute every answer and pin it for the current index version.
+
+        Args:
+            use_cache: Reuse exact cache entries (startup). Pass False after the
+                knowledge base changed, since cached answers may be stale.
+        """
+        version = rag_pipeline.index_version
+        answers: Dict[str, str] = {}
+
+        for question in self.questions:
+            try:
+                answers[normalize_question(question)] = self._compute(
+                    question, use_cache)
+            except Exception as e:
+                logger.warning(f"Could not precompute '{question}': {e}")
+
+        with self._lock:
+            self._answers = answers
+            self._index_version = version
+            self._refreshing = False
+
+        logger.info(
+            f"Pinned {len(answers)}/{len(self.questions)} instant answers "
+            f"(index version {version})")
+
+    def _refresh_in_background(self) -> None:
+        """Start a refresh thread unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        logger.info("Knowledge base changed; refreshing instant answers")
+        threading.Thread(
+            target=self.refresh, kwargs={"use_cache": False},
+            name="instant-answers", daemon=True
+        ).start()
+
+    def get(self, question: str) -> Optional[str]:
+        """
+        Return the pinned answer for a question, if there is a fresh one.
+
+        Stale answers are never served: after an index change the caller falls
+        back to the normal pipeline until the background refresh finishes.
+        """
+        with self._lock:
+            if self._index_version is None:
+                return None
+            stale = self._index_version != rag_pipeline.index_version
+            answer = None if stale else self._answers.get(
+                normalize_question(question))
+
+        if stale:
+            self._refresh_in_background()
+
+        return answer
+
+
+# Global instant answer store for the suggested questions
+instant_answers = InstantAnswerStore(SUGGESTED_QUESTIONS)
@@ -0,0 +1,129 @@
+"""
+Embedding-based intent router for natural-language command questions.
+Maps questions like "how can I contact you?" to the static slash-command
+answers, skipping retrieval and the LLM entirely.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from loguru import logger
+
+from app.config import settings
+from app.core.cache import cache_manager
+from app.core.commands import command_handler
+
+
+# Canonical phrasings per command; a question is routed when it is close
+# enough to any of them
+INTENT_PHRASES: Dict[str, List[str]] = {
+    "/skills": [
+        "what are your skills",
+        "what technical skills do you have",
+        "what programming languages do you know",
+        "what is your tech stack",
+        "list your technical skills",
+    ],
+    "/projects": [
+        "what projects have you built",
+        "show me your projects",
+        "list your projects",
+        "what have you worked on",
+    ],
+    "/education": [
+        "what is your educational background",
+        "where did you study",
+        "what degrees do you have",
+        "tell me about your education",
+    ],
+    "/contact": [
+        "how can I contact you",
+        "what is your email address",
+        "how do I get in touch with you",
+        "what is your phone number",
+        "what is your linkedin",
+    ],
+    "/resume": [
+        "can I see your resume",
+        "where can I download your resume",
+        "send me your cv",
+    ],
+    "/about": [
+        "tell me about yourself",
+        "who are you",
+        "introduce yourself",
+    ],
+}
+
+
+class IntentRouter:
+    """Routes questions to slash commands by embedding similarity."""
+
+    def __init__(self) -> None:
+        """Initialize an empty router."""
+        self._phrase_matrix: Optional[np.ndarray] = None
+        self._phrase_commands: List[str] = []
+        self._initialized = False
+
+    def initialize(self) -> None:
+        """Embed every canonical phrasing in one batch."""
+        if self._initialized:
+            logger.info("Intent router already initialized")
+            return
+
+        phrases = []
+        for command, command_phrases in INTENT_PHRASES.items():
+            for phrase in command_phrases:
+                phrases.append(phrase)
+                self._phrase_commands.append(command)
+
+        self._phrase_matrix = cache_manager.get_embeddings(phrases)
+        self._initialized = True
+        logger.info(
+            f"Intent router initialized with {len(phrases)} phrases "
+            f"for {len(INTENT_PHRASES)} commands")
+
+    def route(self, query_embedding: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Find the command whose phrasing best matches a query.
+
+        Args:
+            query_embedding: Normalized embedding of the user's question
+
+        Returns:
+            Tuple of (command, similarity) above the threshold, None otherwise
+        """
+        if not self._initialized or self._phrase_matrix is None or len(query_embedding) == 0:
+            return None
+
+        # Rows and query are normalized, so the dot product is the cosine
+        similarities = self._phrase_matrix @ query_embedding
+        best = int(np.argmax(similarities))
+        score = float(similarities[best])
+
+        if score < settings.INTENT_ROUTER_THRESHOLD:
+            return None
+
+        command = self._phrase_commands[best]
+        logger.info(f"Routed question to {command} (similarity: {score:.3f})")
+        return (command, score)
+
+    def answer(self, query_embedding: np.ndarray) -> Optional[Tuple[str, str, float]]:
+        """
+        Answer a question from the command table if it routes to a command.
+
+        Returns:
+            Tuple of (command, response, similarity), or None if not routed
+        """
+        routed = self.route(query_embedding)
+        if routed is None:
+            return None
+
+        command, score = routed
+        _, response = command_handler.handle_command(command)
+        if not response:
+            return None
+        return (command, response, score)
+
+
+# Global intent router instance
+intent_router = IntentRouter()
@@ -0,0 +1,109 @@
+"""
+Knowledge-base file watcher.
+Polls the files the RAG pipeline indexes and, once a change has settled,
+refreshes the live index incrementally: only added and changed files are
+re-embedded, and the new index is swapped in with an index_version bump
+that the retrieval cache and instant answers use to invalidate themselves.
+"""
+
+from typing import Dict, Optional, Tuple
+import threading
+
+from loguru import logger
+
+from app.config import settings
+from app.core.ingest import discover_files
+from app.core.rag import RAGPipeline, rag_pipeline
+
+
+# File path -> (mtime in ns, size)
+Signature = Dict[str, Tuple[int, int]]
+
+
+class KnowledgeBaseWatcher:
+    """Background thread that keeps a RAG pipeline in sync with its files."""
+
+    def __init__(self, pipeline: RAGPipeline, interval: Optional[float] = None) -> None:
+        """
+        Initialize a stopped watcher.
+
+        Args:
+            pipeline: Pipeline to refresh
+            interval: Seconds between polls (default KB_WATCH_INTERVAL)
+        """
+        self.pipeline = pipeline
+        self.interval = interval or settings.KB_WATCH_INTERVAL
+        self.refreshes = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Signature the index was last refreshed against; None forces one
+        # content-hash comparison on the first poll
+        self._indexed: Optional[Signature] = None
+        self._last_seen: Optional[Signature] = None
+
+    @staticmethod
+    def _signature() -> Signature:
+        """Cheap change detector: stat every indexed file."""
+        signature = {}
+        for path in discover_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return signature
+
+    def poll(self) -> Optional[dict]:
+        """
+        Check for changes once and refresh the index if they have settled.
+
+        A change is acted on only when two consecutive polls agree, so a
+        file that is still being written is not indexed half-way.
+
+        Returns:
+            The pipeline's refresh stats, or None if nothing was refreshed
+        """
+        signature = self._signature()
+        if signature == self._indexed:
+            self._last_seen = signature
+            return None
+        if self._indexed is not None and signature != self._last_seen:
+            self._last_seen = signature
+            return None
+
+        stats = self.pipeline.refresh_index()
+        self._indexed = self._last_seen = signature
+        if stats is not None:
+            self.refreshes += 1
+        return stats
+
+    def _run(self) -> None:
+        """Poll until stopped; errors are logged and retried next poll."""
+        while not self._stop.wait(self.interval):
+            # Leave the first index to warm-up
+            if self.pipeline.index_version == 0:
+                continue
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Knowledge-base refresh failed: {e}")
+
+    def start(self) -> None:
+        """Start polling in a daemon thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kb-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching the knowledge base every {self.interval:g}s")
+
+    def stop(self) -> None:
+        """Stop polling and wait for an in-progress refresh to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Global watcher instance (started per server process when KB_WATCH_ENABLED)
+kb_watcher = KnowledgeBaseWatcher(rag_pipeline)
@@ -3,7 +3,7 @@ LLM integration with Groq for fast inference.
 Handles prompt generation, conversation memory, and streaming responses.
 """
 
-from typing import List, Dict, Optional, Any, cast
+from typing import Iterator, List, Dict, Optional, Any, cast
 from groq import Groq
 from loguru import logger
 from groq.types.chat import ChatCompletionMessageParam
@@ -37,6 +37,64 @@ class LLMHandler:
             logger.error(f"Failed to initialize LLM: {e}")
             raise
 
+    def _build_messages(
+        self,
+        query: str,
+        context: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> List[ChatCompletionMessageParam]:
+        """Build the system prompt, recent history and user turn for Groq."""
+        # === System Prompt ===
+        system_prompt = """
+        You are Sarjak Maniar's AI portfolio assistant. Provide accurate, professional information about Sarjak's background, skills, projects, and experience.
+
+        RESPONSE GUIDELINES:
+        - Be direct, concise, and natural
+        - Use first person ("I" or "my") when speaking as Sarjak
+        - Avoid filler phrases like "I'm excited to share"
+        - Get straight to the point
+        - Use context to provide specific, accurate details
+        - If asked about personal topics (hobbies, personal life) not in context, politely redirect to professional topics
+        - Keep responses under 150 words unless more detail is requested
+        - Use bullet points for lists
+        - Never fabricate information not in the context
+
+        CONTEXT USAGE:
+        - Use provided context to answer accurately
+        - If context doesn't contain the answer, say "I haven't included that information in my portfolio, but I'm happy to discuss my professional background, projects, and skills"
+        - Never make up projects, experiences, or skills
+        """
+
+        # --- Build messages as plain dicts ---
+        messages: List[Dict[str, Any]] = [
+            {"role": "system", "content": system_prompt}
+        ]
+
+        # Add up to 6 most recent exchanges from conversation history
+        if conversation_history:
+            for msg in conversation_history[-6:]:
+                # accept only well-formed items
+                if isinstance(msg, dict) and "role" in msg and "content" in msg:
+                    messages.append({
+                        "role": str(msg["role"]),
+                        "content": str(msg["content"]),
+                    })
+
+        # Add user query + context
+        user_message = f"""
+            Context about Sarjak: {context}
+
+            User question: {query}
+
+            Provide a direct, natural response using the context. Speak as Sarjak in first-person. 
+            If the question is about personal topics not in the context (like hobbies), politely redirect to professional topics.
+            """
+
+        messages.append({"role": "user", "content": user_message})
+
+        # --- Single cast to the Groq type for the call ---
+        return cast(List[ChatCompletionMessageParam], messages)
+
     def generate_response(
         self,
         query: str,
@@ -60,56 +118,8 @@ class LLMHandler:
         try:
             logger.info(f"Generating response for query: {query[:50]}...")
 
-            # === System Prompt ===
-            system_prompt = """
-            You are Sarjak Maniar's AI portfolio assistant. Provide accurate, professional information about Sarjak's background, skills, projects, and experience.
-
-            RESPONSE GUIDELINES:
-            - Be direct, concise, and natural
-            - Use first person ("I" or "my") when speaking as Sarjak
-            - Avoid filler phrases like "I'm excited to share"
-            - Get straight to the point
-            - Use context to provide specific, accurate details
-            - If asked about personal topics (hobbies, personal life) not in context, politely redirect to professional topics
-            - Keep responses under 150 words unless more detail is requested
-            - Use bullet points for lists
-            - Never fabricate information not in the context
-
-            CONTEXT USAGE:
-            - Use provided context to answer accurately
-            - If context doesn't contain the answer, say "I haven't included that information in my portfolio, but I'm happy to discuss my professional background, projects, and skills"
-            - Never make up projects, experiences, or skills
-            """
-
-            # --- Build messages as plain dicts ---
-            messages: List[Dict[str, Any]] = [
-                {"role": "system", "content": system_prompt}
-            ]
-
-            # Add up to 6 most recent exchanges from conversation history
-            if conversation_history:
-                for msg in conversation_history[-6:]:
-                    # accept only well-formed items
-                    if isinstance(msg, dict) and "role" in msg and "content" in msg:
-                        messages.append({
-                            "role": str(msg["role"]),
-                            "content": str(msg["content"]),
-                        })
-
-            # Add user query + context
-            user_message = f"""
-                Context about Sarjak: {context}
-
-                User question: {query}
-
-                Provide a direct, natural response using the context. Speak as Sarjak in first-person. 
-                If the question is about personal topics not in the context (like hobbies), politely redirect to professional topics.
-                """
-
-            messages.append({"role": "user", "content": user_message})
-
-            # --- Single cast to the Groq type for the call ---
-            typed_messages = cast(List[ChatCompletionMessageParam], messages)
+            typed_messages = self._build_messages(
+                query, context, conversation_history)
 
             # === Generate Response ===
             response = self.client.chat.completions.create(
@@ -130,6 +140,54 @@ class LLMHandler:
             logger.error(f"Error generating response: {e}")
             raise
 
+    def stream_response(
+        self,
+        query: str,
+        context: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Iterator[str]:
+        """
+        Generate a response using the Groq LLM, yielding text as it arrives.
+
+        Args:
+            query: User's question
+            context: Retrieved context from RAG
+            conversation_history: Previous conversation messages
+
+        Yields:
+            Text deltas of the response.
+        """
+        if not self._initialized or not self.client:
+            raise RuntimeError("LLM not initialized")
+
+        try:
+            logger.info(f"Streaming response for query: {query[:50]}...")
+
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(
+                    query, context, conversation_history),
+                temperature=0.2,
+                max_tokens=500,
+                top_p=0.9,
+                stream=True,
+            )
+
+            total_chars = 0
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    total_chars += len(delta)
+                    yield delta
+
+            logger.info(f"Streamed response ({total_chars} chars)")
+
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            raise
+
 
 # Global instance
 llm_handler = LLMHandler()
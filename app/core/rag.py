@@ -1,26 +1,30 @@
 """
 RAG (Retrieval-Augmented Generation) pipeline for portfolio knowledge base.
-Uses LangChain v0.3+ syntax with Qdrant vector store.
+Uses LangChain v0.3+ document tooling with a pluggable dense vector backend
+(exact NumPy search or in-memory Qdrant) fused with BM25.
 """
 
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
+import json
 import os
+import threading
+import time
 
-from langchain_community.document_loaders import (
-    DirectoryLoader,
-    TextLoader,
-    PyPDFLoader
-)
+import numpy as np
+
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
 from loguru import logger
 
 from app.config import settings
+from app.core.bm25 import BM25Index, extract_entities, reciprocal_rank_fusion
+from app.core.chunk_cache import ChunkCache, file_hash
+from app.core.embeddings import ServiceEmbeddings, embedding_service
+from app.core.ingest import batched, discover_files, iter_documents, timed
+from app.core.retrieval_cache import RetrievalCache
+from app.core.snapshot import VectorSnapshot, snapshot_staleness, write_snapshot
+from app.core.vector_backends import NumpyBackend, VectorBackend, create_backend, quantize
 
 
 class RAGPipeline:
@@ -29,9 +33,28 @@ class RAGPipeline:
     def __init__(self):
         """Initialize RAG pipeline with embeddings and vector store."""
         self.embeddings = None
-        self.vector_store = None
-        self.retriever = None
+        # Dense index: chunk id -> normalized embedding
+        self.vectors: Optional[VectorBackend] = None
+        # Lexical index over the same chunks (chunk_id = position)
+        self.bm25 = BM25Index()
+        # Per-stage counts and throughput of the last indexing run
+        self.indexing_stats: dict = {}
+        # Content hash and entity names of every indexed source file
+        self.file_hashes: Dict[str, str] = {}
+        self.file_entities: Dict[str, List[str]] = {}
+        # Memory-mapped snapshot backing self.vectors, when one was loaded
+        self.snapshot: Optional[VectorSnapshot] = None
         self._initialized = False
+        # Bumped whenever the indexed content changes; downstream caches
+        # compare against it to detect staleness
+        self.index_version = 0
+        # Ranked chunk ids of recent queries, for the current index version
+        self.retrieval_cache = RetrievalCache(
+            settings.RETRIEVAL_CACHE_SIZE, settings.RETRIEVAL_CACHE_SIMILARITY)
+        # Held briefly to swap in a new index, or to read a consistent
+        # (vectors, bm25, version) triple; indexing runs one at a time
+        self._swap_lock = threading.Lock()
+        self._index_lock = threading.Lock()
 
     def initialize(self) -> None:
         """Initialize embeddings model and vector store."""
@@ -42,46 +65,14 @@ class RAGPipeline:
         try:
             logger.info("Initializing RAG pipeline...")
 
-            # Initialize embeddings model (runs locally)
-            logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=settings.EMBEDDING_MODEL,
-                # Use 'mps' for M-series Mac if you want GPU
-                model_kwargs={'device': 'cpu'},
-                encode_kwargs={'normalize_embeddings': True}
-            )
-
-            # Initialize Qdrant client (in-memory mode for development)
-            logger.info("Initializing Qdrant vector store...")
-            # In-memory for simplicity
-            self.client = QdrantClient(location=":memory:")
-
-            # Create collection if it doesn't exist
-            collection_name = "portfolio_knowledge"
-            try:
-                self.client.get_collection(collection_name)
-                logger.info(f"Collection '{collection_name}' already exists")
-            except Exception:
-                # Create new collection
-                self.client.create_collection(
-                    collection_name=collection_name,
-                    # MiniLM produces 384-dim vectors
-                    vectors_config=VectorParams(
-                        size=384, distance=Distance.COSINE)
-                )
-                logger.info(f"Created new collection: '{collection_name}'")
-
-            # Initialize vector store
-            self.vector_store = QdrantVectorStore(
-                client=self.client,
-                collection_name=collection_name,
-                embedding=self.embeddings
-            )
+            # Initialize embeddings model (runs locally, shared with the
+            # cache and executed on the embedding worker pool)
+            embedding_service.initialize()
+            self.embeddings = ServiceEmbeddings(embedding_service)
 
-            # Create retriever
-            self.retriever = self.vector_store.as_retriever(
-                search_kwargs={"k": settings.TOP_K_RETRIEVAL}
-            )
+            logger.info(f"Initializing {settings.VECTOR_BACKEND} vector backend...")
+            self.vectors = create_backend(
+                settings.VECTOR_BACKEND, embedding_service.dimension)
 
             self._initialized = True
             logger.info("RAG pipeline initialized successfully")
@@ -91,75 +82,368 @@ class RAGPipeline:
             raise
 
     def load_and_index_documents(self) -> int:
-        """Load documents from knowledge base and index them."""
+        """
+        Load documents from knowledge base and index them.
+
+        The index is built alongside the current one and swapped in when
+        complete, so queries keep using the previous index meanwhile.
+        """
         if not self._initialized:
             self.initialize()
 
         try:
-            documents = []
-
-            # Load markdown files
-            logger.info("Loading markdown files...")
-            md_loader = DirectoryLoader(
-                settings.KNOWLEDGE_BASE_PATH,
-                glob="**/*.md",
-                loader_cls=TextLoader,
-                loader_kwargs={'encoding': 'utf-8'}
-            )
-            md_docs = md_loader.load()
-            documents.extend(md_docs)
-            logger.info(f"Loaded {len(md_docs)} markdown documents")
-
-            # Load PDF files if they exist
-            pdf_path = Path(settings.DOCUMENTS_PATH)
-            if pdf_path.exists():
-                logger.info("Loading PDF files...")
-                pdf_files = list(pdf_path.glob("*.pdf"))
-                for pdf_file in pdf_files:
-                    try:
-                        pdf_loader = PyPDFLoader(str(pdf_file))
-                        pdf_docs = pdf_loader.load()
-                        documents.extend(pdf_docs)
-                        logger.info(
-                            f"Loaded PDF: {pdf_file.name} ({len(pdf_docs)} pages)")
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to load PDF {pdf_file.name}: {e}")
-
-            if not documents:
-                logger.warning("No documents found to index!")
-                return 0
-
-            # Split documents into chunks
-            logger.info("Splitting documents into chunks...")
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=settings.CHUNK_SIZE,
-                chunk_overlap=settings.CHUNK_OVERLAP,
-                length_function=len,
-                separators=["\n\n", "\n", " ", ""]
-            )
-            splits = text_splitter.split_documents(documents)
-            logger.info(f"Created {len(splits)} chunks")
-
-            # Add documents to vector store
-            logger.info("Indexing documents in vector store...")
-            if self.vector_store is None:
-                raise RuntimeError("Vector store not properly initialized")
-            self.vector_store.add_documents(splits)
-            logger.info(f"Successfully indexed {len(splits)} document chunks")
-
-            return len(splits)
-
+            with self._index_lock:
+                return self._build_index()
         except Exception as e:
             logger.error(f"Error loading and indexing documents: {e}")
             raise
 
-    def retrieve_context(self, query: str) -> str:
+    def _text_splitter(self) -> Tuple[RecursiveCharacterTextSplitter, str]:
+        """The chunk splitter and a key identifying its configuration."""
+        separators = ["\n\n", "\n", " ", ""]
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
+            length_function=len,
+            separators=separators
+        )
+        splitter_key = json.dumps([type(text_splitter).__name__, settings.CHUNK_SIZE,
+                                   settings.CHUNK_OVERLAP, separators])
+        return text_splitter, splitter_key
+
+    def _build_index(self) -> int:
+        """Index every knowledge-base file into a new index and swap it in."""
+        files = discover_files()
+        if not files:
+            logger.warning("No documents found to index!")
+            return 0
+
+        if self.vectors is None:
+            raise RuntimeError("Vector backend not properly initialized")
+
+        text_splitter, splitter_key = self._text_splitter()
+        vectors = create_backend(settings.VECTOR_BACKEND, embedding_service.dimension)
+        bm25 = BM25Index()
+
+        # Streaming pipeline: load (process pool) -> split -> embed in
+        # batches -> upsert in batches. Only one upsert batch of chunks
+        # and vectors is held at a time.
+        timings = {"load": 0.0, "split": 0.0, "embed": 0.0, "upsert": 0.0}
+        counts = {"documents": 0, "chunks": 0, "vectors": 0,
+                  "cached_files": 0, "split_chunks": 0}
+        load_stats: dict = {}
+
+        cache = ChunkCache() if settings.CHUNK_CACHE_ENABLED else None
+        hashes: Dict[Path, str] = {}
+        # Files that failed to load get no hash, so a refresh retries them
+        loaded: Set[Path] = set()
+        file_entities: Dict[str, List[str]] = {}
+
+        def split_file(path: Path, pages: List[Document]) -> List[Document]:
+            loaded.add(path)
+            counts["documents"] += len(pages)
+            names = [name for page in pages for name in extract_entities(page.page_content)]
+            bm25.add_entity_names(names)
+            file_entities[str(path)] = names
+            if cache is not None:
+                chunks = cache.get(cache.chunks_path(hashes[path], splitter_key), path)
+                if chunks is not None:
+                    counts["cached_files"] += 1
+                    return chunks
+            started = time.perf_counter()
+            chunks = text_splitter.split_documents(pages)
+            timings["split"] += time.perf_counter() - started
+            counts["split_chunks"] += len(chunks)
+            if cache is not None:
+                cache.put(cache.chunks_path(hashes[path], splitter_key), chunks)
+            return chunks
+
+        def iter_chunks() -> Iterator[Document]:
+            # Unchanged files come from the cache; only the rest are parsed
+            to_parse = files
+            if cache is not None:
+                to_parse = []
+                for path in files:
+                    pages = cache.get(cache.pages_path(hashes[path]), path)
+                    if pages is None:
+                        to_parse.append(path)
+                        continue
+                    chunks = split_file(path, pages)
+                    counts["chunks"] += len(chunks)
+                    yield from chunks
+
+            for path, pages in timed(iter_documents(to_parse, stats=load_stats), timings, "load"):
+                if cache is not None:
+                    cache.put(cache.pages_path(hashes[path]), pages)
+                chunks = split_file(path, pages)
+                counts["chunks"] += len(chunks)
+                yield from chunks
+
+        logger.info(f"Indexing {len(files)} files...")
+        started = time.perf_counter()
+        for path in files:
+            hashes[path] = file_hash(path)
+        for batch in batched(iter_chunks(), settings.INDEXING_UPSERT_BATCH_SIZE):
+            counts["vectors"] += self._index_chunks(batch, timings, vectors, bm25)
+
+        self.indexing_stats = self._throughput(
+            counts, timings, load_stats, time.perf_counter() - started)
+        if cache is not None and not load_stats.get("failed"):
+            # Drop entries of files that changed or disappeared
+            cache.prune()
+        logger.info(f"Indexing stats: {self.indexing_stats}")
+
+        if counts["vectors"] == 0:
+            logger.warning("No documents found to index!")
+            return 0
+
+        logger.info(
+            f"Successfully indexed {counts['vectors']} document chunks "
+            f"({len(bm25.entities)} entity names for lexical lookup)")
+
+        self._swap(vectors, bm25,
+                   {str(path): digest for path, digest in hashes.items() if path in loaded},
+                   file_entities)
+        return counts["vectors"]
+
+    def refresh_index(self) -> Optional[dict]:
+        """
+        Bring the index up to date with the knowledge-base files.
+
+        Chunks of unchanged files keep their vectors; only added and changed
+        files are parsed, split and embedded. The result is built as a new
+        index and swapped in atomically, bumping index_version.
+
+        Returns:
+            Counts of the files and chunks involved, or None if nothing changed
+        """
+        if not self._initialized:
+            self.initialize()
+
+        with self._index_lock:
+            hashes = {str(path): file_hash(path) for path in discover_files()}
+            added = [path for path in hashes if path not in self.file_hashes]
+            changed = [path for path in hashes
+                       if path in self.file_hashes and hashes[path] != self.file_hashes[path]]
+            removed = [path for path in self.file_hashes if path not in hashes]
+            if not (added or changed or removed):
+                return None
+
+            started = time.perf_counter()
+            with self._swap_lock:
+                old_vectors, old_bm25 = self.vectors, self.bm25
+            dirty = set(changed) | set(removed)
+            vectors = create_backend(settings.VECTOR_BACKEND, embedding_service.dimension)
+            bm25 = BM25Index()
+            timings = {"load": 0.0, "split": 0.0, "embed": 0.0, "upsert": 0.0}
+
+            # Carry over unchanged files: their chunks are copied under new
+            # ids (the old index stays untouched for in-flight queries)
+            kept = [doc for doc in old_bm25.documents if doc.metadata.get("source") not in dirty]
+            kept_ids = {doc.metadata["chunk_id"] for doc in kept}
+            old_rows = {i: vector for i, vector in old_vectors.iter_vectors() if i in kept_ids}
+            file_entities: Dict[str, List[str]] = {}
+            for path in hashes:
+                if path in dirty or path in added:
+                    continue
+                names = self.file_entities.get(path)
+                if names is None:
+                    # Index loaded from an older snapshot without per-file entities
+                    names = extract_entities("\n".join(
+                        doc.page_content for doc in kept if doc.metadata.get("source") == path))
+                file_entities[path] = names
+                bm25.add_entity_names(names)
+            for batch in batched(kept, settings.INDEXING_UPSERT_BATCH_SIZE):
+                start_id = len(bm25)
+                ids = list(range(start_id, start_id + len(batch)))
+                docs = [Document(page_content=doc.page_content,
+                                 metadata={**doc.metadata, "chunk_id": chunk_id})
+                        for chunk_id, doc in zip(ids, batch)]
+                vectors.add(
+                    ids,
+                    np.stack([old_rows[doc.metadata["chunk_id"]] for doc in batch]),
+                    payloads=[{"page_content": d.page_content, "metadata": d.metadata}
+                              for d in docs],
+                )
+                bm25.add_documents(docs)
+
+            # Re-embed added and changed files
+            text_splitter, _ = self._text_splitter()
+            embedded = 0
+            to_load = [Path(path) for path in added + changed]
+            failed = {str(path) for path in to_load}
+            for path, pages in iter_documents(to_load, workers=1):
+                failed.discard(str(path))
+                names = [name for page in pages for name in extract_entities(page.page_content)]
+                file_entities[str(path)] = names
+                bm25.add_entity_names(names)
+                for batch in batched(text_splitter.split_documents(pages),
+                                     settings.INDEXING_UPSERT_BATCH_SIZE):
+                    embedded += self._index_chunks(batch, timings, vectors, bm25)
+
+            # Files that failed to load get no hash, so the next refresh
+            # retries them instead of treating them as indexed
+            self._swap(vectors, bm25,
+                       {path: digest for path, digest in hashes.items() if path not in failed},
+                       file_entities)
+            stats = {
+                "added": len(added),
+                "changed": len(changed),
+                "removed": len(removed),
+                "failed": len(failed),
+                "reused_chunks": len(kept),
+                "embedded_chunks": embedded,
+                "seconds": round(time.perf_counter() - started, 2),
+                "index_version": self.index_version,
+            }
+            logger.info(f"Refreshed index: {stats}")
+            return stats
+
+    def _swap(self, vectors: VectorBackend, bm25: BM25Index, file_hashes: Dict[str, str],
+              file_entities: Dict[str, List[str]],
+              snapshot: Optional[VectorSnapshot] = None) -> None:
+        """Install a new index and bump index_version in one step."""
+        with self._swap_lock:
+            self.vectors = vectors
+            self.bm25 = bm25
+            self.file_hashes = file_hashes
+            self.file_entities = file_entities
+            self.snapshot = snapshot
+            self.index_version += 1
+
+    def load_index(self) -> int:
+        """
+        Make the knowledge base searchable: map the vector snapshot when it
+        matches the files on disk, otherwise load and index the documents.
+
+        Returns:
+            Number of indexed chunks
+        """
+        if settings.VECTOR_SNAPSHOT_ENABLED and self.load_snapshot():
+            return len(self.snapshot)
+        return self.load_and_index_documents()
+
+    def load_snapshot(self, directory: Optional[str] = None) -> bool:
+        """
+        Map a vector snapshot for dense retrieval and rebuild BM25 from it.
+
+        Returns:
+            True if loaded; False if missing, unreadable or stale
+        """
+        if not self._initialized:
+            self.initialize()
+
+        directory = directory or settings.VECTOR_SNAPSHOT_PATH
+        if not Path(directory).exists():
+            return False
+
+        try:
+            snapshot = VectorSnapshot.load(directory)
+        except Exception as e:
+            logger.warning(f"Ignoring vector snapshot in {directory}: {e}")
+            return False
+
+        files = {str(path): file_hash(path) for path in discover_files()}
+        _, splitter_key = self._text_splitter()
+        stale = snapshot_staleness(snapshot, files, splitter_key)
+        if stale:
+            logger.info(f"Vector snapshot is stale ({stale}); reindexing")
+            return False
+
+        bm25 = BM25Index()
+        bm25.add_documents(snapshot.documents)
+        bm25.add_entity_names(snapshot.entities)
+        # NumPy search straight over the mapped matrix, whatever
+        # VECTOR_BACKEND says: nothing is copied into a store
+        self._swap(quantize(NumpyBackend.from_matrix(snapshot.vectors)), bm25, files,
+                   snapshot.file_entities, snapshot=snapshot)
+        return True
+
+    def save_snapshot(self, directory: Optional[str] = None) -> int:
+        """
+        Write the current index as a memory-mappable snapshot.
+
+        Vectors are streamed from the backend into the .npy file.
+
+        Returns:
+            Number of chunks written
+        """
+        directory = directory or settings.VECTOR_SNAPSHOT_PATH
+        with self._swap_lock:
+            vectors, bm25 = self.vectors, self.bm25
+            files, file_entities = self.file_hashes, self.file_entities
+        documents = bm25.documents
+        if not documents or vectors is None:
+            raise RuntimeError("Nothing indexed; run load_and_index_documents() first")
+
+        _, splitter_key = self._text_splitter()
+        write_snapshot(
+            directory,
+            dimension=embedding_service.dimension,
+            documents=documents,
+            vector_rows=vectors.iter_vectors(),
+            entities=list(bm25.entities.values()),
+            files=files,
+            file_entities=file_entities,
+            splitter_key=splitter_key,
+        )
+        logger.info(f"Wrote vector snapshot of {len(documents)} chunks to {directory}")
+        return len(documents)
+
+    def _index_chunks(self, chunks: List[Document], timings: dict,
+                      vectors: VectorBackend, bm25: BM25Index) -> int:
+        """Embed one upsert batch of chunks and add it to a vector backend and BM25."""
+        start_id = len(bm25)
+        embeddings = []
+        for batch in batched(chunks, settings.INDEXING_EMBED_BATCH_SIZE):
+            started = time.perf_counter()
+            embeddings.extend(embedding_service.encode([c.page_content for c in batch]))
+            timings["embed"] += time.perf_counter() - started
+
+        # The vector id doubles as the chunk id shared with BM25 for rank fusion
+        ids = list(range(start_id, start_id + len(chunks)))
+        for chunk_id, chunk in zip(ids, chunks):
+            chunk.metadata["chunk_id"] = chunk_id
+
+        started = time.perf_counter()
+        vectors.add(
+            ids,
+            np.asarray(embeddings, dtype=np.float32),
+            # Same payload layout as LangChain's QdrantVectorStore
+            payloads=[{"page_content": c.page_content, "metadata": c.metadata} for c in chunks],
+        )
+        timings["upsert"] += time.perf_counter() - started
+
+        bm25.add_documents(chunks)
+        return len(ids)
+
+    @staticmethod
+    def _throughput(counts: dict, timings: dict, load_stats: dict, seconds: float) -> dict:
+        """Summarize an indexing run as per-stage counts and rates."""
+        def rate(count: int, stage: str) -> float:
+            return round(count / timings[stage], 1) if timings[stage] else 0.0
+
+        return {
+            "parsed_files": load_stats.get("files", 0),
+            "failed_files": load_stats.get("failed", 0),
+            **counts,
+            # Parsed documents only; cached files skip the load stage
+            "docs_per_s": rate(load_stats.get("documents", 0), "load"),
+            "chunks_per_s": rate(counts["split_chunks"], "split"),
+            "vectors_per_s": rate(counts["vectors"], "embed"),
+            "upserts_per_s": rate(counts["vectors"], "upsert"),
+            "stage_seconds": {stage: round(t, 2) for stage, t in timings.items()},
+            "total_seconds": round(seconds, 2),
+        }
+
+    def retrieve_context(self, query: str, query_embedding: Optional[List[float]] = None) -> str:
         """
         Retrieve relevant context for a query.
 
         Args:
             query: User's question
+            query_embedding: Precomputed normalized embedding of the query
+                (same model); skips re-embedding when given
 
         Returns:
             Formatted context string from retrieved documents
@@ -168,26 +452,17 @@ class RAGPipeline:
             self.initialize()
 
         try:
-            if self.retriever is None:
-                logger.error("Retriever not initialized")
+            if self.vectors is None:
+                logger.error("Vector backend not initialized")
                 return ""
 
-            # Retrieve relevant documents
-            docs = self.retriever.invoke(query)
+            docs = self._retrieve(query, query_embedding)
 
             if not docs:
                 logger.warning(f"No documents retrieved for query: {query}")
                 return ""
 
-            # Format context
-            context_parts = []
-            for i, doc in enumerate(docs, 1):
-                content = doc.page_content.strip()
-                source = doc.metadata.get('source', 'Unknown')
-                context_parts.append(
-                    f"[Document {i} - {Path(source).name}]\n{content}")
-
-            context = "\n\n".join(context_parts)
+            context = self._format_context(docs)
             logger.info(f"Retrieved {len(docs)} documents for query")
 
             return context
@@ -196,17 +471,85 @@ class RAGPipeline:
             logger.error(f"Error retrieving context: {e}")
             return ""
 
+    def _retrieve(self, query: str, query_embedding: Optional[List[float]]) -> List[Document]:
+        """
+        Retrieve the top chunks for a query, from the retrieval cache when
+        the same (or a near-identical) query was answered on this index.
+        """
+        # One consistent index for the whole query, even if a refresh swaps
+        # in a new one meanwhile
+        with self._swap_lock:
+            vectors, bm25, version = self.vectors, self.bm25, self.index_version
+        chunk_ids = self.retrieval_cache.get(query, version, query_embedding)
+        if chunk_ids is None:
+            chunk_ids = self._rank(query, query_embedding, vectors, bm25)
+            self.retrieval_cache.put(query, version, chunk_ids, query_embedding)
+        return [bm25.documents[chunk_id] for chunk_id in chunk_ids]
+
+    def _rank(self, query: str, query_embedding: Optional[List[float]],
+              vectors: VectorBackend, bm25: BM25Index) -> List[int]:
+        """
+        Rank chunk ids for a query.
+
+        Queries naming exactly one known entity are answered from BM25 alone
+        (no embedding call); otherwise dense and BM25 candidates are fused
+        with reciprocal rank fusion.
+        """
+        k = settings.TOP_K_RETRIEVAL
+
+        if not settings.HYBRID_RETRIEVAL_ENABLED or len(bm25) == 0:
+            return self._dense_search(query, query_embedding, k, vectors)
+
+        if settings.ENTITY_FAST_PATH_ENABLED:
+            entity = bm25.match_entity(query)
+            if entity is not None:
+                name, entity_tokens = entity
+                hits = bm25.search(query, k, required=entity_tokens)
+                if hits:
+                    logger.info(f"Lexical fast path for entity '{name}'")
+                    return [doc_id for doc_id, _ in hits]
+
+        candidates = settings.HYBRID_CANDIDATES
+        dense = self._dense_search(query, query_embedding, candidates, vectors)
+        lexical = bm25.search(query, candidates)
+
+        fused = reciprocal_rank_fusion(
+            [dense, [doc_id for doc_id, _ in lexical]],
+            k=settings.RRF_K,
+        )
+        return fused[:k]
+
+    def _dense_search(self, query: str, query_embedding: Optional[List[float]],
+                      k: int, vectors: VectorBackend) -> List[int]:
+        """Top-k chunk ids by embedding similarity."""
+        if query_embedding is None:
+            query_embedding = embedding_service.encode_one(query)
+        return [chunk_id for chunk_id, _ in vectors.search(query_embedding, k)]
+
+    def _format_context(self, docs: List[Document]) -> str:
+        """Format retrieved documents into a single context string."""
+        context_parts = []
+        for i, doc in enumerate(docs, 1):
+            content = doc.page_content.strip()
+            source = doc.metadata.get('source', 'Unknown')
+            context_parts.append(
+                f"[Document {i} - {Path(source).name}]\n{content}")
+
+        return "\n\n".join(context_parts)
+
     def get_stats(self) -> dict:
         """Get statistics about the vector store."""
         if not self._initialized:
             return {"status": "not_initialized"}
 
         try:
-            collection_info = self.client.get_collection("portfolio_knowledge")
             return {
                 "status": "initialized",
-                "total_vectors": collection_info.points_count,
-                "embedding_model": settings.EMBEDDING_MODEL
+                "backend": "snapshot" if self.snapshot is not None else self.vectors.name,
+                "total_vectors": len(self.vectors),
+                "embedding_model": settings.EMBEDDING_MODEL,
+                "index_version": self.index_version,
+                "retrieval_cache": self.retrieval_cache.stats(),
             }
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
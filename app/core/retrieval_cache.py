@@ -0,0 +1,143 @@
+"""
+In-memory cache of retrieval results.
+Maps a normalized query (and, optionally, any query whose embedding is a
+near neighbour of a cached one) to the ranked chunk ids retrieval produced.
+Entries belong to one index version; the first lookup after the index
+changes drops them all.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+import threading
+
+import numpy as np
+
+from app.db.crud import normalize_question
+
+
+class RetrievalCache:
+    """Thread-safe LRU cache of ranked chunk ids, scoped to an index version."""
+
+    def __init__(self, max_size: int, similarity: float = 0.0) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of cached queries
+            similarity: Minimum cosine between query embeddings for a
+                neighbour hit (0 = normalized text matches only)
+        """
+        self.max_size = max_size
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        # Embeddings of cached queries, one row per slot, for neighbour lookup
+        self._matrix: Optional[np.ndarray] = None
+        self._slots: Dict[str, int] = {}
+        self._slot_keys: List[Optional[str]] = [None] * max_size
+        self._free = list(range(max_size - 1, -1, -1))
+        self.hits = 0
+        self.neighbour_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync_version(self, version: int) -> None:
+        """Drop every entry if the index changed since they were stored."""
+        if version != self._version:
+            self._entries.clear()
+            self._slots.clear()
+            self._slot_keys = [None] * self.max_size
+            self._free = list(range(self.max_size - 1, -1, -1))
+            self._version = version
+
+    def _nearest(self, embedding: Sequence[float]) -> Optional[str]:
+        """Key of the most similar cached query at or above the threshold."""
+        if self._matrix is None or not self._slots:
+            return None
+        scores = self._matrix @ np.asarray(embedding, dtype=np.float32)
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+        best = slots[np.argmax(scores[slots])]
+        if scores[best] < self.similarity:
+            return None
+        return self._slot_keys[best]
+
+    def get(self, query: str, version: int,
+            embedding: Optional[Sequence[float]] = None) -> Optional[List[int]]:
+        """
+        Look up the ranked chunk ids for a query.
+
+        Args:
+            query: User's question
+            version: Current index version
+            embedding: Normalized query embedding, enabling neighbour hits
+
+        Returns:
+            Chunk ids, best first, or None on a miss
+        """
+        if self.max_size <= 0:
+            return None
+        key = normalize_question(query)
+        with self._lock:
+            if self._version is not None and version < self._version:
+                self.misses += 1
+                return None
+            self._sync_version(version)
+            if key not in self._entries and embedding is not None and self.similarity > 0:
+                key = self._nearest(embedding)
+                if key is not None:
+                    self.neighbour_hits += 1
+            if key is None or key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return list(self._entries[key])
+
+    def put(self, query: str, version: int, chunk_ids: Sequence[int],
+            embedding: Optional[Sequence[float]] = None) -> None:
+        """
+        Store the ranked chunk ids for a query, evicting the least recently used.
+
+        Results computed against an index version that has since been
+        replaced are discarded.
+        """
+        if self.max_size <= 0:
+            return
+        key = normalize_question(query)
+        with self._lock:
+            if self._version is not None and version < self._version:
+                return
+            self._sync_version(version)
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                slot = self._slots.pop(evicted, None)
+                if slot is not None:
+                    self._slot_keys[slot] = None
+                    self._free.append(slot)
+            self._entries[key] = list(chunk_ids)
+            self._entries.move_to_end(key)
+            if embedding is not None and self.similarity > 0 and key not in self._slots:
+                vector = np.asarray(embedding, dtype=np.float32)
+                if self._matrix is None:
+                    self._matrix = np.zeros((self.max_size, len(vector)), dtype=np.float32)
+                slot = self._free.pop()
+                self._matrix[slot] = vector
+                self._slots[key] = slot
+                self._slot_keys[slot] = key
+
+    def stats(self) -> dict:
+        """Hit and miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "index_version": self._version,
+                "hits": self.hits,
+                "neighbour_hits": self.neighbour_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
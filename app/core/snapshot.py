@@ -0,0 +1,165 @@
+"""
+Memory-mapped vector snapshot of the knowledge-base index.
+A snapshot is a directory holding `vectors.npy` (float32 matrix, row i =
+chunk id i) and `chunks.json` (chunk texts, metadata, entity names, the
+splitter configuration and the content hashes of the source files). Loading maps the matrix instead of
+reading it, so startup takes milliseconds and every worker process shares
+the same pages through the OS page cache; the RAG pipeline searches it in
+place with the NumPy vector backend.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+import json
+import os
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from loguru import logger
+
+from app.config import settings
+
+
+SNAPSHOT_FORMAT = 1
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.json"
+
+
+class VectorSnapshot:
+    """A read-only, memory-mapped vector matrix with its chunk documents."""
+
+    def __init__(self, vectors: np.ndarray, documents: List[Document],
+                 entities: List[str], files: Dict[str, str],
+                 file_entities: Optional[Dict[str, List[str]]] = None,
+                 splitter_key: Optional[str] = None) -> None:
+        """
+        Args:
+            vectors: (n, dim) float32 matrix with normalized rows
+            documents: Chunk documents, aligned with the matrix rows
+            entities: Entity names for the BM25 fast path
+            files: Source file path -> content hash at snapshot time
+            file_entities: Source file path -> its entity names
+            splitter_key: Configuration of the splitter that made the chunks
+        """
+        self.vectors = vectors
+        self.documents = documents
+        self.entities = entities
+        self.files = files
+        self.file_entities = file_entities or {}
+        self.splitter_key = splitter_key
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def load(cls, directory: str) -> "VectorSnapshot":
+        """
+        Map a snapshot from disk.
+
+        Raises:
+            ValueError: If the snapshot is incomplete or was built with a
+                different format or embedding model
+        """
+        started = time.perf_counter()
+        root = Path(directory)
+        sidecar = json.loads((root / CHUNKS_FILE).read_text(encoding="utf-8"))
+
+        if sidecar.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"unsupported snapshot format {sidecar.get('format')}")
+        built_with = (sidecar.get("model"), sidecar.get("backend"))
+        if built_with != (settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND):
+            raise ValueError(f"snapshot was built with {built_with[0]} ({built_with[1]})")
+
+        vectors = np.load(root / VECTORS_FILE, mmap_mode="r")
+        if vectors.shape[0] != len(sidecar["chunks"]):
+            raise ValueError(
+                f"snapshot has {vectors.shape[0]} vectors for {len(sidecar['chunks'])} chunks")
+
+        documents = [Document(page_content=c["page_content"], metadata=c["metadata"])
+                     for c in sidecar["chunks"]]
+        logger.info(
+            f"Mapped vector snapshot: {len(documents)} x {vectors.shape[1]} "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return cls(vectors, documents, sidecar.get("entities", []), sidecar.get("files", {}),
+                   sidecar.get("file_entities"), sidecar.get("splitter"))
+
+
+def write_snapshot(directory: str, dimension: int, documents: Sequence[Document],
+                   vector_rows: Iterable[Tuple[int, Sequence[float]]],
+                   entities: Sequence[str], files: Dict[str, str],
+                   file_entities: Optional[Dict[str, List[str]]] = None,
+                   splitter_key: Optional[str] = None) -> None:
+    """
+    Write a snapshot, replacing any existing one.
+
+    Vectors are streamed into a memory-mapped .npy, so the full matrix is
+    never held in memory. The matrix is written before the sidecar and each
+    file is renamed into place; a reader catching the two out of step is
+    stopped by the row-count check in load().
+
+    Args:
+        directory: Snapshot directory
+        dimension: Embedding dimension
+        documents: Chunk documents; document i is chunk id i
+        vector_rows: (chunk id, vector) pairs covering every chunk
+        entities: Entity names for the BM25 fast path
+        files: Source file path -> content hash
+        file_entities: Source file path -> its entity names, so incremental
+            refreshes can drop the names of changed files
+        splitter_key: Configuration of the splitter that made the chunks
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+
+    tmp_vectors = root / f".{VECTORS_FILE}.tmp"
+    matrix = np.lib.format.open_memmap(
+        tmp_vectors, mode="w+", dtype=np.float32, shape=(len(documents), dimension))
+    filled = 0
+    for row, vector in vector_rows:
+        matrix[row] = vector
+        filled += 1
+    matrix.flush()
+    del matrix
+    if filled != len(documents):
+        tmp_vectors.unlink()
+        raise ValueError(f"got {filled} vectors for {len(documents)} chunks")
+    os.replace(tmp_vectors, root / VECTORS_FILE)
+
+    sidecar = {
+        "format": SNAPSHOT_FORMAT,
+        "model": settings.EMBEDDING_MODEL,
+        "backend": settings.EMBEDDING_BACKEND,
+        "dimension": dimension,
+        "splitter": splitter_key,
+        "entities": list(entities),
+        "files": files,
+        "file_entities": file_entities or {},
+        "chunks": [{"page_content": d.page_content, "metadata": d.metadata} for d in documents],
+    }
+    tmp_sidecar = root / f".{CHUNKS_FILE}.tmp"
+    tmp_sidecar.write_text(json.dumps(sidecar, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_sidecar, root / CHUNKS_FILE)
+
+
+def snapshot_staleness(snapshot: VectorSnapshot, files: Dict[str, str],
+                       splitter_key: Optional[str] = None) -> Optional[str]:
+    """
+    Compare a snapshot's source files and chunking with the current ones.
+
+    Args:
+        snapshot: Loaded snapshot
+        files: Source file path -> content hash on disk
+        splitter_key: Current splitter configuration (None skips the check)
+
+    Returns:
+        None if they match, otherwise a short reason
+    """
+    if splitter_key is not None and snapshot.splitter_key != splitter_key:
+        return "the chunk splitter settings changed"
+    if set(snapshot.files) != set(files):
+        return "the set of knowledge base files changed"
+    changed = [path for path, digest in files.items() if snapshot.files[path] != digest]
+    if changed:
+        return f"{len(changed)} files changed (e.g. {changed[0]})"
+    return None
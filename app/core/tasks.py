@@ -0,0 +1,231 @@
+"""
+Background task queue for post-response side effects.
+Conversation logging, cache writes and analytics run off the response path
+with retries; tasks that still fail are spooled to disk and replayed later.
+
+Because conversations are written in the background, a turn is not visible
+to history reads (the LLM's conversation context) until its task has run:
+normally milliseconds after the response, longer when the queue is backed
+up or the write is being retried.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from loguru import logger
+
+from app.config import settings
+from app.db.database import SessionLocal
+
+
+def _registry() -> Dict[str, Callable[..., Any]]:
+    """
+    Map task names to DB operations taking a `db` session keyword.
+
+    Tasks are referenced by name so spooled tasks can be replayed after a
+    restart. Imported lazily because the cache module submits tasks itself.
+    """
+    from app.core.cache import cache_manager
+    from app.db.crud import (
+        create_analytics_event,
+        create_conversation,
+        increment_cache_hit,
+    )
+
+    return {
+        "create_conversation": create_conversation,
+        "create_analytics_event": create_analytics_event,
+        "increment_cache_hit": increment_cache_hit,
+        "add_to_cache": cache_manager.add_to_cache,
+    }
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy values in spooled task arguments."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class BackgroundTaskQueue:
+    """Bounded in-process work queue with retrying worker threads."""
+
+    _STOP = object()
+
+    def __init__(self) -> None:
+        """Initialize a stopped queue; tasks run inline until start()."""
+        self._queue: "queue.Queue[Any]" = queue.Queue(
+            maxsize=settings.TASK_QUEUE_MAXSIZE)
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0,
+                       "retried": 0, "spooled": 0, "inline": 0}
+
+    def start(self) -> None:
+        """Start worker threads and replay tasks spooled by a previous run."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        for i in range(settings.TASK_QUEUE_WORKERS):
+            worker = threading.Thread(
+                target=self._work, name=f"task-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        logger.info(
+            f"Background task queue started ({settings.TASK_QUEUE_WORKERS} workers)")
+        self._replay_spool()
+
+    def submit(self, name: str, **kwargs: Any) -> None:
+        """
+        Queue a named task for background execution.
+
+        Falls back to running inline when the queue is stopped or full, so
+        work is delayed under pressure but never dropped.
+        """
+        self._count("submitted")
+
+        if self._running:
+            try:
+                self._queue.put_nowait((name, kwargs))
+                return
+            except queue.Full:
+                logger.warning(f"Task queue full; running '{name}' inline")
+
+        self._count("inline")
+        self._execute(name, kwargs)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting work and drain the queue.
+
+        Tasks still queued when the timeout expires are spooled to disk.
+        """
+        timeout = settings.TASK_DRAIN_TIMEOUT if timeout is None else timeout
+
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+
+        logger.info(f"Draining task queue ({self._queue.qsize()} pending)...")
+        deadline = time.time() + timeout
+
+        for _ in self._workers:
+            self._queue.put(self._STOP)
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.time()))
+        self._workers = []
+
+        # Anything left over did not make it in time
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                name, kwargs = item
+                self._spool(name, kwargs, "not drained before shutdown")
+
+        logger.info(f"Task queue stopped: {self.stats()}")
+
+    def stats(self) -> dict:
+        """Return task counters and the current backlog."""
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize()}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _work(self) -> None:
+        """Worker loop: run tasks until the stop sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            name, kwargs = item
+            self._execute(name, kwargs)
+
+    def _execute(self, name: str, kwargs: Dict[str, Any]) -> None:
+        """Run one task in its own DB session, retrying with backoff."""
+        func = _registry().get(name)
+        if func is None:
+            logger.error(f"Unknown background task: {name}")
+            return
+
+        for attempt in range(settings.TASK_MAX_RETRIES + 1):
+            db = SessionLocal()
+            try:
+                func(db=db, **kwargs)
+                self._count("completed")
+                return
+            except Exception as e:
+                db.rollback()
+                if attempt == settings.TASK_MAX_RETRIES:
+                    logger.error(f"Task '{name}' failed after {attempt + 1} attempts: {e}")
+                    self._spool(name, kwargs, str(e))
+                    return
+                self._count("retried")
+                logger.warning(f"Task '{name}' failed (attempt {attempt + 1}): {e}")
+                time.sleep(0.5 * 2 ** attempt)
+            finally:
+                db.close()
+
+    def _spool(self, name: str, kwargs: Dict[str, Any], error: str) -> None:
+        """Append an unfinished task to the spool file for later replay."""
+        self._count("spooled")
+        record = {
+            "task": name,
+            "kwargs": kwargs,
+            "error": error,
+            "spooled_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            spool = Path(settings.TASK_SPOOL_PATH)
+            spool.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, spool.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=_json_default) + "\n")
+        except Exception as e:
+            logger.error(f"Could not spool task '{name}': {e}")
+
+    def _replay_spool(self) -> None:
+        """
+        Re-queue tasks spooled by a previous run, then clear the spool.
+
+        Every gunicorn worker calls this on start; the atomic rename hands
+        the spool to exactly one of them.
+        """
+        spool = Path(settings.TASK_SPOOL_PATH)
+        replay = spool.with_name(f"{spool.name}.{os.getpid()}.replaying")
+        try:
+            spool.replace(replay)
+        except FileNotFoundError:
+            # Nothing spooled, or another worker claimed it first
+            return
+
+        count = 0
+        for line in replay.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+                self.submit(record["task"], **record["kwargs"])
+                count += 1
+            except Exception as e:
+                logger.error(f"Skipping unreadable spooled task: {e}")
+        replay.unlink()
+        logger.info(f"Replayed {count} spooled tasks")
+
+
+# Global background task queue
+task_queue = BackgroundTaskQueue()
@@ -0,0 +1,400 @@
+"""
+Dense vector backends for the RAG pipeline.
+All store normalized chunk embeddings under integer chunk ids and return
+(chunk id, cosine score) pairs; the pipeline maps ids back to its chunk
+documents, so no per-hit Document objects are built during search.
+Optional int8 scalar or binary quantization shrinks the matrix that is
+scanned per query, with float rescoring of the best candidates.
+"""
+
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+from app.config import settings
+
+
+# (chunk id, cosine similarity), best first
+Hit = Tuple[int, float]
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+
+# Bit counts of every byte value, for Hamming distances on NumPy < 2.0
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _pack_signs(vectors: np.ndarray) -> np.ndarray:
+    """Sign bits of each row, packed into uint64 words (zero-padded)."""
+    bits = np.packbits(np.atleast_2d(vectors) > 0, axis=1)
+    padding = -bits.shape[1] % 8
+    if padding:
+        bits = np.pad(bits, ((0, 0), (0, padding)))
+    return np.ascontiguousarray(bits).view(np.uint64)
+
+
+def _hamming(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance from every packed row to one packed query."""
+    diff = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(diff).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[diff.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+class VectorBackend(ABC):
+    """Exact or approximate top-k search over chunk embeddings."""
+
+    name = ""
+
+    @abstractmethod
+    def add(self, ids: Sequence[int], vectors: np.ndarray,
+            payloads: Optional[Sequence[dict]] = None) -> None:
+        """Store vectors under the given chunk ids."""
+
+    @abstractmethod
+    def search(self, query_embedding: Sequence[float], k: int) -> List[Hit]:
+        """Return the k most similar chunk ids."""
+
+    @abstractmethod
+    def iter_vectors(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (chunk id, vector) for every stored vector."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class NumpyBackend(VectorBackend):
+    """
+    Exact cosine search over one contiguous float32 matrix.
+
+    Row i holds chunk id i. Rows are normalized, so a single matrix-vector
+    product gives every cosine; argpartition then selects the top k without
+    sorting the whole corpus.
+    """
+
+    name = "numpy"
+
+    def __init__(self, dimension: int, capacity: int = 1024) -> None:
+        """Initialize an empty matrix that grows by doubling."""
+        self.dimension = dimension
+        self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "NumpyBackend":
+        """Wrap an existing (e.g. memory-mapped, read-only) matrix without copying."""
+        backend = cls.__new__(cls)
+        backend.dimension = matrix.shape[1]
+        backend._matrix = matrix
+        backend._size = matrix.shape[0]
+        return backend
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the vector matrix (including spare capacity)."""
+        return self._matrix.nbytes
+
+    @property
+    def resident_nbytes(self) -> int:
+        """
+        Process memory held by the matrix.
+
+        0 for a memory-mapped snapshot: its pages are file-backed and shared
+        between workers.
+        """
+        return 0 if isinstance(self._matrix, np.memmap) else self._matrix.nbytes
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray,
+            payloads: Optional[Sequence[dict]] = None) -> None:
+        """Store vectors; ids must continue the sequence 0, 1, 2, ..."""
+        if list(ids) != list(range(self._size, self._size + len(ids))):
+            raise ValueError("NumpyBackend ids must be appended in order")
+        end = self._size + len(ids)
+        if end > self._matrix.shape[0]:
+            grown = np.zeros((max(end, 2 * self._matrix.shape[0]), self.dimension),
+                             dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size:end] = vectors
+        self._size = end
+
+    def search(self, query_embedding: Sequence[float], k: int) -> List[Hit]:
+        """Exact top-k by dot product (cosine for normalized rows)."""
+        k = min(k, self._size)
+        if k <= 0:
+            return []
+        scores = self._matrix[:self._size] @ np.asarray(query_embedding, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def iter_vectors(self) -> Iterator[Tuple[int, np.ndarray]]:
+        for i in range(self._size):
+            yield i, self._matrix[i]
+
+
+class QdrantBackend(VectorBackend):
+    """In-memory Qdrant collection, queried by id without payloads."""
+
+    name = "qdrant"
+
+    def __init__(self, dimension: int, collection_name: str = "portfolio_knowledge",
+                 client: Optional[QdrantClient] = None, quantization: str = "none") -> None:
+        """
+        Create (or reuse) the collection.
+
+        Quantization is passed to Qdrant as collection config with rescoring
+        at query time. The local in-memory mode accepts but ignores it (it
+        always searches the float vectors); it takes effect on a Qdrant server.
+        """
+        self.client = client or QdrantClient(location=":memory:")
+        self.collection_name = collection_name
+        self._search_params = None
+        quantization_config = None
+        if quantization == "int8":
+            quantization_config = ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8, quantile=0.99, always_ram=True))
+        elif quantization == "binary":
+            quantization_config = BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=True))
+        if quantization_config is not None:
+            self._search_params = SearchParams(quantization=QuantizationSearchParams(
+                rescore=settings.VECTOR_RESCORE,
+                oversampling=settings.VECTOR_RESCORE_OVERSAMPLING))
+
+        if not self.client.collection_exists(collection_name):
+            self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=dimension, distance=Distance.COSINE),
+                quantization_config=quantization_config,
+            )
+
+    def __len__(self) -> int:
+        return self.client.count(self.collection_name, exact=True).count
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray,
+            payloads: Optional[Sequence[dict]] = None) -> None:
+        """Upsert points; payloads use the QdrantVectorStore layout."""
+        points = [
+            PointStruct(id=int(i), vector=vector.tolist(),
+                        payload=payloads[n] if payloads else None)
+            for n, (i, vector) in enumerate(zip(ids, vectors))
+        ]
+        self.client.upsert(collection_name=self.collection_name, points=points, wait=True)
+
+    def search(self, query_embedding: Sequence[float], k: int) -> List[Hit]:
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=list(map(float, query_embedding)),
+            limit=k,
+            search_params=self._search_params,
+            with_payload=False,
+        )
+        return [(int(point.id), float(point.score)) for point in response.points]
+
+    def iter_vectors(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Page through the collection with scroll."""
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=256,
+                offset=offset,
+                with_payload=False,
+                with_vectors=True,
+            )
+            for point in points:
+                yield int(point.id), np.asarray(point.vector, dtype=np.float32)
+            if offset is None:
+                return
+
+
+class _Codes(NamedTuple):
+    """Quantized codes of the first `size` vectors, with their int8 scales."""
+
+    codes: np.ndarray
+    scale: Optional[np.ndarray]
+    offset: Optional[np.ndarray]
+    size: int
+
+
+class QuantizedBackend(VectorBackend):
+    """
+    Quantized scan over a NumpyBackend, with float rescoring.
+
+    int8: each dimension is mapped affinely onto [-127, 127] using the
+    0.5/99.5 percentiles of the stored vectors (4x smaller than float32).
+    binary: one sign bit per dimension, compared by Hamming distance (32x
+    smaller). The scan picks `k * oversampling` candidates from the codes and
+    rescores them exactly against the float rows, which only touches those
+    rows - cheap when the floats are a memory-mapped snapshot.
+
+    Codes are rebuilt lazily on the first search after vectors were added and
+    published as one immutable _Codes, which each search reads once.
+
+    The codes are kept in addition to the float matrix, which is still needed
+    for rescoring, snapshots and incremental refreshes. Memory therefore only
+    shrinks when the floats are a memory-mapped snapshot; over an in-memory
+    matrix int8 adds about 25% and binary about 3%. The int8 scan converts
+    blocks to float32 for the matrix product, so it is no faster than an
+    exact float32 scan; binary scans are.
+    """
+
+    def __init__(self, base: NumpyBackend, mode: str, rescore: bool = True,
+                 oversampling: float = 4.0) -> None:
+        """
+        Args:
+            base: Float vectors (owned or memory-mapped)
+            mode: "int8" or "binary"
+            rescore: Rescore candidates with the float vectors
+            oversampling: Candidates scanned per result when rescoring
+        """
+        if mode not in ("int8", "binary"):
+            raise ValueError(f"Unknown quantization mode '{mode}'")
+        self.base = base
+        self.mode = mode
+        self.name = f"{base.name}+{mode}"
+        self.rescore = rescore
+        self.oversampling = max(1.0, oversampling)
+        self._codes: Optional[_Codes] = None
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the quantized codes scanned per query."""
+        return self._ensure_codes().codes.nbytes
+
+    @property
+    def resident_nbytes(self) -> int:
+        """Process memory held by the codes, scales and float matrix."""
+        codes = self._ensure_codes()
+        extra = sum(a.nbytes for a in (codes.scale, codes.offset) if a is not None)
+        return codes.codes.nbytes + extra + self.base.resident_nbytes
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray,
+            payloads: Optional[Sequence[dict]] = None) -> None:
+        self.base.add(ids, vectors, payloads)
+
+    def iter_vectors(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield the full-precision vectors (snapshots never store codes)."""
+        return self.base.iter_vectors()
+
+    def _ensure_codes(self) -> _Codes:
+        """Current codes, requantizing the float matrix if vectors were added since."""
+        size = len(self.base)
+        current = self._codes
+        if current is not None and current.size == size:
+            return current
+        matrix = self.base._matrix[:size]
+        scale = offset = None
+        if self.mode == "binary":
+            codes = _pack_signs(matrix)
+        else:
+            low = np.percentile(matrix, 0.5, axis=0) if size else np.zeros(self.base.dimension)
+            high = np.percentile(matrix, 99.5, axis=0) if size else np.ones(self.base.dimension)
+            scale = np.maximum(high - low, 1e-6).astype(np.float32) / 254
+            offset = ((high + low) / 2).astype(np.float32)
+            codes = np.clip(np.rint((matrix - offset) / scale), -127, 127).astype(np.int8)
+        # Published as a single object: a search holding the previous _Codes
+        # keeps scoring with its own codes and scales
+        current = _Codes(codes, scale, offset, size)
+        self._codes = current
+        return current
+
+    def _scan(self, query: np.ndarray, codes: np.ndarray, scale: Optional[np.ndarray],
+              offset: Optional[np.ndarray]) -> np.ndarray:
+        """Approximate scores from the codes (higher is better)."""
+        if self.mode == "binary":
+            return -_hamming(codes, _pack_signs(query)).astype(np.float32)
+
+        # x ~ codes * scale + offset, so x.q ~ codes.(scale*q) + offset.q;
+        # converted blockwise to avoid a float copy of the whole matrix
+        weighted = scale * query
+        bias = float(offset @ query)
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), 4096):
+            block = codes[start:start + 4096].astype(np.float32)
+            scores[start:start + 4096] = block @ weighted + bias
+        return scores
+
+    def search(self, query_embedding: Sequence[float], k: int) -> List[Hit]:
+        codes, scale, offset, _ = self._ensure_codes()
+        k = min(k, len(codes))
+        if k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        scores = self._scan(query, codes, scale, offset)
+
+        candidates = min(len(scores), int(k * self.oversampling) if self.rescore else k)
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        if self.rescore:
+            # Exact cosine for the shortlist only (sorted rows read mmaps in order)
+            top = np.sort(top)
+            exact = self.base._matrix[top] @ query
+            order = np.argsort(-exact)[:k]
+            return [(int(top[i]), float(exact[i])) for i in order]
+
+        top = top[np.argsort(-scores[top])]
+        if self.mode == "binary":
+            # Hamming scores are not cosines; report the estimate 1 - 2h/d
+            dimension = self.base.dimension
+            return [(int(i), 1 + 2 * float(scores[i]) / dimension) for i in top]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+BACKENDS = {backend.name: backend for backend in (NumpyBackend, QdrantBackend)}
+
+
+def quantize(backend: NumpyBackend, mode: Optional[str] = None) -> VectorBackend:
+    """
+    Wrap a NumPy backend with the configured quantization.
+
+    Args:
+        backend: Float backend
+        mode: "none", "int8" or "binary" (default VECTOR_QUANTIZATION)
+    """
+    mode = (mode or settings.VECTOR_QUANTIZATION).lower()
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization '{mode}' (expected one of {QUANTIZATION_MODES})")
+    if mode == "none":
+        return backend
+    return QuantizedBackend(backend, mode, rescore=settings.VECTOR_RESCORE,
+                            oversampling=settings.VECTOR_RESCORE_OVERSAMPLING)
+
+
+def create_backend(name: str, dimension: int) -> VectorBackend:
+    """
+    Build a backend by name, with VECTOR_QUANTIZATION applied.
+
+    Raises:
+        ValueError: If the name or quantization mode is unknown
+    """
+    name = name.lower()
+    mode = settings.VECTOR_QUANTIZATION.lower()
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization '{mode}' (expected one of {QUANTIZATION_MODES})")
+    if name == NumpyBackend.name:
+        return quantize(NumpyBackend(dimension), mode)
+    if name == QdrantBackend.name:
+        return QdrantBackend(dimension, quantization=mode)
+    raise ValueError(
+        f"Unknown vector backend '{name}' (expected one of {sorted(BACKENDS)})")
@@ -0,0 +1,202 @@
+"""
+Background warm-up of the heavy backend components.
+Loads the database, RAG index, cache model and LLM client off the request
+path and tracks per-component readiness for health checks. Components that
+fail are retried with exponential backoff until they come up.
+"""
+
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+import threading
+import time
+from loguru import logger
+
+from app.config import settings
+from app.core.cache import cache_manager
+from app.core.instant_answers import instant_answers
+from app.core.intent_router import intent_router
+from app.core.llm import llm_handler
+from app.core.rag import rag_pipeline
+from app.db.database import init_db
+
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def _warm_database() -> None:
+    """Create tables if needed."""
+    init_db()
+
+
+def _warm_rag() -> None:
+    """Load the embedding model, map or build the index and run one query."""
+    if not rag_pipeline._initialized:
+        rag_pipeline.initialize()
+    # Checked separately: a retry may follow an attempt that initialized the
+    # pipeline but failed to index
+    if rag_pipeline.index_version == 0 or len(rag_pipeline.bm25) == 0:
+        rag_pipeline.load_index()
+    if len(rag_pipeline.bm25) == 0:
+        raise RuntimeError("No knowledge-base chunks were indexed")
+    # First inference pays one-off allocation costs; do it before real traffic
+    rag_pipeline.retrieve_context("warm-up")
+
+
+def _warm_cache() -> None:
+    """Load the cache embedding model and run one encode."""
+    if not cache_manager._initialized:
+        cache_manager.initialize()
+    cache_manager._get_embedding("warm-up")
+
+
+def _warm_intent_router() -> None:
+    """Embed the canonical command phrasings."""
+    intent_router.initialize()
+
+
+def _warm_llm() -> None:
+    """Create the Groq client."""
+    if not llm_handler._initialized:
+        llm_handler.initialize()
+
+
+def _warm_instant_answers() -> None:
+    """Precompute and pin the suggested-question answers."""
+    instant_answers.refresh()
+
+
+class WarmupManager:
+    """Runs component warm-up, retries failures and reports per-component state."""
+
+    STEPS: List[Tuple[str, Callable[[], None]]] = [
+        ("database", _warm_database),
+        ("rag", _warm_rag),
+        ("cache", _warm_cache),
+        ("intent_router", _warm_intent_router),
+        ("llm", _warm_llm),
+        ("instant_answers", _warm_instant_answers),
+    ]
+
+    # Steps whose failure degrades the service but does not block readiness
+    OPTIONAL = {"intent_router", "instant_answers"}
+
+    # Steps that open network connections (Groq); a pre-fork master skips
+    # them so workers don't inherit its sockets, and each worker runs them
+    PER_PROCESS = {"llm", "instant_answers"}
+
+    def __init__(self) -> None:
+        """Initialize all components as pending."""
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._components: Dict[str, dict] = {
+            name: {"state": PENDING, "error": None, "seconds": None, "attempts": 0}
+            for name, _ in self.STEPS
+        }
+
+    def start(self) -> None:
+        """
+        Start warm-up in a background thread.
+
+        No-op if already started, or if every component is already ready
+        (e.g. a gunicorn worker forked from a master that warmed up).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            if all(info["state"] == READY for info in self._components.values()):
+                return
+            self._thread = threading.Thread(
+                target=self._run_until_ready, name="warmup", daemon=True)
+            self._thread.start()
+        logger.info("Component warm-up started in background")
+
+    def run(self, skip: Collection[str] = ()) -> None:
+        """
+        Warm up every component that is not ready yet, recording each outcome.
+
+        A component being retried stays FAILED (with its last error) until
+        it succeeds, so callers can tell a failure from a first load.
+
+        Args:
+            skip: Components to leave pending (e.g. PER_PROCESS in a pre-fork master)
+        """
+        started = time.time()
+
+        for name, step in self.STEPS:
+            if name in skip:
+                continue
+            with self._lock:
+                info = self._components[name]
+                if info["state"] == READY:
+                    continue
+                if info["state"] == PENDING:
+                    info["state"] = LOADING
+                info["attempts"] += 1
+            step_started = time.time()
+            try:
+                step()
+                self._set(name, state=READY, error=None,
+                          seconds=round(time.time() - step_started, 2))
+                logger.info(f"Component '{name}' ready")
+            except Exception as e:
+                self._set(name, state=FAILED, error=str(e),
+                          seconds=round(time.time() - step_started, 2))
+                logger.error(f"Component '{name}' failed to warm up: {e}")
+
+        logger.info(f"Warm-up finished in {time.time() - started:.1f}s")
+
+    def _run_until_ready(self) -> None:
+        """Run warm-up, then retry failed components with exponential backoff."""
+        self.run()
+        delay = settings.WARMUP_RETRY_DELAY
+        while self._failed_components():
+            logger.info(
+                f"Retrying {', '.join(self._failed_components())} in {delay:g}s")
+            time.sleep(delay)
+            self.run()
+            delay = min(delay * 2, settings.WARMUP_RETRY_MAX_DELAY)
+
+    def _failed_components(self) -> List[str]:
+        """Names of components whose last warm-up attempt failed."""
+        with self._lock:
+            return [name for name, info in self._components.items()
+                    if info["state"] == FAILED]
+
+    def _set(self, name: str, **fields) -> None:
+        """Update the state record of one component."""
+        with self._lock:
+            self._components[name].update(fields)
+
+    def is_component_ready(self, name: str) -> bool:
+        """Check whether a single component is ready."""
+        with self._lock:
+            return self._components[name]["state"] == READY
+
+    def has_failed(self) -> bool:
+        """Check whether a required component is down (failed, being retried)."""
+        with self._lock:
+            return any(
+                info["state"] == FAILED
+                for name, info in self._components.items()
+                if name not in self.OPTIONAL
+            )
+
+    def is_ready(self) -> bool:
+        """Check whether every required component is ready."""
+        with self._lock:
+            return all(
+                info["state"] == READY
+                for name, info in self._components.items()
+                if name not in self.OPTIONAL
+            )
+
+    def status(self) -> dict:
+        """Return a snapshot of all component states."""
+        with self._lock:
+            return {name: dict(info) for name, info in self._components.items()}
+
+
+# Global warm-up manager instance
+warmup_manager = WarmupManager()
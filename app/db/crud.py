@@ -3,15 +3,35 @@ CRUD (Create, Read, Update, Delete) operations for database models.
 """
 
 from __future__ import annotations
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Optional, List, Tuple, Iterator, Type
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, and_, or_, select
 from datetime import datetime, timezone
+import hashlib
 import json
-from app.db.models import User, Conversation, Analytics, CachedResponse
+import re
+from app.db.models import Base, User, Conversation, Analytics, CachedResponse
 from loguru import logger
 
 
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+# Loader option for reads that resolve answers of many conversations: one
+# extra IN query per batch, loading only the answer text of the referenced
+# cached responses (not their embeddings)
+CACHED_ANSWER = selectinload(Conversation.cached_response).load_only(CachedResponse.answer)
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for grouping: lowercase, no punctuation, single spaces."""
+    return " ".join(_NON_WORD_RE.sub(" ", question.lower()).split())
+
+
+def compute_question_hash(question: str) -> str:
+    """Return the MD5 hex digest of the normalized question."""
+    return hashlib.md5(normalize_question(question).encode()).hexdigest()
+
+
 # ==================== USER OPERATIONS ====================
 
 def create_user(
@@ -65,25 +85,50 @@ def update_user_credits(db: Session, user_id: int, credits_remaining: int) -> Op
 
 
 def deduct_credit(db: Session, user_id: int) -> Optional[User]:
-    """Deduct one credit from the user's remaining credits."""
-    user = get_user_by_id(db, user_id)
-    if user is None:
-        logger.warning(f"User not found (ID: {user_id})")
-        return None
+    """
+    Deduct one credit from the user's remaining credits.
+
+    The decrement is a single conditional UPDATE, so concurrent requests for
+    the same user can never drive the balance below zero or lose an update,
+    and only the requests whose UPDATE matched get a user back.
+
+    Returns:
+        The updated user, or None if the user does not exist or had no
+        credits left (no credit was deducted)
+    """
+    deducted = (
+        db.query(User)
+        .filter(User.id == user_id, User.credits_remaining > 0)
+        .update(
+            {
+                User.credits_remaining: User.credits_remaining - 1,
+                User.last_active: datetime.now(timezone.utc),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
 
-    if user.credits_remaining <= 0:
-        logger.warning(f"User {user.email} has no credits left.")
-        return user
+    if not deducted:
+        logger.warning(f"No credit deducted for user_id={user_id}")
+        return None
 
-    user.credits_remaining -= 1
-    user.last_active = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(user)
+    user = get_user_by_id(db, user_id)
     logger.info(
         f"Deducted one credit from {user.email}. Remaining: {user.credits_remaining}")
     return user
 
 
+def refund_credit(db: Session, user_id: int) -> None:
+    """Give back a credit reserved by deduct_credit for a turn that failed."""
+    db.query(User).filter(User.id == user_id).update(
+        {User.credits_remaining: User.credits_remaining + 1},
+        synchronize_session=False,
+    )
+    db.commit()
+    logger.info(f"Refunded one credit to user_id={user_id}")
+
+
 # ==================== CONVERSATION OPERATIONS ====================
 
 def create_conversation(
@@ -93,13 +138,22 @@ def create_conversation(
     answer: str,
     used_llm: bool = True,
     credits_charged: int = 0,
-    response_time: Optional[float] = None
+    response_time: Optional[float] = None,
+    cached_response_id: Optional[int] = None
 ) -> Conversation:
-    """Create a new conversation record."""
+    """
+    Create a new conversation record.
+
+    When `cached_response_id` is given the answer text is not copied into the
+    row; it is resolved from the cached response on read (see
+    Conversation.resolved_answer).
+    """
     conversation = Conversation(
         user_id=user_id,
         question=question.strip(),
-        answer=answer.strip(),
+        question_hash=compute_question_hash(question),
+        answer=None if cached_response_id is not None else answer.strip(),
+        cached_response_id=cached_response_id,
         used_llm=used_llm,
         credits_charged=credits_charged,
         response_time=response_time,
@@ -111,20 +165,105 @@ def create_conversation(
     return conversation
 
 
-def get_user_conversations(db: Session, user_id: int, limit: int = 50) -> List[Conversation]:
-    """Retrieve recent conversation history for a user."""
-    return (
+# Keyset cursor: (created_at, id) of the last row on the previous page
+ConversationCursor = Tuple[datetime, int]
+
+
+def get_user_conversations_page(
+    db: Session,
+    user_id: int,
+    limit: int = 20,
+    before: Optional[ConversationCursor] = None
+) -> Tuple[List[Conversation], Optional[ConversationCursor]]:
+    """
+    Retrieve one page of a user's conversation history, newest first.
+
+    Uses keyset pagination on (created_at, id), so every page is a range
+    scan on the (user_id, created_at) index regardless of how deep it is.
+
+    Args:
+        db: Database session
+        user_id: Owner of the conversations
+        limit: Maximum rows per page
+        before: Cursor returned by the previous page, or None for the first
+
+    Returns:
+        Tuple of (conversations, next_cursor); next_cursor is None on the last page
+    """
+    query = (
         db.query(Conversation)
+        .options(CACHED_ANSWER)
         .filter(Conversation.user_id == user_id)
-        .order_by(Conversation.created_at.desc())
-        .limit(limit)
+    )
+
+    if before is not None:
+        created_at, conversation_id = before
+        query = query.filter(
+            or_(
+                Conversation.created_at < created_at,
+                and_(
+                    Conversation.created_at == created_at,
+                    Conversation.id < conversation_id,
+                ),
+            )
+        )
+
+    rows = (
+        query
+        .order_by(Conversation.created_at.desc(), Conversation.id.desc())
+        .limit(limit + 1)
         .all()
     )
 
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last.created_at, last.id)
+
+    return rows, None
+
+
+def get_user_conversations(db: Session, user_id: int, limit: int = 50) -> List[Conversation]:
+    """Retrieve recent conversation history for a user."""
+    conversations, _ = get_user_conversations_page(db, user_id, limit=limit)
+    return conversations
+
+
+def get_recent_turns(db: Session, user_id: int, turns: int) -> List[dict]:
+    """
+    Load the last `turns` exchanges for a user as chat messages.
+
+    Conversations are written by the background task queue, so a turn
+    answered moments ago may not be included yet (see app.core.tasks).
+
+    Returns:
+        Oldest-first list of {"role", "content"} dicts, ready for the LLM
+    """
+    if turns <= 0:
+        return []
+
+    messages: List[dict] = []
+    for conversation in reversed(get_user_conversations(db, user_id, limit=turns)):
+        messages.append({"role": "user", "content": conversation.question})
+        messages.append(
+            {"role": "assistant", "content": conversation.resolved_answer})
+    return messages
+
 
 def get_conversation_count(db: Session, user_id: int) -> int:
-    """Count total conversations for a specific user."""
-    return db.query(Conversation).filter(Conversation.user_id == user_id).count()
+    """
+    Count total conversations for a specific user.
+
+    A plain COUNT(*) (Query.count() would wrap a SELECT of every column), so
+    the count is answered from the (user_id, created_at) index without
+    reading table rows.
+    """
+    return (
+        db.query(func.count())
+        .select_from(Conversation)
+        .filter(Conversation.user_id == user_id)
+        .scalar()
+    )
 
 
 # ==================== ANALYTICS OPERATIONS ====================
@@ -196,6 +335,58 @@ def create_cached_response(
     return cached
 
 
+def create_cached_responses_bulk(
+    db: Session,
+    items: List[Tuple[str, str, Optional[str]]]
+) -> int:
+    """
+    Store many cached responses in a single transaction.
+
+    Questions that already have cache rows get those rows updated in place
+    rather than a second row, which exact and semantic lookups would never
+    prefer over the old one. When the answer changes, the old text is first
+    copied into conversations that reference the row, so they keep showing
+    the answer the visitor was actually served.
+
+    Args:
+        db: Database session
+        items: (question, answer, embedding_json) tuples
+
+    Returns:
+        Number of questions stored
+    """
+    latest = {question.strip(): (answer.strip(), embedding)
+              for question, answer, embedding in items}
+    existing = (
+        db.query(CachedResponse)
+        .filter(CachedResponse.question.in_(list(latest)))
+        .all()
+    )
+    now = datetime.now(timezone.utc)
+    for cached in existing:
+        answer, embedding = latest[cached.question]
+        if answer != cached.answer:
+            (
+                db.query(Conversation)
+                .filter(Conversation.cached_response_id == cached.id,
+                        Conversation.answer.is_(None))
+                .update({Conversation.answer: cached.answer}, synchronize_session=False)
+            )
+        cached.answer, cached.embedding = answer, embedding
+        cached.created_at = now
+
+    updated = {cached.question for cached in existing}
+    db.add_all([
+        CachedResponse(question=question, answer=answer, embedding=embedding)
+        for question, (answer, embedding) in latest.items()
+        if question not in updated
+    ])
+    db.commit()
+    logger.info(
+        f"Bulk-stored {len(latest)} cached responses ({len(updated)} updated)")
+    return len(latest)
+
+
 def get_cached_response_by_question(db: Session, question: str) -> Optional[CachedResponse]:
     """Retrieve cached response by exact question match."""
     return db.query(CachedResponse).filter(CachedResponse.question == question.strip()).first()
@@ -217,14 +408,75 @@ def get_all_cached_responses(db: Session) -> List[CachedResponse]:
     return db.query(CachedResponse).all()
 
 
-def get_popular_questions(db: Session, limit: int = 10) -> List[tuple[str, int]]:
-    """Return the most popular questions based on usage frequency."""
+def get_popular_questions(
+    db: Session,
+    limit: int = 10,
+    since: Optional[datetime] = None
+) -> List[tuple[str, int]]:
+    """
+    Return the most popular questions based on usage frequency.
+
+    Questions are grouped by their normalized hash, so case and punctuation
+    variants count together. One representative wording is returned per group.
+
+    Args:
+        db: Database session
+        limit: Number of questions to return
+        since: Only count conversations created at or after this time
+
+    Returns:
+        List of (question, count) tuples, most popular first
+    """
+    count = func.count(Conversation.id).label("count")
+    query = (
+        db.query(func.min(Conversation.question), count)
+        .filter(Conversation.question_hash.is_not(None))
+    )
+
+    if since is not None:
+        query = query.filter(Conversation.created_at >= since)
+
     popular = (
-        db.query(Conversation.question, func.count(
-            Conversation.question).label("count"))
-        .group_by(Conversation.question)
-        .order_by(func.count(Conversation.question).desc())
+        query
+        .group_by(Conversation.question_hash)
+        .order_by(count.desc())
         .limit(limit)
         .all()
     )
     return [(q, c) for q, c in popular]
+
+
+# ==================== EXPORT OPERATIONS ====================
+
+def row_to_dict(row: Base) -> dict:
+    """Convert a model instance into a JSON-serializable dict of its columns."""
+    record = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        record[column.name] = value
+
+    # Exported rows must be self-contained: inline answers served from the cache
+    if isinstance(row, Conversation):
+        record["answer"] = row.resolved_answer
+
+    return record
+
+
+def iter_rows(db: Session, model: Type[Base], batch_size: int = 500) -> Iterator[Base]:
+    """
+    Stream every row of a table in primary-key order.
+
+    Uses yield_per, which enables server-side cursors where the driver
+    supports them, so only one batch is held in memory at a time.
+    """
+    statement = (
+        select(model)
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if model is Conversation:
+        statement = statement.options(CACHED_ANSWER)
+    for row in db.execute(statement).scalars():
+        yield row
@@ -2,7 +2,10 @@
 Database connection and session management.
 """
 
-from sqlalchemy import create_engine
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, create_engine, inspect
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 from app.config import settings
@@ -21,14 +24,37 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Alembic scripts (see alembic.ini)
+MIGRATIONS_PATH = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def migrate(connection: Connection) -> None:
+    """
+    Create or upgrade the schema on a connection.
+
+    A new database gets every table from the models and is stamped with the
+    latest migration. An existing one, including databases created before
+    migrations were introduced, is upgraded with Alembic.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    config.attributes["connection"] = connection
+
+    if inspect(connection).has_table("conversations"):
+        command.upgrade(config, "head")
+    else:
+        Base.metadata.create_all(bind=connection)
+        command.stamp(config, "head")
+
 
 def init_db() -> None:
     """
-    Initialize database by creating all tables.
+    Initialize the database schema (see migrate()).
     Called on application startup.
     """
     try:
-        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            migrate(connection)
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
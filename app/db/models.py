@@ -3,7 +3,7 @@ SQLAlchemy database models for user tracking and analytics.
 """
 
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, DeclarativeBase, Mapped, mapped_column
 from typing import Optional
@@ -56,10 +56,16 @@ class Conversation(Base):
     __tablename__ = "conversations"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    # Indexed through the composite (user_id, created_at) index below
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), nullable=False, index=True)
+        ForeignKey("users.id"), nullable=False)
     question: Mapped[str] = mapped_column(Text, nullable=False)
-    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    # MD5 of the normalized question, used to aggregate popular questions
+    question_hash: Mapped[Optional[str]] = mapped_column(String(32))
+    # NULL when the answer is served from cached_responses (see resolved_answer)
+    answer: Mapped[Optional[str]] = mapped_column(Text)
+    cached_response_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("cached_responses.id", name="fk_conversations_cached_response_id"))
     used_llm: Mapped[bool] = mapped_column(default=True)
     credits_charged: Mapped[int] = mapped_column(default=0)
     response_time: Mapped[Optional[float]] = mapped_column(Float)
@@ -71,11 +77,41 @@ class Conversation(Base):
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="conversations")
+    # Loaded on access, not joined into every query; reads that resolve
+    # answers in bulk use crud.CACHED_ANSWER to fetch just the answer text
+    cached_response: Mapped[Optional["CachedResponse"]] = relationship(
+        "CachedResponse", lazy="select")
+
+    @property
+    def resolved_answer(self) -> str:
+        """Answer text, read from the referenced cached response when not stored inline."""
+        if self.answer is not None:
+            return self.answer
+        if self.cached_response is not None:
+            return self.cached_response.answer
+        return ""
 
     def __repr__(self) -> str:
         return f"<Conversation(id={self.id}, user_id={self.user_id}, used_llm={self.used_llm})>"
 
 
+# Serves per-user history reads newest-first (including keyset pagination)
+# without a separate sort step.
+Index(
+    "ix_conversations_user_id_created_at",
+    Conversation.user_id,
+    Conversation.created_at.desc(),
+)
+
+# Lets popular-question reports group on the hash (optionally within a time
+# window) from the index alone instead of scanning the question text.
+Index(
+    "ix_conversations_question_hash_created_at",
+    Conversation.question_hash,
+    Conversation.created_at,
+)
+
+
 class Analytics(Base):
     """Analytics events for tracking user behavior."""
 
@@ -0,0 +1,156 @@
+"""
+Retention and archival for conversation and analytics history.
+Moves rows older than a cutoff into gzip JSONL archives in bounded batches,
+then deletes them, keeping each write transaction short.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Type, Union
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import gzip
+import json
+import os
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from app.config import settings
+from app.db.crud import CACHED_ANSWER, row_to_dict
+from app.db.database import SessionLocal
+from app.db.models import Analytics, Conversation
+
+
+ARCHIVABLE_TABLES: Dict[str, Type[Union[Conversation, Analytics]]] = {
+    "conversations": Conversation,
+    "analytics": Analytics,
+}
+
+
+def _fetch_batch(
+    db: Session,
+    model: Type[Union[Conversation, Analytics]],
+    cutoff: datetime,
+    batch_size: int
+) -> List[Union[Conversation, Analytics]]:
+    """Fetch the oldest batch of rows created before the cutoff."""
+    query = db.query(model)
+    if model is Conversation:
+        # Archived rows carry their resolved answer (see row_to_dict)
+        query = query.options(CACHED_ANSWER)
+    return (
+        query
+        .filter(model.created_at < cutoff)
+        .order_by(model.id)
+        .limit(batch_size)
+        .all()
+    )
+
+
+def archive_table(
+    table: str,
+    cutoff: datetime,
+    batch_size: int,
+    archive_dir: Path,
+    dry_run: bool = False
+) -> int:
+    """
+    Archive and delete rows of one table created before the cutoff.
+
+    Each batch is appended to the archive file and fsynced before its rows are
+    deleted, so a crash can at worst duplicate one batch in the archive, never
+    lose it.
+
+    Args:
+        table: Key of ARCHIVABLE_TABLES
+        cutoff: Rows created before this time are archived
+        batch_size: Rows per read/write/delete transaction
+        archive_dir: Directory for archive files
+        dry_run: Only count matching rows
+
+    Returns:
+        Number of rows archived (or that would be archived)
+    """
+    model = ARCHIVABLE_TABLES[table]
+
+    if dry_run:
+        db = SessionLocal()
+        try:
+            return db.query(model).filter(model.created_at < cutoff).count()
+        finally:
+            db.close()
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    run_stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    archive_file = archive_dir / f"{table}-before-{cutoff:%Y%m%d}-{run_stamp}.jsonl.gz"
+
+    total = 0
+    while True:
+        # One short-lived session per batch keeps write locks brief
+        db = SessionLocal()
+        try:
+            rows = _fetch_batch(db, model, cutoff, batch_size)
+            if not rows:
+                break
+
+            with gzip.open(archive_file, "at", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row_to_dict(row)) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            ids = [row.id for row in rows]
+            db.query(model).filter(model.id.in_(ids)).delete(
+                synchronize_session=False)
+            db.commit()
+
+            total += len(ids)
+            logger.info(f"Archived {len(ids)} {table} rows (total: {total})")
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error archiving {table}: {e}")
+            raise
+
+        finally:
+            db.close()
+
+    if total:
+        logger.info(f"Archived {total} {table} rows to {archive_file}")
+    else:
+        logger.info(f"No {table} rows older than {cutoff.isoformat()}")
+
+    return total
+
+
+def run_retention(
+    days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    Archive all retention-managed tables.
+
+    Args:
+        days: Keep rows newer than this many days (default from settings)
+        batch_size: Rows per batch (default from settings)
+        archive_dir: Archive directory (default from settings)
+        dry_run: Only count matching rows
+
+    Returns:
+        Mapping of table name to number of rows archived
+    """
+    days = settings.RETENTION_DAYS if days is None else days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    target_dir = Path(archive_dir or settings.ARCHIVE_PATH)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    logger.info(
+        f"Running retention: archiving rows older than {days} days "
+        f"(before {cutoff.isoformat()}){' [dry run]' if dry_run else ''}"
+    )
+
+    return {
+        table: archive_table(table, cutoff, batch_size, target_dir, dry_run)
+        for table in ARCHIVABLE_TABLES
+    }
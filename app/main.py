@@ -1,27 +1,67 @@
 """
 Main application entry point.
-Combines FastAPI (for future API endpoints) with Gradio interface.
+Combines FastAPI (JSON/SSE API, admin endpoints) with Gradio interface.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 import gradio as gr
 from loguru import logger
 from app.ui.gradio_app import create_gradio_interface
 from app.config import settings
 from fastapi.staticfiles import StaticFiles
 from app.ui.gradio_app import create_gradio_interface, ASSETS_DIR
+from app.api.batch import router as batch_router
+from app.api.chat import router as chat_router
+from app.api.export import router as export_router
+from app.core.embeddings import embedding_service
+from app.core.kb_watcher import kb_watcher
+from app.core.tasks import task_queue
+from app.core.warmup import warmup_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work on startup and drain it on shutdown."""
+    if not settings.secret_key_configured:
+        logger.warning("SECRET_KEY is the default; /api/v1 session endpoints answer 503")
+    task_queue.start()
+    # Warm-up runs in the background so the server binds immediately
+    warmup_manager.start()
+    # Started here rather than in warm-up, which gunicorn may run in the
+    # master: a thread running there at fork time can leave its locks held
+    # in the workers
+    if settings.KB_WATCH_ENABLED:
+        kb_watcher.start()
+    yield
+    kb_watcher.stop()
+    task_queue.shutdown()
+    embedding_service.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="AI-powered portfolio assistant with RAG"
+    description="AI-powered portfolio assistant with RAG",
+    lifespan=lifespan
 )
 
 # serve static assets (profile.png)
 app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
 
+# JSON / SSE chat API (same pipeline as the Gradio UI)
+app.include_router(chat_router)
+
+# Admin endpoints (HTTP Basic, password from ADMIN_PASSWORD); not mounted
+# while ADMIN_PASSWORD is the published default
+if settings.admin_password_configured:
+    app.include_router(batch_router)
+    app.include_router(export_router)
+else:
+    logger.warning("ADMIN_PASSWORD is the default; admin endpoints are disabled")
+
 # Health check endpoint
 
 
@@ -35,6 +75,31 @@ async def health_check():
     }
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving HTTP."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 200 once every component is warmed up, 503 before."""
+    ready = warmup_manager.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "components": warmup_manager.status()
+        }
+    )
+
+
+@app.get("/health/embeddings")
+async def embedding_metrics():
+    """Embedding micro-batching metrics (batch size vs. added queue latency)."""
+    return embedding_service.stats()
+
+
 # Root redirect to Gradio
 @app.get("/")
 async def root():
@@ -42,7 +107,7 @@ async def root():
     return RedirectResponse(url="/gradio")
 
 
-# Create and mount Gradio interface
+# Create and mount Gradio interface (cheap: components warm up in lifespan)
 logger.info("Creating Gradio interface...")
 demo = create_gradio_interface()
 
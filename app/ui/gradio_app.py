@@ -3,27 +3,15 @@ Gradio interface for the AI portfolio assistant.
 Polished ChatGPT-style UI with user avatars and perfect layout.
 """
 
-from typing import List, Dict, Optional, Tuple, Any
 import gradio as gr
-from loguru import logger
 from gradio.themes.base import Base
 from gradio.themes.utils import fonts
 from app.ui.custom_css import CHATGPT_CSS
 from app.config import settings
-from app.core.email_classifier import EmailClassifier
-from app.core.commands import command_handler
-from app.core.cache import cache_manager
-from app.core.rag import rag_pipeline
-from app.core.llm import llm_handler
-from app.db.database import SessionLocal, init_db
-from app.db.crud import (
-    create_user,
-    get_user_by_email,
-    deduct_credit,
-    create_conversation,
-    create_analytics_event
-)
-import time
+from app.core.assistant import portfolio_assistant
+from app.core.instant_answers import SUGGESTED_QUESTIONS
+from app.core.tasks import task_queue
+from app.core.warmup import warmup_manager
 from pathlib import Path
 
 
@@ -33,311 +21,10 @@ ASSETS_DIR = Path(__file__).parent / "assets"
 ASSISTANT_AVATAR = f"{settings.PUBLIC_BASE_URL.rstrip('/')}/assets/profile.png"
 
 
-class PortfolioAssistant:
-    """Main portfolio assistant application."""
-
-    def __init__(self) -> None:
-        """Initialize the assistant."""
-        self.current_user_email: Optional[str] = None
-        self.current_user_name: str = ""
-        self.current_user_initials: str = ""
-        self.current_user_avatar_url: str = ""
-        self.conversation_history: List[Dict[str, str]] = []
-        self._initialize_components()
-
-    def _initialize_components(self) -> None:
-        """Initialize all backend components."""
-        logger.info("Initializing portfolio assistant components...")
-
-        init_db()
-
-        if not rag_pipeline._initialized:
-            rag_pipeline.initialize()
-            rag_pipeline.load_and_index_documents()
-
-        if not llm_handler._initialized:
-            llm_handler.initialize()
-
-        if not cache_manager._initialized:
-            cache_manager.initialize()
-
-        logger.info("All components initialized successfully")
-
-    def register_user(
-        self,
-        first_name: str,
-        last_name: str,
-        email: str
-    ) -> Tuple[str, str, bool, str, str, str]:
-        """Register user and return initials + full name + avatar URL."""
-        try:
-            if not all([first_name, last_name, email]):
-                return ("❌ Please fill in all fields.", "", False, "", "", "")
-
-            if "@" not in email or "." not in email:
-                return ("❌ Please enter a valid email address.", "", False, "", "", "")
-
-            email = email.lower().strip()
-            db = SessionLocal()
-
-            try:
-                existing_user = get_user_by_email(db, email)
-
-                if existing_user:
-                    self.current_user_email = existing_user.email
-                    self.current_user_name = f"{existing_user.first_name} {existing_user.last_name}"
-                    self.current_user_initials = f"{existing_user.first_name[0]}{existing_user.last_name[0]}".upper(
-                    )
-                    self.current_user_avatar_url = f"https://ui-avatars.com/api/?name={self.current_user_initials}&background=10a37f&color=fff&size=128&bold=true"
-
-                    category = existing_user.email_category
-                    credits = existing_user.credits_remaining
-
-                    logger.info(f"Existing user logged in: {email}")
-
-                    welcome_msg = f"✅ Welcome back, {existing_user.first_name}! 👋"
-                    credit_msg = EmailClassifier.get_welcome_message(
-                        category, credits)
-
-                    return (welcome_msg, credit_msg, True, self.current_user_initials, self.current_user_name, self.current_user_avatar_url)
-
-                category, credits = EmailClassifier.classify(email)
-
-                user = create_user(
-                    db=db,
-                    first_name=first_name,
-                    last_name=last_name,
-                    email=email,
-                    email_category=category,
-                    credits=credits
-                )
-
-                self.current_user_email = user.email
-                self.current_user_name = f"{first_name} {last_name}"
-                self.current_user_initials = f"{first_name[0]}{last_name[0]}".upper(
-                )
-                self.current_user_avatar_url = f"https://ui-avatars.com/api/?name={self.current_user_initials}&background=10a37f&color=fff&size=128&bold=true"
-
-                create_analytics_event(
-                    db=db,
-                    user_id=user.id,
-                    event_type="registration",
-                    event_data={"email_category": category}
-                )
-
-                logger.info(
-                    f"New user registered: {email} ({category}, {credits} credits)")
-
-                welcome_msg = f"✅ Welcome, {first_name}! 🎉"
-                credit_msg = EmailClassifier.get_welcome_message(
-                    category, credits)
-
-                return (welcome_msg, credit_msg, True, self.current_user_initials, self.current_user_name, self.current_user_avatar_url)
-
-            finally:
-                db.close()
-
-        except Exception as e:
-            logger.error(f"Error in user registration: {e}")
-            return ("❌ An error occurred. Please try again.", "", False, "", "", "")
-
-    def chat(
-        self,
-        message: str,
-        history: List[Dict[str, str]]
-    ) -> Tuple[List[Dict[str, str]], str]:
-        """Handle chat messages."""
-        if not self.current_user_email:
-            error_msg: Dict[str, str] = {
-                "role": "assistant", "content": "❌ Please register first."}
-            return (history + [{"role": "user", "content": message}, error_msg], "")
-
-        start_time = time.time()
-        db = SessionLocal()
-
-        try:
-            user = get_user_by_email(db, self.current_user_email)
-
-            if not user:
-                error_msg = {"role": "assistant",
-                             "content": "❌ User not found. Please refresh."}
-                return (history + [{"role": "user", "content": message}, error_msg], "")
-
-            # Commands always work (free)
-            is_command, command_response = command_handler.handle_command(
-                message)
-
-            if is_command and command_response:
-                create_conversation(
-                    db=db,
-                    user_id=user.id,
-                    question=message,
-                    answer=command_response,
-                    used_llm=False,
-                    credits_charged=0,
-                    response_time=time.time() - start_time
-                )
-
-                create_analytics_event(
-                    db=db,
-                    user_id=user.id,
-                    event_type="command_used",
-                    event_data={"command": message}
-                )
-
-                return (
-                    history + [
-                        {"role": "user", "content": message},
-                        {"role": "assistant", "content": command_response}
-                    ],
-                    self._format_credit_display(user.credits_remaining)
-                )
-
-            # Check credits for non-command queries
-            if user.credits_remaining <= 0:
-                exhausted_msg = self._get_credits_exhausted_message()
-                create_analytics_event(
-                    db=db,
-                    user_id=user.id,
-                    event_type="credit_exhausted"
-                )
-                return (
-                    history + [
-                        {"role": "user", "content": message},
-                        {"role": "assistant", "content": exhausted_msg}
-                    ],
-                    self._format_credit_display(0)
-                )
-
-            # Check caches
-            cached = cache_manager.check_exact_cache(db, message)
-            if cached:
-                answer, cache_id = cached
-
-                create_conversation(
-                    db=db,
-                    user_id=user.id,
-                    question=message,
-                    answer=answer,
-                    used_llm=False,
-                    credits_charged=0,
-                    response_time=time.time() - start_time
-                )
-
-                return (
-                    history + [
-                        {"role": "user", "content": message},
-                        {"role": "assistant", "content": answer}
-                    ],
-                    self._format_credit_display(user.credits_remaining)
-                )
-
-            semantic_cached = cache_manager.check_semantic_cache(db, message)
-            if semantic_cached:
-                answer, cache_id, similarity = semantic_cached
-
-                create_conversation(
-                    db=db,
-                    user_id=user.id,
-                    question=message,
-                    answer=answer,
-                    used_llm=False,
-                    credits_charged=0,
-                    response_time=time.time() - start_time
-                )
-
-                return (
-                    history + [
-                        {"role": "user", "content": message},
-                        {"role": "assistant", "content": answer}
-                    ],
-                    self._format_credit_display(user.credits_remaining)
-                )
-
-            # Use LLM
-            context = rag_pipeline.retrieve_context(message)
-
-            conv_history: List[Dict[str, str]] = []
-            for msg in history:
-                conv_history.append(
-                    {"role": msg["role"], "content": msg["content"]})
-
-            answer = llm_handler.generate_response(
-                query=message,
-                context=context,
-                conversation_history=conv_history
-            )
-
-            updated_user = deduct_credit(db, user.id)
-            if not updated_user:
-                raise ValueError("Failed to deduct credit")
-
-            create_conversation(
-                db=db,
-                user_id=user.id,
-                question=message,
-                answer=answer,
-                used_llm=True,
-                credits_charged=1,
-                response_time=time.time() - start_time
-            )
-
-            cache_manager.add_to_cache(db, message, answer)
-
-            create_analytics_event(
-                db=db,
-                user_id=user.id,
-                event_type="llm_query",
-                event_data={"response_time": time.time() - start_time}
-            )
-
-            return (
-                history + [
-                    {"role": "user", "content": message},
-                    {"role": "assistant", "content": answer}
-                ],
-                self._format_credit_display(updated_user.credits_remaining)
-            )
-
-        except Exception as e:
-            logger.error(f"Error in chat: {e}")
-            error_msg_str = "❌ Error occurred. Please try again or contact sarjakm369@gmail.com"
-            return (
-                history + [
-                    {"role": "user", "content": message},
-                    {"role": "assistant", "content": error_msg_str}
-                ],
-                self._format_credit_display(0)
-            )
-
-        finally:
-            db.close()
-
-    def _format_credit_display(self, credits: int) -> str:
-        """Format credit display."""
-        if credits == 1:
-            return f"💬 {credits} question left"
-        return f"💬 {credits} questions left"
-
-    def _get_credits_exhausted_message(self) -> str:
-        """Get message when credits are exhausted."""
-        return """**🎯 All Questions Used!**
-
-Thanks for exploring my portfolio!
-
-**📬 Let's Connect:**
-- **Email:** sarjakm369@gmail.com
-- **LinkedIn:** [linkedin.com/in/Sarjak369](https://linkedin.com/in/Sarjak369)
-- **GitHub:** [github.com/Sarjak369](https://github.com/Sarjak369)
-
-**💡 Free Commands:**
-`/contact` `/skills` `/projects` `/education` `/resume`"""
-
-
 def create_gradio_interface() -> gr.Blocks:
     """Create Gradio interface with ChatGPT-style layout."""
 
-    assistant = PortfolioAssistant()
+    assistant = portfolio_assistant
 
     theme = Base(
         primary_hue="green",
@@ -365,6 +52,8 @@ def create_gradio_interface() -> gr.Blocks:
         user_initials_state = gr.State("")
         user_name_state = gr.State("")
         user_avatar_state = gr.State("")
+        # Per-browser-session identity (see UserSession)
+        session_state = gr.State(None)
 
         # Email Gate
         with gr.Column(visible=True, elem_id="email-gate") as email_gate:
@@ -474,22 +163,21 @@ def create_gradio_interface() -> gr.Blocks:
                         "Send", scale=1, variant="primary", elem_id="send-button")
 
                 with gr.Row(elem_id="suggested-row"):
-                    sg1 = gr.Button(
-                        "What's your most impressive project?", size="sm")
-                    sg2 = gr.Button(
-                        "Tell me about your AI experience", size="sm")
-                    sg3 = gr.Button("What technologies do you use?", size="sm")
+                    suggested_buttons = [
+                        gr.Button(question, size="sm")
+                        for question in SUGGESTED_QUESTIONS
+                    ]
 
         # Registration logic
         def handle_registration(first_name: str, last_name: str, email: str):
-            welcome, credits, success, initials, full_name, avatar_url = assistant.register_user(
+            welcome, credits, session = assistant.register_user(
                 first_name, last_name, email
             )
-            if success:
+            if session is not None:
                 user_html = f"""
                 <div class="user-info">
-                    <img src="{avatar_url}" class="user-avatar" alt="{initials}" />
-                    <div class="user-name">{full_name}</div>
+                    <img src="{session.avatar_url}" class="user-avatar" alt="{session.initials}" />
+                    <div class="user-name">{session.name}</div>
                 </div>
                 """
                 return (
@@ -499,9 +187,10 @@ def create_gradio_interface() -> gr.Blocks:
                     gr.update(value=welcome, visible=True),     # welcome_msg
                     gr.update(value=credits, visible=True),     # credit_msg
                     True,                                       # registered
-                    initials,
-                    full_name,
-                    avatar_url,
+                    session.initials,
+                    session.name,
+                    session.avatar_url,
+                    session,                                    # session_state
                     # user_info_display
                     gr.update(value=user_html),
                     # <-- set user avatar
@@ -509,7 +198,7 @@ def create_gradio_interface() -> gr.Blocks:
                     gr.update(
                         value=[],
                         # (user, assistant)
-                        avatar_images=(avatar_url, ASSISTANT_AVATAR)
+                        avatar_images=(session.avatar_url, ASSISTANT_AVATAR)
                     ),
                 )
             else:
@@ -519,6 +208,7 @@ def create_gradio_interface() -> gr.Blocks:
                     gr.update(value=welcome, visible=True),
                     gr.update(value="", visible=False),
                     False, "", "", "",
+                    None,
                     gr.update(),
                     gr.update()  # chatbot (no-op)
                 )
@@ -535,42 +225,46 @@ def create_gradio_interface() -> gr.Blocks:
                 user_initials_state,
                 user_name_state,
                 user_avatar_state,
+                session_state,
                 user_info_display,
                 chatbot,                    # <-- new output to update avatars
             ],
         )
 
         # Chat logic
-        def handle_message(message, history, user_avatar):
+        def handle_message(message, history, session):
             new_history, credits = assistant.chat(
-                message, history if history else [])
-            return new_history, credits, ""
+                message, history if history else [], session)
+            # Instant answers don't read the balance; keep the current display
+            return new_history, credits or gr.update(), ""
 
         send_btn.click(
             fn=handle_message,
-            inputs=[msg_input, chatbot, user_avatar_state],
+            inputs=[msg_input, chatbot, session_state],
             outputs=[chatbot, credit_display, msg_input]
         )
 
         msg_input.submit(
             fn=handle_message,
-            inputs=[msg_input, chatbot, user_avatar_state],
+            inputs=[msg_input, chatbot, session_state],
             outputs=[chatbot, credit_display, msg_input]
         )
 
         # Clear chat
         clear_btn.click(lambda: [], outputs=[chatbot])
 
-        # Suggested questions
-        sg1.click(lambda: "What's your most impressive project?",
-                  outputs=[msg_input])
-        sg2.click(lambda: "Tell me about your AI experience",
-                  outputs=[msg_input])
-        sg3.click(lambda: "What technologies do you use?", outputs=[msg_input])
+        # Suggested questions (answers are pinned by instant_answers)
+        for button, question in zip(suggested_buttons, SUGGESTED_QUESTIONS):
+            button.click(lambda q=question: q, outputs=[msg_input])
+
+    # Handlers are reentrant, so several visitors can be served at once
+    demo.queue(default_concurrency_limit=settings.GRADIO_CONCURRENCY_LIMIT)
 
     return demo
 
 
 if __name__ == "__main__":
+    task_queue.start()
+    warmup_manager.start()
     demo = create_gradio_interface()
     demo.launch(server_name="0.0.0.0", server_port=7860, share=False)
@@ -0,0 +1,67 @@
+"""
+Gunicorn configuration for the pre-fork multi-worker deployment mode.
+
+The master process imports the app and warms up the heavy components
+(embedding model, in-memory vector index, database) *before* forking, so
+workers share those pages copy-on-write instead of each loading their own.
+Components holding network connections (LLM client, instant answers) are
+warmed up in each worker.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Set WEB_PRELOAD=false to get the classic per-worker loading behaviour, e.g. to
+compare memory with scripts/measure_worker_memory.py.
+"""
+
+import gc
+import os
+
+from app.config import settings
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '7860')}"
+workers = settings.WEB_WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.WEB_PRELOAD
+# Model loading happens before fork; workers start quickly
+timeout = 120
+
+
+def on_starting(server):
+    """Warm up components in the master so forked workers inherit them."""
+    if not settings.WEB_PRELOAD:
+        return
+
+    import torch
+    from app.core.embeddings import embedding_service
+    from app.core.warmup import warmup_manager
+
+    # Keep torch and the tokenizers single-threaded in the master: thread
+    # pools created before fork can deadlock in the children.
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    torch.set_num_threads(1)
+    embedding_service.torch_threads = 1
+    # The LLM client and instant answers (which may call Groq) are set up
+    # per worker: pooled HTTP connections must not be shared across fork
+    warmup_manager.run(skip=warmup_manager.PER_PROCESS)
+
+    # Move everything loaded so far into the permanent GC generation so
+    # collections in workers don't write to (and un-share) those pages.
+    gc.freeze()
+    server.log.info("Components preloaded; forking workers")
+
+
+def post_fork(server, worker):
+    """Give each worker its own torch thread budget and database connections."""
+    import torch
+    from app.core.embeddings import embedding_service
+    from app.db.database import engine
+
+    # Pooled connections opened by warm-up in the master must not be shared
+    # with the children; drop them without closing the master's sockets.
+    engine.dispose(close=False)
+
+    torch.set_num_threads(settings.TORCH_THREADS_PER_WORKER)
+    # Embedding pool threads re-apply this on their first batch in the worker
+    embedding_service.torch_threads = settings.TORCH_THREADS_PER_WORKER
@@ -0,0 +1,116 @@
+"""Add conversations.question_hash, cached response references and indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Databases created before migrations existed have the baseline schema; this
+brings them up to the models. Each step is skipped when already applied, so
+databases built by create_all() from intermediate models upgrade cleanly too.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.crud import compute_question_hash
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+conversations = sa.table(
+    "conversations",
+    sa.column("id", sa.Integer),
+    sa.column("question", sa.Text),
+    sa.column("question_hash", sa.String),
+)
+
+
+def _columns() -> dict:
+    return {c["name"]: c for c in sa.inspect(op.get_bind()).get_columns("conversations")}
+
+
+def _indexes() -> set:
+    return {i["name"] for i in sa.inspect(op.get_bind()).get_indexes("conversations")}
+
+
+def _backfill_question_hashes() -> None:
+    """Hash the questions of existing rows, in primary-key batches."""
+    bind = op.get_bind()
+    update = (
+        conversations.update()
+        .where(conversations.c.id == sa.bindparam("row_id"))
+        .values(question_hash=sa.bindparam("hash"))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(conversations.c.id, conversations.c.question)
+            .where(conversations.c.question_hash.is_(None), conversations.c.id > last_id)
+            .order_by(conversations.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        bind.execute(update, [
+            {"row_id": row.id, "hash": compute_question_hash(row.question)} for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns()
+    # Column changes first: on SQLite the FK and nullability changes rebuild
+    # the table, which is cheaper before the new indexes exist
+    with op.batch_alter_table("conversations") as batch_op:
+        if "question_hash" not in columns:
+            batch_op.add_column(sa.Column("question_hash", sa.String(32), nullable=True))
+        if "cached_response_id" not in columns:
+            batch_op.add_column(sa.Column("cached_response_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_conversations_cached_response_id", "cached_responses",
+                ["cached_response_id"], ["id"])
+        # NULL when the answer is read from the referenced cached response
+        if not columns["answer"]["nullable"]:
+            batch_op.alter_column("answer", existing_type=sa.Text(), nullable=True)
+
+    indexes = _indexes()
+    # The composite (user_id, created_at) index replaces the user_id index
+    if "ix_conversations_user_id" in indexes:
+        op.drop_index("ix_conversations_user_id", table_name="conversations")
+    if "ix_conversations_user_id_created_at" not in indexes:
+        op.create_index(
+            "ix_conversations_user_id_created_at", "conversations",
+            ["user_id", sa.text("created_at DESC")])
+    if "ix_conversations_question_hash_created_at" not in indexes:
+        op.create_index(
+            "ix_conversations_question_hash_created_at", "conversations",
+            ["question_hash", "created_at"])
+
+    _backfill_question_hashes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Copy referenced answers back inline before answer becomes NOT NULL again
+    op.execute(
+        "UPDATE conversations SET answer = (SELECT cached_responses.answer "
+        "FROM cached_responses WHERE cached_responses.id = conversations.cached_response_id) "
+        "WHERE answer IS NULL AND cached_response_id IS NOT NULL")
+    op.execute("UPDATE conversations SET answer = '' WHERE answer IS NULL")
+
+    op.drop_index("ix_conversations_question_hash_created_at", table_name="conversations")
+    op.drop_index("ix_conversations_user_id_created_at", table_name="conversations")
+    op.create_index("ix_conversations_user_id", "conversations", ["user_id"])
+    with op.batch_alter_table("conversations") as batch_op:
+        batch_op.alter_column("answer", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint("fk_conversations_cached_response_id", type_="foreignkey")
+        batch_op.drop_column("cached_response_id")
+        batch_op.drop_column("question_hash")
@@ -0,0 +1,64 @@
+"""
+Data retention script.
+Archives old conversations and analytics to gzip JSONL files and deletes them.
+
+Usage:
+    python -m scripts.archive_data                  # one run with settings
+    python -m scripts.archive_data --days 90 --dry-run
+    python -m scripts.archive_data --every-hours 24 # keep running on a schedule
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.db.database import init_db  # noqa: E402
+from app.db.retention import run_retention  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Archive and delete old conversations and analytics.")
+    parser.add_argument("--days", type=int, default=settings.RETENTION_DAYS,
+                        help="Keep rows newer than this many days")
+    parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE,
+                        help="Rows per archive/delete transaction")
+    parser.add_argument("--archive-dir", default=settings.ARCHIVE_PATH,
+                        help="Directory for .jsonl.gz archive files")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report how many rows would be archived")
+    parser.add_argument("--every-hours", type=float, default=None,
+                        help="Repeat on this interval instead of running once")
+    return parser.parse_args()
+
+
+def main():
+    """Run retention once or on a fixed schedule."""
+    args = parse_args()
+    init_db()
+
+    while True:
+        results = run_retention(
+            days=args.days,
+            batch_size=args.batch_size,
+            archive_dir=args.archive_dir,
+            dry_run=args.dry_run,
+        )
+        logger.info(f"Retention run complete: {results}")
+
+        if args.every_hours is None:
+            break
+
+        logger.info(f"Next retention run in {args.every_hours} hours")
+        time.sleep(args.every_hours * 3600)
+
+
+if __name__ == "__main__":
+    main()
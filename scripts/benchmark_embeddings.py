@@ -0,0 +1,146 @@
+"""
+Embedding backend benchmark: fp32 PyTorch vs int8-quantized ONNX Runtime.
+
+Accuracy: embeds every knowledge-base chunk with both backends and reports
+the cosine similarity between the two vectors of each chunk (drift), plus
+how often the top-k retrieval results for sample questions agree.
+
+Speed: single-query latency (p50/p95) and batch throughput per backend.
+
+Usage:
+    python -m scripts.benchmark_embeddings
+    python -m scripts.benchmark_embeddings --runs 200 --batch-sizes 1 16 64
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_community.document_loaders import DirectoryLoader, TextLoader  # noqa: E402
+from langchain_text_splitters import RecursiveCharacterTextSplitter  # noqa: E402
+from loguru import logger  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core.embeddings import EmbeddingService  # noqa: E402
+from app.core.instant_answers import SUGGESTED_QUESTIONS  # noqa: E402
+from app.core.intent_router import INTENT_PHRASES  # noqa: E402
+
+
+def load_chunks() -> List[str]:
+    """Split the knowledge base the same way the RAG pipeline does."""
+    loader = DirectoryLoader(
+        settings.KNOWLEDGE_BASE_PATH,
+        glob="**/*.md",
+        loader_cls=TextLoader,
+        loader_kwargs={'encoding': 'utf-8'}
+    )
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    return [doc.page_content for doc in splitter.split_documents(loader.load())]
+
+
+def sample_queries() -> List[str]:
+    """Questions used for the retrieval agreement check."""
+    queries = list(SUGGESTED_QUESTIONS)
+    for phrases in INTENT_PHRASES.values():
+        queries.extend(phrases)
+    return queries
+
+
+def accuracy_report(reference: EmbeddingService, candidate: EmbeddingService,
+                    chunks: List[str], queries: List[str], k: int) -> Dict[str, float]:
+    """Compare candidate embeddings against the fp32 reference."""
+    ref_chunks = reference._encode(chunks)
+    cand_chunks = candidate._encode(chunks)
+    # Rows are normalized, so the row-wise dot product is the cosine
+    drift = np.sum(ref_chunks * cand_chunks, axis=1)
+
+    ref_queries = reference._encode(queries)
+    cand_queries = candidate._encode(queries)
+    k = min(k, len(chunks))
+    overlaps = []
+    for ref_q, cand_q in zip(ref_queries, cand_queries):
+        ref_top = set(np.argsort(-(ref_chunks @ ref_q))[:k])
+        cand_top = set(np.argsort(-(cand_chunks @ cand_q))[:k])
+        overlaps.append(len(ref_top & cand_top) / k)
+
+    return {
+        "chunks": len(chunks),
+        "cosine_mean": float(drift.mean()),
+        "cosine_p5": float(np.percentile(drift, 5)),
+        "cosine_min": float(drift.min()),
+        f"top{k}_overlap": float(np.mean(overlaps)),
+    }
+
+
+def speed_report(service: EmbeddingService, chunks: List[str], queries: List[str],
+                 runs: int, batch_sizes: List[int]) -> Dict[str, float]:
+    """Measure single-query latency and batch throughput of one backend."""
+    service._encode(queries[:1])  # first call pays one-off allocation costs
+
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        service._encode([queries[i % len(queries)]])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    report = {
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+    }
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        for i in range(0, len(chunks), batch_size):
+            service._encode(chunks[i:i + batch_size])
+        report[f"throughput_b{batch_size}_per_s"] = len(chunks) / (time.perf_counter() - started)
+    return report
+
+
+def main():
+    """Run the accuracy check and the speed benchmark for both backends."""
+    parser = argparse.ArgumentParser(
+        description="Compare fp32 PyTorch and int8 ONNX embedding backends.")
+    parser.add_argument("--runs", type=int, default=100,
+                        help="Single-query encodes for the latency percentiles")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32],
+                        help="Batch sizes for the throughput measurement")
+    parser.add_argument("--top-k", type=int, default=settings.TOP_K_RETRIEVAL,
+                        help="k for the retrieval agreement check")
+    args = parser.parse_args()
+
+    chunks = load_chunks()
+    if not chunks:
+        logger.error(f"No knowledge base documents under {settings.KNOWLEDGE_BASE_PATH}")
+        sys.exit(1)
+    queries = sample_queries()
+
+    services = {backend: EmbeddingService(backend=backend) for backend in EmbeddingService.BACKENDS}
+    for service in services.values():
+        service.initialize()
+
+    print(f"\nAccuracy of onnx (int8) vs torch (fp32) on {len(chunks)} chunks:")
+    for name, value in accuracy_report(
+            services["torch"], services["onnx"], chunks, queries, args.top_k).items():
+        print(f"  {name:<24} {value:.4f}")
+
+    print("\nSpeed (direct encode, "
+          f"{settings.TORCH_THREADS_PER_WORKER} intra-op threads):")
+    reports = {backend: speed_report(service, chunks, queries, args.runs, args.batch_sizes)
+               for backend, service in services.items()}
+    print(f"  {'metric':<28}" + "".join(f"{backend:>12}" for backend in reports))
+    for metric in reports["torch"]:
+        print(f"  {metric:<28}" + "".join(f"{r[metric]:>12.2f}" for r in reports.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Document loading benchmark: serial vs process-pool PDF parsing.
+
+Generates a synthetic corpus of multi-page text PDFs and times
+app.core.ingest.iter_documents over it with one process and with a pool.
+
+Usage:
+    python -m scripts.benchmark_ingest
+    python -m scripts.benchmark_ingest --files 500 --pages 8 --workers 1 2 4 8
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.core.ingest import iter_documents  # noqa: E402
+
+
+WORDS = ("retrieval embedding vector index language model python pipeline "
+         "research dataset evaluation latency throughput transformer query "
+         "document chunk cache database api deployment experiment").split()
+
+
+def write_pdf(path: Path, pages: List[List[str]]) -> None:
+    """Write a minimal PDF with one Helvetica text page per list of lines."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append((
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode())
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def make_corpus(directory: Path, files: int, pages: int, seed: int = 0) -> List[Path]:
+    """Generate `files` PDFs of `pages` pages of random prose."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        path = directory / f"paper_{i:04d}.pdf"
+        write_pdf(path, [
+            [" ".join(rng.choices(WORDS, k=12)) for _ in range(60)]
+            for _ in range(pages)
+        ])
+        paths.append(path)
+    return paths
+
+
+def main():
+    """Generate the corpus and time loading it with each worker count."""
+    parser = argparse.ArgumentParser(
+        description="Compare serial and parallel PDF loading.")
+    parser.add_argument("--files", type=int, default=300, help="PDFs to generate")
+    parser.add_argument("--pages", type=int, default=5, help="Pages per PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 0],
+                        help="Worker counts to compare (1 = serial, 0 = one per usable CPU)")
+    args = parser.parse_args()
+    # Compare the pool even on corpora small enough to be loaded serially
+    settings.INDEXING_PARALLEL_MIN_FILES = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.files, args.pages)
+        print(f"Corpus: {args.files} PDFs x {args.pages} pages")
+
+        baseline = None
+        for workers in args.workers:
+            stats: dict = {}
+            for _ in iter_documents(paths, workers=workers, stats=stats):
+                pass
+            baseline = baseline or stats["seconds"]
+            label = "serial" if workers == 1 else f"workers={workers or 'cpu'}"
+            print(f"  {label:<14} {stats['seconds']:7.2f}s  "
+                  f"{stats['documents']} pages, {stats['failed']} failed, "
+                  f"speedup x{baseline / stats['seconds']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Vector backend benchmark: NumPy exact search vs in-memory Qdrant.
+
+Builds each backend over the same synthetic normalized vectors and reports
+per-query latency (p50/p95), memory held after indexing, and top-k agreement
+with the NumPy results. Three query paths are timed:
+
+    numpy             NumpyBackend.search (the default backend)
+    qdrant            QdrantBackend.search (raw client, ids only)
+    qdrant+langchain  QdrantVectorStore.similarity_search_by_vector, the
+                      pipeline's previous query path (builds Documents)
+
+Usage:
+    python -m scripts.benchmark_vector_backends
+    python -m scripts.benchmark_vector_backends --sizes 200 2000 20000 --queries 300
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+from langchain_qdrant import QdrantVectorStore  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core.vector_backends import NumpyBackend, QdrantBackend  # noqa: E402
+
+
+class _FixedEmbeddings(Embeddings):
+    """Stand-in embedder: the benchmark only issues queries by vector."""
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0] + [0.0] * (self.dimension - 1)
+
+
+def make_vectors(n: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, roughly like sentence embeddings of a corpus."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, n // 50), dimension))
+    vectors = centers[rng.integers(len(centers), size=n)] + 0.5 * rng.normal(size=(n, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (Linux)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * 4096
+    except OSError:
+        return 0
+
+
+def measure_build(build: Callable[[], object]) -> Dict[str, object]:
+    """Build a backend, recording Python-tracked and RSS memory growth."""
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    started = time.perf_counter()
+    backend = build()
+    seconds = time.perf_counter() - started
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"backend": backend, "build_s": seconds, "traced_mb": traced / 2**20,
+            "rss_mb": (rss_bytes() - rss_before) / 2**20}
+
+
+def time_queries(search: Callable[[np.ndarray], List[int]], queries: np.ndarray) -> Dict[str, float]:
+    """Latency percentiles of one query path."""
+    search(queries[0])
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95))}
+
+
+def run(n: int, dimension: int, n_queries: int, k: int) -> None:
+    """Benchmark all paths for one corpus size."""
+    vectors = make_vectors(n, dimension)
+    queries = make_vectors(n_queries, dimension, seed=1)
+    ids = list(range(n))
+    payloads = [{"page_content": f"chunk {i}", "metadata": {"chunk_id": i}} for i in ids]
+
+    def build_numpy() -> NumpyBackend:
+        backend = NumpyBackend(dimension)
+        for start in range(0, n, 256):
+            backend.add(ids[start:start + 256], vectors[start:start + 256])
+        return backend
+
+    def build_qdrant() -> QdrantBackend:
+        backend = QdrantBackend(dimension, collection_name=f"bench_{n}")
+        for start in range(0, n, 256):
+            backend.add(ids[start:start + 256], vectors[start:start + 256],
+                        payloads[start:start + 256])
+        return backend
+
+    numpy_build = measure_build(build_numpy)
+    qdrant_build = measure_build(build_qdrant)
+    numpy_backend: NumpyBackend = numpy_build["backend"]
+    qdrant_backend: QdrantBackend = qdrant_build["backend"]
+    store = QdrantVectorStore(client=qdrant_backend.client,
+                              collection_name=qdrant_backend.collection_name,
+                              embedding=_FixedEmbeddings(dimension))
+
+    paths = {
+        "numpy": lambda q: [i for i, _ in numpy_backend.search(q, k)],
+        "qdrant": lambda q: [i for i, _ in qdrant_backend.search(q, k)],
+        "qdrant+langchain": lambda q: [d.metadata["chunk_id"] for d in
+                                       store.similarity_search_by_vector(q.tolist(), k=k)],
+    }
+    reference = [set(paths["numpy"](q)) for q in queries[:50]]
+
+    print(f"\n{n} vectors x {dimension} dims, top-{k}, {n_queries} queries")
+    print(f"  {'path':<18}{'p50 ms':>9}{'p95 ms':>9}{'agree':>8}")
+    for name, search in paths.items():
+        latency = time_queries(search, queries)
+        agree = np.mean([len(set(search(q)) & ref) / k for q, ref in zip(queries[:50], reference)])
+        print(f"  {name:<18}{latency['p50_ms']:>9.3f}{latency['p95_ms']:>9.3f}{agree:>8.2f}")
+
+    print(f"  {'build':<18}{'seconds':>9}{'traced MB':>11}{'RSS MB':>9}")
+    for name, build in (("numpy", numpy_build), ("qdrant", qdrant_build)):
+        print(f"  {name:<18}{build['build_s']:>9.2f}{build['traced_mb']:>11.1f}{build['rss_mb']:>9.1f}")
+
+
+def main():
+    """Run the benchmark for each corpus size."""
+    parser = argparse.ArgumentParser(
+        description="Compare NumPy and Qdrant vector backends.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000],
+                        help="Corpus sizes (number of vectors)")
+    parser.add_argument("--dimension", type=int, default=384,
+                        help="Vector dimension (all-MiniLM-L6-v2: 384)")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per path")
+    parser.add_argument("--top-k", type=int, default=settings.HYBRID_CANDIDATES,
+                        help="Results per query")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args.dimension, args.queries, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
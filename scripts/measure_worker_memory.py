@@ -0,0 +1,77 @@
+"""
+Per-worker memory report for a running gunicorn deployment.
+Reads /proc/<pid>/smaps_rollup (Linux) for the master and each worker.
+
+RSS counts shared pages in every process that maps them; PSS splits them
+between sharers, so total PSS is the real memory cost. Compare a run with
+WEB_PRELOAD=true against WEB_PRELOAD=false to see what pre-forking saves.
+
+Usage:
+    python -m scripts.measure_worker_memory <gunicorn-master-pid>
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"]
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Return smaps_rollup fields for a process, in KiB."""
+    values: Dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].rstrip(":") in FIELDS:
+            values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def find_children(parent_pid: int) -> List[int]:
+    """Return PIDs whose parent is `parent_pid`."""
+    children = []
+    for stat_file in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # Field 4 is the ppid; the command name in field 2 may contain spaces
+            fields = stat_file.read_text().rsplit(")", 1)[1].split()
+            if int(fields[1]) == parent_pid:
+                children.append(int(stat_file.parent.name))
+        except (OSError, IndexError, ValueError):
+            continue
+    return sorted(children)
+
+
+def main():
+    """Print a per-process memory table and totals."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("master_pid", type=int, help="PID of the gunicorn master")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        sys.exit("smaps_rollup not available (requires Linux 4.14+)")
+
+    pids = [args.master_pid] + find_children(args.master_pid)
+    totals = {field: 0 for field in FIELDS}
+
+    print(f"{'pid':>8} {'role':>7} " + " ".join(f"{f:>14}" for f in FIELDS))
+    for pid in pids:
+        values = read_smaps_rollup(pid)
+        role = "master" if pid == args.master_pid else "worker"
+        print(f"{pid:>8} {role:>7} " +
+              " ".join(f"{values.get(f, 0) / 1024:>11.1f} MB" for f in FIELDS))
+        for field in FIELDS:
+            totals[field] += values.get(field, 0)
+
+    workers = max(len(pids) - 1, 1)
+    print(f"\nWorkers: {len(pids) - 1}")
+    print(f"Total RSS: {totals['Rss'] / 1024:.1f} MB  "
+          f"(naive sum, double-counts shared pages)")
+    print(f"Total PSS: {totals['Pss'] / 1024:.1f} MB  (actual footprint)")
+    print(f"PSS per worker (incl. master share): "
+          f"{totals['Pss'] / 1024 / workers:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Cache prewarming script.
+Answers a list of questions offline and stores them in the response cache,
+so first visitors asking them get instant cache hits.
+
+Usage:
+    python -m scripts.prewarm_cache                        # sample_questions.txt
+    python -m scripts.prewarm_cache --file questions.txt --concurrency 8
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.core.batch import answer_questions, load_questions  # noqa: E402
+from app.core.warmup import warmup_manager  # noqa: E402
+
+
+def main():
+    """Load questions from a file and precompute their answers."""
+    parser = argparse.ArgumentParser(
+        description="Precompute answers for a list of questions.")
+    parser.add_argument("--file", default="sample_questions.txt",
+                        help="Text file with one question per line")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_CONCURRENCY,
+                        help="Maximum simultaneous LLM calls")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Also answer questions that are already cached")
+    args = parser.parse_args()
+
+    questions = load_questions(args.file)
+    logger.info(f"Loaded {len(questions)} questions from {args.file}")
+
+    warmup_manager.run()
+    if not warmup_manager.is_ready():
+        logger.error(f"Components failed to start: {warmup_manager.status()}")
+        sys.exit(1)
+
+    stats = answer_questions(
+        questions,
+        concurrency=args.concurrency,
+        skip_cached=not args.refresh,
+    )
+    logger.info(f"Prewarm complete: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
 from loguru import logger
+from app.config import settings
 from app.core.rag import rag_pipeline
 from app.db.database import init_db, engine
 from pathlib import Path
+import argparse
 import sys
 
 """
 Database setup script.
 Initializes database and loads knowledge base into vector store.
+
+Usage:
+    python -m scripts.setup_db
+    python -m scripts.setup_db --snapshot              # also write data/snapshot
+    python -m scripts.setup_db --snapshot /srv/snapshot
 """
 
 
@@ -16,6 +23,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 def main():
     """Initialize database and RAG pipeline."""
+    parser = argparse.ArgumentParser(
+        description="Create tables and index the knowledge base.")
+    parser.add_argument("--snapshot", nargs="?", const=settings.VECTOR_SNAPSHOT_PATH,
+                        metavar="DIR",
+                        help="Also write a memory-mapped vector snapshot "
+                             f"(default dir: {settings.VECTOR_SNAPSHOT_PATH})")
+    args = parser.parse_args()
+
     logger.info("Starting database setup...")
 
     # Initialize database tables
@@ -30,6 +45,10 @@ def main():
     logger.info("Loading and indexing knowledge base...")
     num_chunks = rag_pipeline.load_and_index_documents()
     logger.info(f"Indexed {num_chunks} document chunks")
+    logger.info(f"Indexing throughput: {rag_pipeline.indexing_stats}")
+
+    if args.snapshot:
+        rag_pipeline.save_snapshot(args.snapshot)
 
     # Get stats
     stats = rag_pipeline.get_stats()
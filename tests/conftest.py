@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base, User
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory SQLite database with every table created."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def make_user(db):
+    """Factory creating users with a given number of credits."""
+    counter = {"n": 0}
+
+    def make(credits: int = 5) -> User:
+        counter["n"] += 1
+        user = User(
+            first_name="Test",
+            last_name=f"User{counter['n']}",
+            email=f"user{counter['n']}@example.com",
+            email_category="personal",
+            credits_initial=credits,
+            credits_remaining=credits,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return make
@@ -0,0 +1,58 @@
+"""
+Tests for entity extraction and matching in the BM25 index.
+"""
+
+import pytest
+
+from app.core.bm25 import BM25Index, extract_entities
+
+
+@pytest.mark.parametrize("heading, entity", [
+    ("## LogSenseAI - Log analysis platform", "LogSenseAI"),
+    ("### PyTorch", "PyTorch"),
+    ("## GPT-4 Evaluation Harness", "GPT-4 Evaluation Harness"),
+    ("## [LangFlow-Viz](https://example.com): Flow editor", "LangFlow-Viz"),
+    ("## **OpenAI** Integrations", "OpenAI Integrations"),
+])
+def test_extract_entities_finds_names(heading, entity):
+    assert extract_entities(heading) == [entity]
+
+
+@pytest.mark.parametrize("heading", [
+    "## Experience",
+    "## AI Experience",
+    "## ML Skills",
+    "### NLP Projects",
+    "## Selected Projects and Experience Across Teams",
+])
+def test_extract_entities_ignores_section_titles(heading):
+    assert extract_entities(heading) == []
+
+
+@pytest.fixture
+def index():
+    """Index with a few overlapping entity names."""
+    index = BM25Index()
+    index.add_entity_names(["LogSenseAI", "LangFlow", "LangFlow-Viz", "PyTorch"])
+    return index
+
+
+def test_match_entity_returns_the_named_entity(index):
+    assert index.match_entity("What is logsenseai built with?") == (
+        "LogSenseAI", ("logsenseai",))
+
+
+def test_match_entity_prefers_the_longer_overlapping_name(index):
+    assert index.match_entity("Tell me about LangFlow-Viz") == (
+        "LangFlow-Viz", ("langflow", "viz"))
+
+
+def test_match_entity_is_none_when_ambiguous(index):
+    assert index.match_entity("Does LogSenseAI use PyTorch?") is None
+
+
+def test_match_entity_is_none_for_acronym_questions():
+    index = BM25Index()
+    index.add_entity_names(extract_entities("## AI Experience\n## LogSenseAI"))
+
+    assert index.match_entity("Tell me about your AI experience") is None
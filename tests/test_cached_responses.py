@@ -0,0 +1,51 @@
+"""
+Tests for bulk cache writes.
+"""
+
+from app.db.crud import (
+    create_cached_responses_bulk,
+    create_conversation,
+    get_cached_response_by_question,
+)
+from app.db.models import CachedResponse, Conversation
+
+
+def test_bulk_store_inserts_new_questions(db):
+    stored = create_cached_responses_bulk(
+        db, [("What is X?", "X.", "[1.0]"), ("What is Y?", "Y.", None)])
+
+    assert stored == 2
+    assert db.query(CachedResponse).count() == 2
+
+
+def test_bulk_store_updates_already_cached_questions(db):
+    create_cached_responses_bulk(db, [("What is X?", "Old answer.", "[1.0]")])
+
+    create_cached_responses_bulk(
+        db, [(" What is X? ", "New answer.", "[0.5]"), ("What is Y?", "Y.", None)])
+
+    assert db.query(CachedResponse).count() == 2
+    cached = get_cached_response_by_question(db, "What is X?")
+    assert (cached.answer, cached.embedding) == ("New answer.", "[0.5]")
+
+
+def test_bulk_store_keeps_the_last_answer_for_repeated_questions(db):
+    create_cached_responses_bulk(db, [("What is X?", "First.", None),
+                                      ("What is X?", "Second.", None)])
+
+    assert db.query(CachedResponse).count() == 1
+    assert get_cached_response_by_question(db, "What is X?").answer == "Second."
+
+
+def test_bulk_update_keeps_the_answer_conversations_were_served(db, make_user):
+    user = make_user()
+    create_cached_responses_bulk(db, [("What is X?", "Old answer.", None)])
+    cached = get_cached_response_by_question(db, "What is X?")
+    served = create_conversation(
+        db, user.id, "What is X?", cached.answer, cached_response_id=cached.id)
+
+    create_cached_responses_bulk(db, [("What is X?", "New answer.", None)])
+
+    db.expire_all()
+    assert get_cached_response_by_question(db, "What is X?").answer == "New answer."
+    assert db.get(Conversation, served.id).resolved_answer == "Old answer."
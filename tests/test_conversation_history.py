@@ -0,0 +1,86 @@
+"""
+Tests for keyset-paginated conversation history.
+"""
+
+from datetime import datetime, timedelta
+
+from app.db.crud import (
+    get_conversation_count,
+    get_user_conversations_page,
+)
+from app.db.models import Conversation
+
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def add_conversations(db, user_id, timestamps):
+    """Insert one conversation per timestamp, in the given order."""
+    rows = [
+        Conversation(user_id=user_id, question=f"q{i}", answer=f"a{i}", created_at=created_at)
+        for i, created_at in enumerate(timestamps)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def all_pages(db, user_id, limit):
+    """Follow next cursors to the end; returns the list of pages of ids."""
+    pages, before = [], None
+    while True:
+        rows, cursor = get_user_conversations_page(db, user_id, limit=limit, before=before)
+        pages.append([row.id for row in rows])
+        if cursor is None:
+            return pages
+        before = cursor
+
+
+def test_pages_are_newest_first_and_disjoint(db, make_user):
+    user = make_user()
+    rows = add_conversations(db, user.id, [BASE_TIME + timedelta(minutes=i) for i in range(7)])
+
+    pages = all_pages(db, user.id, limit=3)
+
+    assert pages == [[r.id for r in rows[6:3:-1]], [r.id for r in rows[3:0:-1]], [rows[0].id]]
+
+
+def test_exact_multiple_of_limit_has_no_empty_last_page(db, make_user):
+    user = make_user()
+    add_conversations(db, user.id, [BASE_TIME + timedelta(minutes=i) for i in range(6)])
+
+    pages = all_pages(db, user.id, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3]
+
+
+def test_ties_on_created_at_are_split_by_id(db, make_user):
+    user = make_user()
+    # Five rows share one timestamp, so every page boundary falls inside the tie
+    rows = add_conversations(db, user.id, [BASE_TIME] * 5 + [BASE_TIME - timedelta(seconds=1)])
+
+    pages = all_pages(db, user.id, limit=2)
+
+    flat = [conversation_id for page in pages for conversation_id in page]
+    assert flat == [r.id for r in reversed(rows[:5])] + [rows[5].id]
+    assert len(set(flat)) == len(rows)
+
+
+def test_other_users_rows_are_excluded(db, make_user):
+    user, other = make_user(), make_user()
+    mine = add_conversations(db, user.id, [BASE_TIME, BASE_TIME + timedelta(minutes=1)])
+    add_conversations(db, other.id, [BASE_TIME + timedelta(seconds=30)] * 3)
+
+    pages = all_pages(db, user.id, limit=1)
+
+    assert pages == [[mine[1].id], [mine[0].id]]
+    assert get_conversation_count(db, user.id) == 2
+    assert get_conversation_count(db, other.id) == 3
+
+
+def test_empty_history(db, make_user):
+    user = make_user()
+
+    rows, cursor = get_user_conversations_page(db, user.id, limit=5)
+
+    assert rows == [] and cursor is None
@@ -0,0 +1,55 @@
+"""
+Tests for credit deduction under concurrent turns.
+"""
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.crud import deduct_credit, get_user_by_id, refund_credit
+
+
+def test_deduct_credit_returns_updated_user(db, make_user):
+    user = make_user(credits=2)
+
+    updated = deduct_credit(db, user.id)
+
+    assert updated is not None
+    assert updated.credits_remaining == 1
+
+
+def test_deduct_credit_returns_none_without_credits(db, make_user):
+    user = make_user(credits=0)
+
+    assert deduct_credit(db, user.id) is None
+    assert get_user_by_id(db, user.id).credits_remaining == 0
+
+
+def test_deduct_credit_returns_none_for_unknown_user(db):
+    assert deduct_credit(db, 999) is None
+
+
+def test_only_one_of_two_racing_turns_gets_the_last_credit(db, make_user):
+    user = make_user(credits=1)
+    make_session = sessionmaker(bind=db.get_bind())
+    first, second = make_session(), make_session()
+
+    # Both turns see a positive balance before either deducts
+    assert get_user_by_id(first, user.id).credits_remaining == 1
+    assert get_user_by_id(second, user.id).credits_remaining == 1
+
+    results = [deduct_credit(first, user.id), deduct_credit(second, user.id)]
+
+    assert sum(result is not None for result in results) == 1
+    db.expire_all()
+    assert get_user_by_id(db, user.id).credits_remaining == 0
+    first.close()
+    second.close()
+
+
+def test_refund_credit_restores_a_reserved_credit(db, make_user):
+    user = make_user(credits=1)
+    deduct_credit(db, user.id)
+
+    refund_credit(db, user.id)
+
+    db.expire_all()
+    assert get_user_by_id(db, user.id).credits_remaining == 1
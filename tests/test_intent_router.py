@@ -0,0 +1,92 @@
+"""
+Calibration tests for the intent router threshold.
+
+These embed real questions with the configured embedding model, so they are
+skipped until the model is available locally (a directory, or already in
+the Hugging Face cache from running the app once).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from huggingface_hub import try_to_load_from_cache
+
+from app.config import settings
+from app.core.embeddings import embedding_service
+from app.core.intent_router import IntentRouter
+
+
+# Rephrasings of command questions that should be answered from the command table
+PARAPHRASES = [
+    ("what are your technical skills?", "/skills"),
+    ("which programming languages do you know?", "/skills"),
+    ("what's your tech stack?", "/skills"),
+    ("show me the projects you have built", "/projects"),
+    ("what projects have you worked on?", "/projects"),
+    ("where did you go to university?", "/education"),
+    ("what degree do you have?", "/education"),
+    ("how can I get in touch with you?", "/contact"),
+    ("what's your email?", "/contact"),
+    ("can I download your resume?", "/resume"),
+    ("could you send me your CV?", "/resume"),
+    ("tell me a bit about yourself", "/about"),
+]
+
+# Close to a command phrasing but asking something narrower, which only
+# retrieval over the knowledge base can answer
+NEAR_MISSES = [
+    "what projects have you built with PyTorch?",
+    "what projects have you built using LangChain?",
+    "which of your projects use computer vision?",
+    "what skills did you use at your last internship?",
+    "did you study deep learning in your degree?",
+    "how can I contact your previous manager?",
+    "what is the email address of your university?",
+    "tell me about your experience with Docker",
+]
+
+
+def model_available() -> bool:
+    """Whether the embedding model can be loaded without a download."""
+    if Path(settings.EMBEDDING_MODEL).is_dir():
+        return True
+    return isinstance(try_to_load_from_cache(settings.EMBEDDING_MODEL, "config.json"), str)
+
+
+@pytest.fixture(scope="module")
+def router():
+    """Router initialized with the configured embedding model."""
+    if not model_available():
+        pytest.skip(f"Embedding model {settings.EMBEDDING_MODEL} is not available locally")
+    router = IntentRouter()
+    router.initialize()
+    return router
+
+
+def best_similarity(router, question):
+    """Similarity to the closest command phrasing, whether or not it is routed."""
+    return float(np.max(router._phrase_matrix @ embedding_service.encode_one(question)))
+
+
+@pytest.mark.parametrize("question,command", PARAPHRASES)
+def test_paraphrase_routes_to_its_command(router, question, command):
+    routed = router.route(embedding_service.encode_one(question))
+
+    assert routed is not None, f"{best_similarity(router, question):.3f}"
+    assert routed[0] == command
+
+
+@pytest.mark.parametrize("question", NEAR_MISSES)
+def test_near_miss_is_not_routed(router, question):
+    routed = router.route(embedding_service.encode_one(question))
+
+    assert routed is None, routed
+
+
+def test_threshold_separates_paraphrases_from_near_misses(router):
+    lowest_match = min(best_similarity(router, question) for question, _ in PARAPHRASES)
+    highest_miss = max(best_similarity(router, question) for question in NEAR_MISSES)
+
+    assert highest_miss < settings.INTENT_ROUTER_THRESHOLD <= lowest_match, (
+        f"INTENT_ROUTER_THRESHOLD should lie in ({highest_miss:.3f}, {lowest_match:.3f}]")
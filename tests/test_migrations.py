@@ -0,0 +1,142 @@
+"""
+Tests for upgrading databases created with the pre-migration schema.
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.crud import (
+    compute_question_hash,
+    create_cached_response,
+    create_conversation,
+    get_popular_questions,
+    get_user_conversations_page,
+)
+from app.db.database import migrate
+
+
+# Schema as created by Base.metadata.create_all() before migrations existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        email_category VARCHAR(50) NOT NULL,
+        is_company_email BOOLEAN NOT NULL,
+        credits_initial INTEGER NOT NULL,
+        credits_remaining INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        last_active DATETIME NOT NULL
+    )""",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    """CREATE TABLE conversations (
+        id INTEGER NOT NULL PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users (id),
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        used_llm BOOLEAN NOT NULL,
+        credits_charged INTEGER NOT NULL,
+        response_time FLOAT,
+        created_at DATETIME NOT NULL
+    )""",
+    "CREATE INDEX ix_conversations_user_id ON conversations (user_id)",
+    "CREATE INDEX ix_conversations_created_at ON conversations (created_at)",
+    """CREATE TABLE cached_responses (
+        id INTEGER NOT NULL PRIMARY KEY,
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        embedding TEXT,
+        hit_count INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        last_used DATETIME NOT NULL
+    )""",
+]
+
+
+@pytest.fixture
+def baseline_engine():
+    """In-memory database with the baseline schema and some history."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(text(
+            "INSERT INTO users VALUES (1, 'A', 'B', 'a@example.com', 'personal', 0, 5, 5, "
+            "'2026-01-01 00:00:00', '2026-01-01 00:00:00')"))
+        for i, question in enumerate(["What is X?", "what is x", "Other?"]):
+            connection.execute(
+                text("INSERT INTO conversations VALUES "
+                     "(:id, 1, :question, 'answer', 1, 1, NULL, '2026-01-01 00:00:00')"),
+                {"id": i + 1, "question": question})
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_adds_question_hash_and_indexes(baseline_engine):
+    with baseline_engine.begin() as connection:
+        migrate(connection)
+
+    inspector = inspect(baseline_engine)
+    columns = {c["name"]: c for c in inspector.get_columns("conversations")}
+    assert {"question_hash", "cached_response_id"} <= set(columns)
+    assert columns["answer"]["nullable"]
+    assert any(fk["referred_table"] == "cached_responses"
+               for fk in inspector.get_foreign_keys("conversations"))
+    indexes = {i["name"] for i in inspector.get_indexes("conversations")}
+    assert {"ix_conversations_user_id_created_at",
+            "ix_conversations_question_hash_created_at"} <= indexes
+    assert "ix_conversations_user_id" not in indexes
+
+
+def test_upgrade_backfills_hashes_so_history_is_reported(baseline_engine):
+    with baseline_engine.begin() as connection:
+        migrate(connection)
+
+    with baseline_engine.connect() as connection:
+        hashes = connection.execute(
+            text("SELECT question, question_hash FROM conversations")).all()
+    assert all(h == compute_question_hash(q) for q, h in hashes)
+
+    db = sessionmaker(bind=baseline_engine)()
+    assert get_popular_questions(db) == [("What is X?", 2), ("Other?", 1)]
+    db.close()
+
+
+def test_upgraded_database_accepts_new_conversations(baseline_engine):
+    with baseline_engine.begin() as connection:
+        migrate(connection)
+
+    db = sessionmaker(bind=baseline_engine)()
+    cached = create_cached_response(db, "What is X", "cached answer")
+    create_conversation(db, 1, "What is X", "cached answer", cached_response_id=cached.id)
+    assert get_popular_questions(db)[0] == ("What is X", 3)
+
+    db.expunge_all()
+    latest = get_user_conversations_page(db, 1, limit=1)[0][0]
+    assert latest.answer is None
+    assert latest.resolved_answer == "cached answer"
+    db.close()
+
+
+def test_upgrade_is_idempotent(baseline_engine):
+    for _ in range(2):
+        with baseline_engine.begin() as connection:
+            migrate(connection)
+
+    with baseline_engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def test_new_database_is_created_and_stamped():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        migrate(connection)
+
+    inspector = inspect(engine)
+    assert {"users", "conversations", "analytics", "cached_responses",
+            "alembic_version"} <= set(inspector.get_table_names())
+    engine.dispose()
@@ -0,0 +1,52 @@
+"""
+Tests for vector snapshot round trips and staleness checks.
+"""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from app.core.snapshot import VectorSnapshot, snapshot_staleness, write_snapshot
+
+
+FILES = {"data/knowledge_base/projects.md": "abc123"}
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    """Snapshot of two chunks written with splitter key "splitter-a"."""
+    documents = [Document(page_content=f"chunk {i}", metadata={"source": "projects.md"})
+                 for i in range(2)]
+    vectors = np.eye(2, 4, dtype=np.float32)
+    write_snapshot(str(tmp_path), dimension=4, documents=documents,
+                   vector_rows=enumerate(vectors), entities=["LogSenseAI"],
+                   files=FILES, splitter_key="splitter-a")
+    return tmp_path
+
+
+def test_snapshot_round_trip(snapshot_dir):
+    snapshot = VectorSnapshot.load(str(snapshot_dir))
+
+    assert len(snapshot) == 2
+    assert snapshot.vectors.shape == (2, 4)
+    assert snapshot.entities == ["LogSenseAI"]
+    assert snapshot.splitter_key == "splitter-a"
+
+
+def test_snapshot_is_fresh_for_same_files_and_splitter(snapshot_dir):
+    snapshot = VectorSnapshot.load(str(snapshot_dir))
+
+    assert snapshot_staleness(snapshot, dict(FILES), "splitter-a") is None
+
+
+def test_snapshot_is_stale_when_splitter_changed(snapshot_dir):
+    snapshot = VectorSnapshot.load(str(snapshot_dir))
+
+    assert snapshot_staleness(snapshot, dict(FILES), "splitter-b") is not None
+
+
+def test_snapshot_is_stale_when_a_file_changed(snapshot_dir):
+    snapshot = VectorSnapshot.load(str(snapshot_dir))
+    files = {path: "changed" for path in FILES}
+
+    assert snapshot_staleness(snapshot, files, "splitter-a") is not None
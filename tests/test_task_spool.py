@@ -0,0 +1,58 @@
+"""
+Tests for replaying the background task spool.
+"""
+
+import json
+
+import pytest
+
+from app.config import settings
+from app.core.tasks import BackgroundTaskQueue
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """Spool file path in a temporary directory."""
+    path = tmp_path / "task_spool.jsonl"
+    monkeypatch.setattr(settings, "TASK_SPOOL_PATH", str(path))
+    return path
+
+
+def recording_queue(monkeypatch):
+    """Stopped queue whose submit() records tasks instead of running them."""
+    task_queue = BackgroundTaskQueue()
+    submitted = []
+    monkeypatch.setattr(
+        task_queue, "submit", lambda name, **kwargs: submitted.append((name, kwargs)))
+    return task_queue, submitted
+
+
+def test_replay_requeues_spooled_tasks_and_clears_the_spool(spool, monkeypatch):
+    records = [{"task": "create_analytics_event", "kwargs": {"user_id": i, "event_type": "x"}}
+               for i in range(2)]
+    spool.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    task_queue, submitted = recording_queue(monkeypatch)
+
+    task_queue._replay_spool()
+
+    assert [kwargs["user_id"] for _, kwargs in submitted] == [0, 1]
+    assert list(spool.parent.iterdir()) == []
+
+
+def test_replay_without_spool_is_a_no_op(spool, monkeypatch):
+    task_queue, submitted = recording_queue(monkeypatch)
+
+    task_queue._replay_spool()
+
+    assert submitted == []
+
+
+def test_spool_is_replayed_by_only_one_worker(spool, monkeypatch):
+    spool.write_text(json.dumps({"task": "t", "kwargs": {}}) + "\n", encoding="utf-8")
+    first, first_submitted = recording_queue(monkeypatch)
+    second, second_submitted = recording_queue(monkeypatch)
+
+    first._replay_spool()
+    second._replay_spool()
+
+    assert len(first_submitted) + len(second_submitted) == 1
@@ -0,0 +1,56 @@
+"""
+Tests for quantized vector search and its memory accounting.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.vector_backends import NumpyBackend, QuantizedBackend
+
+
+def normalized(n, dimension=64, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_rescored_search_matches_exact_top_hit(mode):
+    vectors = normalized(500)
+    base = NumpyBackend.from_matrix(vectors)
+    quantized = QuantizedBackend(base, mode, rescore=True, oversampling=8)
+
+    for query in vectors[:20]:
+        assert quantized.search(query, 1)[0][0] == base.search(query, 1)[0][0]
+
+
+def test_resident_bytes_include_in_memory_floats():
+    base = NumpyBackend.from_matrix(normalized(100))
+    quantized = QuantizedBackend(base, "int8")
+
+    assert base.resident_nbytes == base.nbytes
+    assert quantized.resident_nbytes > base.resident_nbytes
+
+
+def test_resident_bytes_exclude_memory_mapped_floats(tmp_path):
+    np.save(tmp_path / "vectors.npy", normalized(100))
+    base = NumpyBackend.from_matrix(np.load(tmp_path / "vectors.npy", mmap_mode="r"))
+    quantized = QuantizedBackend(base, "binary")
+
+    assert base.resident_nbytes == 0
+    assert quantized.resident_nbytes < base.nbytes
+
+
+def test_adding_vectors_publishes_new_codes_without_touching_the_old():
+    vectors = normalized(200)
+    base = NumpyBackend.from_matrix(vectors[:100])
+    quantized = QuantizedBackend(base, "int8")
+    old = quantized._ensure_codes()
+    old_scale = old.scale.copy()
+
+    base.add(list(range(100, 200)), vectors[100:])
+    new = quantized._ensure_codes()
+
+    assert (old.size, len(old.codes)) == (100, 100)
+    assert np.array_equal(old.scale, old_scale)
+    assert (new.size, len(new.codes)) == (200, 200)
+    assert quantized.search(vectors[150], 1)[0][0] == 150